@@ -1,8 +1,23 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
 
+from atualizacao_dados import exibir_status_dados
+from conjuntos_dados import obter_conjunto
+from esquemas import exibir_relatorio_memoria
+from exportacao import botao_exportacao
+from graficos import plotly_express
+from presenca import (
+    FALTA,
+    PRESENTE,
+    formatar_dias,
+    formatar_mapa_presenca,
+    mapa_presenca_booleano,
+    montar_matriz_presenca,
+    percentual_por_dia,
+)
+from tabela_paginada import exibir_tabela_paginada
+
 st.set_page_config(
     page_title="Mapa de Presença por Curso", 
     layout="wide",
@@ -11,26 +26,16 @@ st.set_page_config(
 
 st.title("📚 Mapa de Presença por Curso")
 
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_excel("10-presencas.xlsx")
-        required_cols = ['user_id', 'firstname', 'lastname', 'course_name', 'access_time']
-        if not all(col in df.columns for col in required_cols):
-            missing = [col for col in required_cols if col not in df.columns]
-            st.error(f"Colunas faltantes: {', '.join(missing)}")
-            return None
-        df['access_time'] = pd.to_datetime(df['access_time'])
-        df['data_acesso'] = df['access_time'].dt.normalize()
-        df['nome_aluno'] = df['firstname'] + ' ' + df['lastname']
-        return df
-    except Exception as e:
-        st.error(f"Erro ao carregar dados: {str(e)}")
-        return None
-
-df = load_data()
-if df is None:
+# Log montado em segundo plano pelo atualizador do processo (``conjuntos_dados``)
+try:
+    publicacao = obter_conjunto('presenca')
+except Exception as e:
+    st.error(f"Erro ao carregar dados: {str(e)}")
     st.stop()
+versao = publicacao.versao
+df = publicacao.valor
+exibir_relatorio_memoria()
+exibir_status_dados(['presenca'])
 
 st.sidebar.header("Filtros")
 curso_selecionado = st.sidebar.selectbox(
@@ -56,34 +61,34 @@ if df_filtrado.empty:
     st.warning("Nenhum registro encontrado para o curso e período selecionados.")
     st.stop()
 
+# Matriz de presença (aluno × dia de aula) montada em um único passo
+alunos_curso, dias_aula, matriz_presenca = montar_matriz_presenca(df_filtrado)
+
 # Lista de alunos para filtro
-alunos_curso = sorted(df_filtrado['nome_aluno'].unique())
-aluno_selecionado = st.sidebar.selectbox("Filtrar por aluno (opcional):", options=["-- Todos --"] + alunos_curso)
+aluno_selecionado = st.sidebar.selectbox("Filtrar por aluno (opcional):", options=["-- Todos --"] + alunos_curso.tolist())
 
 # Se aluno selecionado, filtra para esse aluno
 if aluno_selecionado != "-- Todos --":
-    df_aluno = df_filtrado[df_filtrado['nome_aluno'] == aluno_selecionado]
     st.header(f"📊 Presença Individual: {aluno_selecionado}")
     
-    dias_aula = sorted(df_filtrado['data_acesso'].unique())
+    presenca_aluno = matriz_presenca[alunos_curso.get_loc(aluno_selecionado)]
     
     # Monta tabela individual de presença
-    presenca_individual = []
-    for dia in dias_aula:
-        presente = "✅" if (dia in df_aluno['data_acesso'].dt.normalize().values) else "❌"
-        presenca_individual.append({'Data': dia.strftime('%d/%m/%Y'), 'Presença': presente})
-    
-    df_presenca_ind = pd.DataFrame(presenca_individual)
-    
-    # Exibe tabela com cores
-    def color_presence(val):
-        color = 'green' if val == "✅" else 'red' if val == "❌" else 'black'
-        return f'color: {color}'
+    df_presenca_ind = pd.DataFrame({
+        'Data': formatar_dias(dias_aula),
+        'Presença': presenca_aluno.astype(bool)
+    })
     
-    st.dataframe(df_presenca_ind.style.applymap(color_presence, subset=['Presença']), height=300)
+    # Presença como checkbox: sem estilo por célula
+    st.dataframe(
+        df_presenca_ind,
+        height=300,
+        hide_index=True,
+        column_config={'Presença': st.column_config.CheckboxColumn('Presença', help=f"{PRESENTE} presente / {FALTA} falta")}
+    )
     
-    total_pres = (df_presenca_ind['Presença'] == "✅").sum()
-    total_falt = (df_presenca_ind['Presença'] == "❌").sum()
+    total_pres = int(presenca_aluno.sum())
+    total_falt = len(dias_aula) - total_pres
     freq = total_pres / len(dias_aula) * 100
     
     st.markdown(f"""
@@ -97,37 +102,17 @@ if aluno_selecionado != "-- Todos --":
 
 st.header(f"📋 Mapa de Presença - {curso_selecionado}")
 
-# Recalcula para o curso todo (ou seja, todos alunos do curso)
-dias_aula = sorted(df_filtrado['data_acesso'].unique())
-
-presenca_curso = pd.DataFrame(
-    index=alunos_curso,
-    columns=[dia.strftime('%d/%m/%Y') for dia in dias_aula] + ['Total ✅', 'Total ❌', 'Frequência']
-)
-
-for aluno in alunos_curso:
-    acessos_aluno = df_filtrado[df_filtrado['nome_aluno'] == aluno]['data_acesso'].dt.normalize().unique()
-    total_presente = 0
-    total_falta = 0
-    for dia in dias_aula:
-        if dia in acessos_aluno:
-            presenca_curso.loc[aluno, dia.strftime('%d/%m/%Y')] = "✅"
-            total_presente += 1
-        else:
-            presenca_curso.loc[aluno, dia.strftime('%d/%m/%Y')] = "❌"
-            total_falta += 1
-    presenca_curso.loc[aluno, 'Total ✅'] = total_presente
-    presenca_curso.loc[aluno, 'Total ❌'] = total_falta
-    presenca_curso.loc[aluno, 'Frequência'] = f"{(total_presente / len(dias_aula))*100:.1f}%"
-
-def color_presence(val):
-    color = 'green' if val == "✅" else 'red' if val == "❌" else 'black'
-    return f'color: {color}'
-
-st.dataframe(
-    presenca_curso.style.applymap(color_presence),
-    height=600,
-    use_container_width=True
+# Só a página visível vai para o navegador; presença como checkbox e frequência como barra
+mapa_presenca = mapa_presenca_booleano(alunos_curso, dias_aula, matriz_presenca)
+exibir_tabela_paginada(
+    mapa_presenca,
+    "mapa_presenca",
+    tamanho_pagina=100,
+    altura=600,
+    column_config={
+        **{dia: st.column_config.CheckboxColumn(dia) for dia in formatar_dias(dias_aula)},
+        'Frequência': st.column_config.ProgressColumn('Frequência', format="%.1f%%", min_value=0, max_value=100),
+    }
 )
 
 # Estatísticas gerais
@@ -135,8 +120,8 @@ st.header("📊 Estatísticas do Curso")
 
 total_alunos = len(alunos_curso)
 total_aulas = len(dias_aula)
-total_presencas = presenca_curso['Total ✅'].sum()
-total_faltas = presenca_curso['Total ❌'].sum()
+total_presencas = int(matriz_presenca.sum())
+total_faltas = total_alunos * total_aulas - total_presencas
 media_frequencia = (total_presencas / (total_alunos * total_aulas)) * 100
 
 col1, col2, col3, col4 = st.columns(4)
@@ -160,15 +145,17 @@ st.markdown(f"""
     Esses dados ajudam a compreender o engajamento dos alunos e a identificar possíveis dificuldades de participação no curso.
 """)
 
+px = plotly_express()
 tab1, tab2 = st.tabs(["Frequência por Dia", "Distribuição de Presença"])
 
 with tab1:
+    presencas_dia, percentual_dia = percentual_por_dia(matriz_presenca)
     freq_dia = pd.DataFrame({
         'Dia': dias_aula,
-        'Presenças': [(presenca_curso[col.strftime('%d/%m/%Y')] == "✅").sum() for col in dias_aula],
-        'Total Alunos': total_alunos
+        'Presenças': presencas_dia,
+        'Total Alunos': total_alunos,
+        '% Presentes': percentual_dia
     })
-    freq_dia['% Presentes'] = round((freq_dia['Presenças'] / freq_dia['Total Alunos']) * 100, 1)
 
     fig = px.line(
         freq_dia,
@@ -193,21 +180,14 @@ with tab2:
 # Exportação
 st.header("📤 Exportar Dados")
 
-presenca_export = presenca_curso.reset_index()
-presenca_export = presenca_export.rename(columns={'index': 'Aluno'})
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.download_button(
-        label="Baixar Mapa Completo (CSV)",
-        data=presenca_export.to_csv(index=False).encode('utf-8'),
-        file_name=f"mapa_presenca_{curso_selecionado.replace(' ', '_')}.csv",
-        mime="text/csv"
-    )
+# Emojis só na exportação: a matriz continua em uint8, e os arquivos só são
+# gerados quando pedidos
+def mapa_para_exportar():
+    presenca_curso = formatar_mapa_presenca(alunos_curso, dias_aula, matriz_presenca)
+    return presenca_curso.reset_index().rename(columns={'index': 'Aluno'})
 
-with col2:
-    resumo = pd.DataFrame({
+def resumo_para_exportar():
+    return pd.DataFrame({
         'Curso': [curso_selecionado],
         'Período': [f"{data_inicio.strftime('%d/%m/%Y')} a {data_fim.strftime('%d/%m/%Y')}"],
         'Total Alunos': [total_alunos],
@@ -216,12 +196,27 @@ with col2:
         'Total Faltas': [total_faltas],
         'Frequência Média': [f"{media_frequencia:.1f}%"]
     })
-    
-    st.download_button(
-        label="Baixar Resumo Estatístico (CSV)",
-        data=resumo.to_csv(index=False).encode('utf-8'),
-        file_name=f"resumo_presenca_{curso_selecionado.replace(' ', '_')}.csv",
-        mime="text/csv"
+
+recorte = (versao, curso_selecionado, data_inicio, data_fim)
+sufixo = curso_selecionado.replace(' ', '_')
+col1, col2 = st.columns(2)
+
+with col1:
+    botao_exportacao(
+        "mapa_presenca_export",
+        mapa_para_exportar,
+        f"mapa_presenca_{sufixo}",
+        rotulo="Mapa completo",
+        assinatura=recorte,
+    )
+
+with col2:
+    botao_exportacao(
+        "resumo_presenca_export",
+        resumo_para_exportar,
+        f"resumo_presenca_{sufixo}",
+        rotulo="Resumo estatístico",
+        assinatura=recorte,
     )
 
 st.markdown("---")
@@ -1,11 +1,28 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
 from datetime import datetime
 
+from atualizacao_dados import exibir_status_dados
+from cache_figuras import exibir_figura
+from certificacao import (
+    FREQUENCIA_MINIMA,
+    HORAS_TOTAIS,
+    MAPEAMENTO_ATIVIDADES,
+    NAO_RECONHECIDA,
+    calcular_certificacao_turma,
+    tipos_das_atividades,
+)
+from conjuntos_dados import obter_conjunto
+from dimensao_cursos import montar_dimensao_cursos
+from esquemas import exibir_relatorio_memoria
+from graficos import pyplot
+
 # --- Leitura dos Dados ---
-arquivo = "dados_moodle.xlsx"
-dados = pd.read_excel(arquivo, sheet_name=None)
+# Abas do dados_moodle.xlsx (ou do banco) montadas em segundo plano pelo
+# atualizador do processo (``conjuntos_dados``), compartilhadas entre sessões
+publicacao = obter_conjunto('tabelas_moodle')
+versao = publicacao.versao
+dados = publicacao.valor
 
 # Carregando os DataFrames
 df_cursos = dados["cursos"]
@@ -13,25 +30,11 @@ df_usuarios = dados["usuarios"]
 df_atividades = dados["atividades_assign"]
 df_envios = dados["envios_assign"]
 df_modulos = dados["modulos"]
+exibir_relatorio_memoria()
+exibir_status_dados(['tabelas_moodle'])
 
-# --- Mapeamento de Estados pelas siglas nos nomes dos cursos ---
-ESTADO_POR_SIGLA = {
-    'CE': 'CEARÁ',
-    'MA': 'MARANHÃO',
-    'PI': 'PIAUÍ',
-    'PE': 'PERNAMBUCO'
-}
-
-# --- Mapeamento de Atividades do Documento ---
-MAPEAMENTO_ATIVIDADES = {
-    "Encontros Presenciais": {"horas": 20, "ch_por_item": 10, "minimo": 1},
-    "Webinários": {"horas": 15, "ch_por_item": 3, "minimo": 4},
-    "Atividades dos módulos": {"horas": 20, "ch_por_item": 4, "minimo": 3},
-    "Encontros Síncronos": {"horas": 12, "ch_por_item": 2, "minimo": 5},
-    "Fóruns": {"horas": 12, "ch_por_item": 2, "minimo": 5},
-    "Atividade Final": {"horas": 21, "obrigatoria": True},
-    "Estudos e Leituras": {"horas": 20, "nao_conta_frequencia": True}
-}
+# --- Estado de cada curso a partir do prefixo [NFXX_NN] do nome ---
+dimensao_cursos = montar_dimensao_cursos(df_cursos["fullname"])
 
 # --- Filtros na barra lateral ---
 st.sidebar.title("🎯 Filtros")
@@ -39,16 +42,14 @@ cursos_disponiveis = df_cursos["fullname"].sort_values().unique()
 curso_selecionado = st.sidebar.selectbox("Selecione a turma", cursos_disponiveis)
 
 # Detectar o estado
-estado_detectado = None
-for sigla, estado in ESTADO_POR_SIGLA.items():
-    if sigla in curso_selecionado.upper():
-        estado_detectado = estado
-        break
+estado_detectado = dimensao_cursos.loc[curso_selecionado, "estado"]
 
-if estado_detectado is None:
+if pd.isna(estado_detectado):
     st.error("Não foi possível detectar o estado a partir do nome do curso.")
     st.stop()
 
+estado_detectado = estado_detectado.upper()
+
 curso_id = df_cursos[df_cursos["fullname"] == curso_selecionado]["id"].values[0]
 
 # Filtrar dados
@@ -62,95 +63,50 @@ envios_curso = envios_curso.rename(columns={"name": "name_atividade"})
 
 # Converter timestamp
 envios_curso["data_envio"] = pd.to_datetime(envios_curso["timemodified"], unit='s')
+# Uma classificação por atividade do curso, levada aos envios pelo id
+envios_curso["tipo_atividade"] = envios_curso["assignment"].map(tipos_das_atividades(atividades_curso))
+
+# --- Cálculo para a turma inteira (um único groupby por userid × tipo) ---
+resumo_turma, detalhes_turma = calcular_certificacao_turma(envios_curso)
 
 # Filtro de usuário
-usuarios_curso = (envios_curso["firstname"] + " " + envios_curso["lastname"]).dropna().unique().tolist()
-usuarios_curso.sort()
-usuario_selecionado = st.sidebar.selectbox("Filtrar por usuário", ["Todos"] + usuarios_curso)
+usuarios_curso = resumo_turma["aluno"].sort_values()
+usuario_selecionado = st.sidebar.selectbox(
+    "Filtrar por usuário",
+    ["Todos"] + usuarios_curso.index.tolist(),
+    format_func=lambda userid: userid if userid == "Todos" else usuarios_curso[userid]
+)
 
 st.title("📊 Dashboard de Certificação")
 st.subheader(f"Turma: {curso_selecionado} - Estado: {estado_detectado}")
 
-# --- Cálculo ---
-def calcular_carga_horaria(envios, usuario=None):
-    if usuario != "Todos":
-        nome_split = usuario.split()
-        envios = envios[
-            (envios["firstname"] == nome_split[0]) & 
-            (envios["lastname"] == " ".join(nome_split[1:]))
-        ]
-    
-    resultados = {tipo: {
-        "horas_completadas": 0,
-        "horas_exigidas": dados["horas"],
-        "itens_completos": 0,
-        "itens_exigidos": dados["horas"] / dados.get("ch_por_item", 1),
-        "minimo_requerido": dados.get("minimo", 0),
-        "obrigatoria": dados.get("obrigatoria", False),
-        "nao_conta_frequencia": dados.get("nao_conta_frequencia", False)
-    } for tipo, dados in MAPEAMENTO_ATIVIDADES.items()}
-    
-    tipo_por_atividade = {
-        "avaliação": "Atividades dos módulos",
-        "atividade 1": "Atividades dos módulos",
-        "plano de estudos": "Estudos e Leituras",
-        "portfólio": "Atividade Final"
-    }
-
-    atividades_nao_reconhecidas = set()
-
-    for _, row in envios.iterrows():
-        nome_atividade = str(row.get("name_atividade", "")).lower()
-        tipo = None
-        for chave in tipo_por_atividade:
-            if chave in nome_atividade:
-                tipo = tipo_por_atividade[chave]
-                break
-        if tipo and tipo in resultados:
-            resultados[tipo]["itens_completos"] += 1
-        else:
-            atividades_nao_reconhecidas.add(nome_atividade)
-
-    for tipo, dados in resultados.items():
-        if not dados["nao_conta_frequencia"]:
-            proporcao = min(dados["itens_completos"] / dados["itens_exigidos"], 1)
-            dados["horas_completadas"] = proporcao * dados["horas_exigidas"]
-
-    horas_frequencia = sum(d["horas_completadas"] for t, d in resultados.items() if not d["nao_conta_frequencia"])
-    atividade_final_ok = resultados["Atividade Final"]["itens_completos"] > 0
-
-    return {
-        "horas_totais": 120,
-        "horas_frequencia": horas_frequencia,
-        "frequencia_minima": 90,
-        "atividade_final_ok": atividade_final_ok,
-        "apto_certificado": horas_frequencia >= 90 and atividade_final_ok,
-        "detalhes": resultados,
-        "nao_reconhecidas": atividades_nao_reconhecidas
-    }
-
 # --- Visualização Individual ---
 st.markdown("### 📜 Status para Certificação")
 
 if usuario_selecionado == "Todos":
     st.warning("Selecione um usuário específico para ver o status de certificação")
 else:
-    status = calcular_carga_horaria(envios_curso, usuario_selecionado)
-    
+    status = resumo_turma.loc[usuario_selecionado]
+    detalhes_usuario = detalhes_turma.loc[usuario_selecionado]
+    envios_usuario = envios_curso[envios_curso["userid"] == usuario_selecionado]
+    nao_reconhecidas = set(
+        envios_usuario.loc[envios_usuario["tipo_atividade"].isna(), "name_atividade"].astype(str).str.lower()
+    )
+
     col1, col2, col3 = st.columns(3)
     col1.metric("Horas Cumpridas", f"{status['horas_frequencia']:.1f}h", 
-                f"{status['horas_frequencia']-status['frequencia_minima']:.1f}h do mínimo")
+                f"{status['horas_frequencia']-FREQUENCIA_MINIMA:.1f}h do mínimo")
     col2.metric("Atividade Final", "✅ Completa" if status['atividade_final_ok'] else "❌ Incompleta")
     col3.metric("Elegível para Certificado", 
                 "✅ Sim" if status['apto_certificado'] else "❌ Não",
                 "Requisitos cumpridos" if status['apto_certificado'] else "Faltam requisitos")
 
     st.markdown("#### ⚠️ Atividades não reconhecidas")
-    st.write(status["nao_reconhecidas"])
+    st.write(nao_reconhecidas)
 
     st.markdown("#### Detalhamento por Tipo de Atividade")
     detalhes = []
-    for tipo, dados in status['detalhes'].items():
+    for tipo, dados in detalhes_usuario.iterrows():
         if not dados["nao_conta_frequencia"]:
             detalhes.append({
                 "Tipo": tipo,
@@ -167,59 +123,35 @@ else:
     # --- NOVO: Detalhamento por Atividade Entregue ---
     st.markdown("#### 📅 Detalhamento de Atividades Enviadas")
 
-    nome_split = usuario_selecionado.split()
-    envios_usuario = envios_curso[
-        (envios_curso["firstname"] == nome_split[0]) & 
-        (envios_curso["lastname"] == " ".join(nome_split[1:]))
-    ]
-
-    linhas_detalhes = []
-    for _, row in envios_usuario.iterrows():
-        nome_atividade = str(row["name_atividade"]).lower()
-        tipo_detectado = None
-        for chave, tipo in {
-            "avaliação": "Atividades dos módulos",
-            "atividade 1": "Atividades dos módulos",
-            "plano de estudos": "Estudos e Leituras",
-            "portfólio": "Atividade Final"
-        }.items():
-            if chave in nome_atividade:
-                tipo_detectado = tipo
-                break
-        if tipo_detectado is None:
-            tipo_detectado = "Não Reconhecida"
-
-        mapeamento = MAPEAMENTO_ATIVIDADES.get(tipo_detectado, {})
-        horas = mapeamento.get("ch_por_item", None)
-        contabiliza = not mapeamento.get("nao_conta_frequencia", False)
-
-        linhas_detalhes.append({
-            "Nome da Atividade": row["name_atividade"],
-            "Tipo Detectado": tipo_detectado,
-            "Data de Envio": row["data_envio"].date(),
-            "Carga Horária": f"{horas}h" if horas else "N/A",
-            "Contabiliza Frequência": "Sim" if contabiliza else "Não"
-        })
-
-    df_ativ_detalhes = pd.DataFrame(linhas_detalhes)
+    tipo_detectado = envios_usuario["tipo_atividade"].fillna(NAO_RECONHECIDA)
+    carga_horaria = tipo_detectado.map(
+        {tipo: f"{regras['ch_por_item']}h" for tipo, regras in MAPEAMENTO_ATIVIDADES.items() if regras.get("ch_por_item")}
+    ).fillna("N/A")
+    contabiliza = tipo_detectado.map(
+        {tipo: "Não" for tipo, regras in MAPEAMENTO_ATIVIDADES.items() if regras.get("nao_conta_frequencia")}
+    ).fillna("Sim")
+
+    df_ativ_detalhes = pd.DataFrame({
+        "Nome da Atividade": envios_usuario["name_atividade"],
+        "Tipo Detectado": tipo_detectado,
+        "Data de Envio": envios_usuario["data_envio"].dt.date,
+        "Carga Horária": carga_horaria,
+        "Contabiliza Frequência": contabiliza,
+    }).reset_index(drop=True)
     st.dataframe(df_ativ_detalhes)
 
 # --- Progresso da Turma ---
 st.markdown("### 📊 Progresso da Turma para Certificação")
 
-progresso_turma = []
-for usuario in usuarios_curso:
-    status = calcular_carga_horaria(envios_curso, usuario)
-    progresso_turma.append({
-        "Aluno": usuario,
-        "Horas Completadas": f"{status['horas_frequencia']:.1f}",
-        "Atividade Final": "✅" if status["atividade_final_ok"] else "❌",
-        "% Completado": f"{(status['horas_frequencia']/120)*100:.1f}%",
-        "Apto Certificado": "✅" if status["apto_certificado"] else "❌"
-    })
-
-df_progresso = pd.DataFrame(progresso_turma)
-st.dataframe(df_progresso.sort_values(by="Horas Completadas", ascending=False))
+progresso = resumo_turma.sort_values(by="horas_frequencia", ascending=False)
+df_progresso = pd.DataFrame({
+    "Aluno": progresso["aluno"],
+    "Horas Completadas": progresso["horas_frequencia"].map("{:.1f}".format),
+    "Atividade Final": progresso["atividade_final_ok"].map({True: "✅", False: "❌"}),
+    "% Completado": (progresso["horas_frequencia"] / HORAS_TOTAIS * 100).map("{:.1f}%".format),
+    "Apto Certificado": progresso["apto_certificado"].map({True: "✅", False: "❌"})
+}).reset_index(drop=True)
+st.dataframe(df_progresso)
 
 # --- Módulos por Estado ---
 st.markdown(f"### 📌 Distribuição de Carga Horária por Módulo - {estado_detectado}")
@@ -257,33 +189,29 @@ st.dataframe(pd.DataFrame(minimos))
 # --- Visão Geral da Turma ---
 st.markdown("### 📈 Visão Geral da Turma por Tipo de Atividade")
 
-resumo_atividade = {tipo: {
-    "Total Alunos": 0,
-    "Completaram Mínimo": 0,
-    "Média Itens Completos": 0,
-    "Média % Completado": 0
-} for tipo in MAPEAMENTO_ATIVIDADES.keys() if not MAPEAMENTO_ATIVIDADES[tipo].get("nao_conta_frequencia", False)}
-
-for usuario in usuarios_curso:
-    status = calcular_carga_horaria(envios_curso, usuario)
-    for tipo, dados in status["detalhes"].items():
-        if tipo not in resumo_atividade or dados["nao_conta_frequencia"]:
-            continue
-        resumo_atividade[tipo]["Total Alunos"] += 1
-        resumo_atividade[tipo]["Média Itens Completos"] += dados["itens_completos"]
-        resumo_atividade[tipo]["Média % Completado"] += min((dados["itens_completos"] / dados["itens_exigidos"]) * 100, 100)
-        if dados["itens_completos"] >= dados["minimo_requerido"]:
-            resumo_atividade[tipo]["Completaram Mínimo"] += 1
+detalhes_frequencia = detalhes_turma[~detalhes_turma["nao_conta_frequencia"]]
+percentual_tipo = (detalhes_frequencia["itens_completos"] / detalhes_frequencia["itens_exigidos"] * 100).clip(upper=100)
+resumo_atividade = (
+    detalhes_frequencia.assign(percentual=percentual_tipo)
+    .groupby(level="tipo", sort=False)
+    .agg(
+        total_alunos=("itens_completos", "size"),
+        completaram_minimo=("minimo_ok", "sum"),
+        media_itens=("itens_completos", "mean"),
+        media_percentual=("percentual", "mean")
+    )
+    .reindex([t for t in MAPEAMENTO_ATIVIDADES if not MAPEAMENTO_ATIVIDADES[t].get("nao_conta_frequencia", False)])
+    .fillna(0)
+)
 
 # Preparar DataFrame
 linhas = []
-for tipo, dados in resumo_atividade.items():
-    total = dados["Total Alunos"] if dados["Total Alunos"] > 0 else 1
+for tipo, dados in resumo_atividade.iterrows():
     linhas.append({
         "Tipo de Atividade": tipo,
-        "Alunos com Mínimo": f"{dados['Completaram Mínimo']}/{dados['Total Alunos']}",
-        "Média Itens Completos": f"{dados['Média Itens Completos'] / total:.1f}",
-        "Média % Completado": f"{dados['Média % Completado'] / total:.1f}%"
+        "Alunos com Mínimo": f"{int(dados['completaram_minimo'])}/{int(dados['total_alunos'])}",
+        "Média Itens Completos": f"{dados['media_itens']:.1f}",
+        "Média % Completado": f"{dados['media_percentual']:.1f}%"
     })
 
 df_resumo_turma = pd.DataFrame(linhas)
@@ -291,15 +219,19 @@ st.dataframe(df_resumo_turma)
 
 # Gráfico de barras
 st.markdown("#### 📊 Gráfico de Conclusão por Tipo de Atividade")
-fig, ax = plt.subplots(figsize=(8, 4))
-ax.bar(df_resumo_turma["Tipo de Atividade"], 
-       df_resumo_turma["Média % Completado"].str.replace('%','').astype(float), 
-       color='teal')
-ax.set_ylabel("% Conclusão Média")
-ax.set_ylim(0, 100)
-ax.set_title("Média de Conclusão por Tipo de Atividade na Turma")
-plt.xticks(rotation=45, ha='right')
-st.pyplot(fig)
+def desenhar_conclusao_turma():
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(8, 4))
+    ax.bar(df_resumo_turma["Tipo de Atividade"], 
+           df_resumo_turma["Média % Completado"].str.replace('%','').astype(float), 
+           color='teal')
+    ax.set_ylabel("% Conclusão Média")
+    ax.set_ylim(0, 100)
+    ax.set_title("Média de Conclusão por Tipo de Atividade na Turma")
+    plt.xticks(rotation=45, ha='right')
+    return fig
+
+exibir_figura("conclusao_turma", desenhar_conclusao_turma, filtros=curso_id, versao=versao)
 
 
 
@@ -1,43 +1,53 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 from datetime import datetime
 import io
 
+from agregados_acessos import filtrar_agregado
+from atualizacao_dados import exibir_status_dados
+from conjuntos_dados import obter_conjunto
+from esquemas import exibir_relatorio_memoria
+from exportacao import botao_exportacao
+from graficos import plotly_express
+from sessoes_acessos import INTERVALO_INATIVIDADE, montar_sessoes, tempo_por_aluno, tempo_por_dia
+from tabela_paginada import exibir_tabela_paginada
+
 st.set_page_config(
     page_title="📊 Dashboard Moodle (Offline)",
     layout="wide"
 )
 
-# ---------- Carregamento dos dados com cache ----------
-@st.cache_data
-def carregar_dados():
-    df = pd.read_excel("9-dados_acesso.xlsx")
-    df['access_time'] = pd.to_datetime(df['access_time'], errors='coerce')
-    df['aluno'] = df['firstname'] + ' ' + df['lastname']
-    df['dias_desde_ultimo_acesso'] = (datetime.now() - df['access_time']).dt.days
-    df['status'] = df['dias_desde_ultimo_acesso'].apply(
-        lambda x: 'Ativo' if pd.notnull(x) and x <= 30 else 'Inativo'
-    )
-    df['data'] = df['access_time'].dt.date
-    df['hora'] = df['access_time'].dt.hour
-
-    mapa_estado = {
-        '[NFCE': 'Ceará',
-        '[NFMA': 'Maranhão',
-        '[NFPI': 'Piauí',
-        '[NFPE': 'Pernambuco'
-    }
-    def extrair_estado(curso):
-        for sigla, estado in mapa_estado.items():
-            if pd.notnull(curso) and sigla in curso:
-                return estado
-        return 'Outro'
-
-    df['estado'] = df['course_name'].apply(extrair_estado)
-    return df
-
-df = carregar_dados()
+# ---------- Carregamento dos dados em segundo plano ----------
+# O log e o status Ativo/Inativo (refeito a cada TTL_STATUS, com os bitmaps e
+# agregados que dependem dele) são montados pelo atualizador do processo
+# (``conjuntos_dados``), fora do rerun. Aqui só se pega a versão publicada.
+
+# Poucas entradas: cada par (versão, intervalo) guarda as sessões do log
+# inteiro, e o slider vai de 1 a 240 minutos.
+@st.cache_resource(max_entries=4, ttl="1h")
+def carregar_sessoes(versao, intervalo_min, _df):
+    """Sessões do log inteiro, montadas uma vez por versão dos dados e intervalo de inatividade."""
+    return montar_sessoes(_df, pd.Timedelta(minutes=intervalo_min))
+
+@st.cache_resource(max_entries=1)
+def carregar_nomes(versao, _df):
+    """Nome de exibição de cada user_id."""
+    return _df.drop_duplicates('user_id').set_index('user_id')['aluno']
+
+try:
+    dados = obter_conjunto('status_acessos_offline').valor
+except FileNotFoundError as e:
+    st.error(f"❌ {e}")
+    st.stop()
+versao = dados['versao']
+df = dados['df']
+status_usuarios = dados['status_usuarios']
+status_calculado_em = dados['calculado_em']
+indice = dados['indice']
+agregados = dados['agregados']
+
+exibir_relatorio_memoria()
+exibir_status_dados(['acessos_offline', 'status_acessos_offline'])
 
 # ---------- Interface principal com abas ----------
 tabs = st.tabs(["Dashboard", "Comparativo por Estado"])
@@ -68,19 +78,23 @@ with tabs[0]:
     data_inicio, data_fim = st.sidebar.date_input(
         "Período de Acesso", [data_min, data_max], min_value=data_min, max_value=data_max
     )
+    intervalo_sessao = st.sidebar.number_input(
+        "Inatividade que encerra a sessão (min)", min_value=1, max_value=240,
+        value=int(INTERVALO_INATIVIDADE.total_seconds() // 60), step=5
+    )
 
-    df_filtrado = df.copy()
-    if curso_selecionado:
-        df_filtrado = df_filtrado[df_filtrado['course_name'].isin(curso_selecionado)]
-    df_filtrado = df_filtrado[
-        (df_filtrado['status'].isin(status_selecionado)) &
-        (df_filtrado['data'] >= data_inicio) &
-        (df_filtrado['data'] <= data_fim)
-    ]
+    # Curso e status pelos bitmaps; o período compara timestamps em vez de objetos date
+    mascara = indice.mascara(course_name=curso_selecionado or None, status=status_selecionado)
+    mascara &= (
+        (df['access_time'] >= pd.Timestamp(data_inicio)).to_numpy() &
+        (df['access_time'] < pd.Timestamp(data_fim) + pd.Timedelta(days=1)).to_numpy()
+    )
+    df_filtrado = df[mascara]
 
     if not curso_selecionado:
         st.info("✅ Selecione ao menos um curso para ver os resultados.")
     else:
+        px = plotly_express()
         col1, col2, col3 = st.columns(3)
         col1.metric("👤 Usuários únicos", df_filtrado['user_id'].nunique())
         col2.metric("📚 Cursos filtrados", len(curso_selecionado))
@@ -88,7 +102,16 @@ with tabs[0]:
 
         # Evolução dos acessos
         st.subheader(f"📅 Evolução dos Acessos ({data_inicio} a {data_fim})")
-        df_por_data = df_filtrado.groupby(['data', 'course_name']).size().reset_index(name='qtd_acessos')
+        # Gráficos de data e hora pelos agregados da carga, não pelo log filtrado
+        filtros_agregados = dict(
+            cursos=curso_selecionado, status=status_selecionado, data_inicio=data_inicio, data_fim=data_fim
+        )
+        df_por_data = (
+            filtrar_agregado(agregados['dia'], **filtros_agregados)
+            .groupby(['data', 'course_name'], observed=True)['acessos'].sum()
+            .reset_index(name='qtd_acessos')
+        )
+        df_por_data['data'] = df_por_data['data'].dt.date
         if not df_por_data.empty:
             fig_data = px.line(
                 df_por_data, x='data', y='qtd_acessos', color='course_name',
@@ -100,7 +123,7 @@ with tabs[0]:
 
         # Top 10 alunos por dias com acesso
         st.subheader("👤 Top 10 Alunos por Dias com Acessos")
-        df_top = df_filtrado.groupby('aluno')['data'].nunique().reset_index(name='dias_com_acesso')
+        df_top = df_filtrado.groupby('aluno', observed=True)['data'].nunique().reset_index(name='dias_com_acesso')
         df_top = df_top.sort_values('dias_com_acesso', ascending=False).head(10)
         if not df_top.empty:
             fig_top = px.bar(
@@ -113,9 +136,57 @@ with tabs[0]:
         else:
             st.warning("Nenhum aluno com acessos no filtro atual.")
 
+        # Tempo na plataforma, a partir das sessões (curso, período e status do usuário)
+        st.subheader("⏱️ Tempo na Plataforma (sessões)")
+        sessoes = carregar_sessoes(versao, intervalo_sessao, df)
+        sessoes_filtradas = sessoes[
+            sessoes['course_name'].isin(curso_selecionado).to_numpy() &
+            sessoes['user_id'].map(status_usuarios['status']).isin(status_selecionado).to_numpy() &
+            (sessoes['data'] >= pd.Timestamp(data_inicio)).to_numpy() &
+            (sessoes['data'] <= pd.Timestamp(data_fim)).to_numpy()
+        ]
+        if not sessoes_filtradas.empty:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("🧭 Sessões", len(sessoes_filtradas))
+            col2.metric("⏳ Tempo total", f"{sessoes_filtradas['duracao_s'].sum() / 3600:.1f} h")
+            col3.metric("⌛ Duração média", f"{sessoes_filtradas['duracao_s'].mean() / 60:.1f} min")
+            col4.metric("🖱️ Cliques por sessão", f"{sessoes_filtradas['cliques'].mean():.1f}")
+
+            tempo_dia = tempo_por_dia(sessoes_filtradas).groupby(['data', 'course_name'], observed=True)['tempo_min'].sum().reset_index()
+            fig_tempo_dia = px.line(
+                tempo_dia, x='data', y='tempo_min', color='course_name', markers=True,
+                title="Tempo na Plataforma por Dia (min)",
+                labels={'data': 'Data', 'tempo_min': 'Minutos', 'course_name': 'Curso'}
+            )
+            st.plotly_chart(fig_tempo_dia, use_container_width=True)
+
+            tempo_aluno = tempo_por_aluno(sessoes_filtradas)
+            tempo_aluno.insert(0, 'aluno', tempo_aluno['user_id'].map(carregar_nomes(versao, df)))
+            df_top_tempo = tempo_aluno.groupby('aluno', observed=True)['tempo_min'].sum().nlargest(10).reset_index()
+            fig_top_tempo = px.bar(
+                df_top_tempo, x='aluno', y='tempo_min', text=df_top_tempo['tempo_min'].round(0),
+                title="Top 10 Alunos por Tempo na Plataforma",
+                labels={'aluno': 'Aluno', 'tempo_min': 'Minutos'}
+            )
+            fig_top_tempo.update_traces(textposition='outside')
+            st.plotly_chart(fig_top_tempo, use_container_width=True)
+
+            exibir_tabela_paginada(
+                tempo_aluno.drop(columns='user_id').round({'tempo_min': 1, 'duracao_media_min': 1}),
+                "tempo_plataforma",
+                ordenar_por='tempo_min',
+                crescente=False,
+            )
+        else:
+            st.warning("Nenhuma sessão para este período/curso.")
+
         # Picos por hora
         st.subheader("🕒 Picos de Acesso por Hora do Dia")
-        df_por_hora = df_filtrado.groupby('hora').size().reset_index(name='qtd_acessos')
+        df_por_hora = (
+            filtrar_agregado(agregados['hora'], **filtros_agregados)
+            .groupby('hora')['acessos'].sum()
+            .reset_index(name='qtd_acessos')
+        )
         if not df_por_hora.empty:
             fig_hora = px.line(
                 df_por_hora, x='hora', y='qtd_acessos', markers=True,
@@ -136,7 +207,7 @@ with tabs[0]:
         for turma in sorted(turmas):
             st.markdown(f"### 📚 {turma}")
             df_turma = df_filtrado[df_filtrado['course_name'] == turma]
-            tabela_turma = df_turma.groupby('aluno').agg(
+            tabela_turma = df_turma.groupby('aluno', observed=True).agg(
                 total_acessos=('access_time', 'count'),
                 dias_com_acesso=('data', 'nunique'),
                 ultimo_acesso=('access_time', 'max'),
@@ -144,20 +215,24 @@ with tabs[0]:
             ).reset_index().sort_values(by='total_acessos', ascending=False)
             st.dataframe(tabela_turma, use_container_width=True)
 
-        # Exportar dados filtrados CSV
+        # Exportar dados filtrados (gerado só quando pedido)
         st.subheader("📥 Exportar Dados")
-        st.download_button(
-            label="📄 Baixar dados filtrados (.csv)",
-            data=df_filtrado.to_csv(index=False).encode('utf-8'),
-            file_name='acessos_filtrados.csv',
-            mime='text/csv'
+        botao_exportacao(
+            "acessos_filtrados",
+            lambda: df_filtrado,
+            "acessos_filtrados",
+            rotulo="Dados filtrados",
+            assinatura=(versao, status_calculado_em, curso_selecionado, status_selecionado, data_inicio, data_fim),
         )
 
         # Tabela detalhada
         st.subheader("📋 Tabela de Acessos Detalhada")
-        st.dataframe(
-            df_filtrado[['aluno', 'course_name', 'access_time', 'status', 'estado']]
-            .sort_values(by='access_time', ascending=False).head(100)
+        exibir_tabela_paginada(
+            df_filtrado,
+            "acessos_detalhados",
+            colunas=['aluno', 'course_name', 'access_time', 'status', 'estado'],
+            ordenar_por='access_time',
+            crescente=False,
         )
 
 # --- Aba 2: Comparativo por Estado ---
@@ -171,7 +246,7 @@ with tabs[1]:
         st.warning("Por favor, selecione pelo menos um estado.")
         st.stop()
 
-    df_estado = df[df['estado'].isin(estados_selecionados)]
+    df_estado = df[indice.mascara(estado=estados_selecionados)]
 
     # Métricas
     col1, col2 = st.columns(2)
@@ -179,12 +254,13 @@ with tabs[1]:
     col2.metric("Usuários Únicos", df_estado['user_id'].nunique())
 
     # Acessos por estado
-    acessos_estado = df_estado.groupby('estado').agg(
+    acessos_estado = df_estado.groupby('estado', observed=True).agg(
         total_acessos=('user_id', 'count'),
         usuarios_unicos=('user_id', 'nunique')
     ).reset_index().sort_values('total_acessos', ascending=False)
 
     # Gráfico barras com cores diferentes por estado
+    px = plotly_express()
     fig_bar = px.bar(
         acessos_estado, x='estado', y='total_acessos', text='usuarios_unicos',
         title='Total de Acessos e Usuários Únicos por Estado',
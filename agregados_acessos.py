@@ -0,0 +1,56 @@
+"""Agregados diários e por hora do log de acessos, montados uma vez na carga.
+
+Os gráficos de evolução diária e de picos por hora do
+``9-acesso-alunos-offline.py`` agrupavam o log filtrado a cada mudança de
+período, curso ou status. Aqui o log é agregado uma única vez nos grãos
+(curso, data, status) e (curso, data, hora, status), com a quantidade de
+acessos e de usuários distintos. Filtrar e somar esses agregados custa
+O(dias × cursos), não O(linhas do log).
+
+O status é do usuário (dias desde o último acesso dele, calculado em
+``conjuntos_dados.montar_status_offline`` e levado a cada acesso) e entra
+no grão para que o filtro de status continue exato sobre os agregados, que
+são refeitos quando o status é recalculado. Usuários distintos só
+podem ser lidos no grão do agregado: somá-los entre dias, horas ou status
+conta o mesmo usuário mais de uma vez.
+"""
+
+import pandas as pd
+
+GRAO_DIA = ['course_name', 'data', 'status']
+GRAO_HORA = ['course_name', 'data', 'hora', 'status']
+
+
+def _agregar(df, grao):
+    agregado = df.groupby(grao, observed=True).agg(
+        acessos=('user_id', 'size'),
+        usuarios=('user_id', 'nunique'),
+    ).reset_index()
+    # Datas como datetime64 e status categórico: os filtros comparam vetores, não objetos
+    return agregado.assign(
+        data=pd.to_datetime(agregado['data']),
+        status=agregado['status'].astype('category'),
+    )
+
+
+def montar_agregados(df):
+    """``{'dia': ..., 'hora': ...}``: acessos e usuários distintos em cada grão."""
+    return {'dia': _agregar(df, GRAO_DIA), 'hora': _agregar(df, GRAO_HORA)}
+
+
+def filtrar_agregado(agregado, cursos=None, status=None, data_inicio=None, data_fim=None):
+    """Linhas do agregado dentro dos filtros (``None`` = sem filtro; datas inclusivas).
+
+    A coluna ``data`` dos agregados é ``datetime64``; ``.dt.date`` devolve os
+    objetos ``date`` do log original.
+    """
+    mascara = pd.Series(True, index=agregado.index)
+    if cursos is not None:
+        mascara &= agregado['course_name'].isin(cursos)
+    if status is not None:
+        mascara &= agregado['status'].isin(status)
+    if data_inicio is not None:
+        mascara &= agregado['data'] >= pd.Timestamp(data_inicio)
+    if data_fim is not None:
+        mascara &= agregado['data'] <= pd.Timestamp(data_fim)
+    return agregado[mascara]
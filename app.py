@@ -0,0 +1,35 @@
+"""App multipágina com os seis dashboards em um único servidor.
+
+Cada dashboard rodava como um app separado, com o próprio processo e os
+próprios caches: o log de acessos, as planilhas do Moodle e as bibliotecas
+carregadas uma vez por app. Aqui todos viram páginas de um ``st.navigation``
+e leem os dados do atualizador do processo (``conjuntos_dados``), um
+``st.cache_resource`` compartilhado por todas as páginas e sessões: cada
+planilha é lida uma vez por servidor.
+
+Os scripts continuam funcionando sozinhos (``streamlit run
+9-acesso-alunos-offline.py``). Por isso quem chama ``st.set_page_config``
+são as páginas, e não este arquivo: o Streamlit aceita uma chamada por
+execução.
+
+Uso::
+
+    streamlit run app.py
+"""
+
+import streamlit as st
+
+PAGINAS = {
+    "Acessos": [
+        st.Page("streamlit_atualizado.py", title="Acessos por estado e cidade", icon="📊", default=True),
+        st.Page("9-acesso-alunos-offline.py", title="Acessos ao Moodle (offline)", icon="🕒"),
+        st.Page("10-frequencia-aluno.py", title="Mapa de presença", icon="📚"),
+    ],
+    "Cursos e atividades": [
+        st.Page("3-acompanhamento_atividades_dashboard.py", title="Certificação por turma", icon="📜"),
+        st.Page("conclusao_atividades_estado.py", title="Conclusão de atividades", icon="✅"),
+        st.Page("dashboard_cursistas.py", title="Cursos [NF]", icon="🏫"),
+    ],
+}
+
+st.navigation(PAGINAS).run()
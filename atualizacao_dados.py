@@ -0,0 +1,203 @@
+"""Atualização dos dados dos dashboards em segundo plano, com troca atômica de versão.
+
+Sem isto, a leitura e os agregados de um conjunto de dados (o log de
+acessos, a planilha de conclusão...) eram montados dentro do rerun de quem
+abrisse o dashboard primeiro depois de um reinício ou de uma carga nova.
+Aqui cada conjunto é registrado com duas funções:
+
+- ``versao()``: identificador barato do conteúdo da fonte (manifesto do
+  armazenamento, hash da planilha...); ``None`` enquanto a fonte não está
+  pronta;
+- ``construir(versao)``: monta o conjunto inteiro (DataFrames, índices,
+  agregados). Roda fora das sessões, então não pode chamar ``st.*``.
+
+Um conjunto pode ser derivado de outro (``base``): a versão dele combina a
+do conjunto base com a própria (ou é só a da base, com ``versao=None``), e
+``construir`` recebe também o valor publicado da base. Ex.: o status
+Ativo/Inativo sobre o log de acessos é refeito quando o log muda ou quando
+vira a hora.
+
+Uma thread por conjunto confere a versão a cada ``INTERVALO_VERIFICACAO``
+segundos e, quando ela muda, constrói a nova versão por completo e só
+então a publica, trocando uma referência sob trava. Uma sessão pega a
+publicação atual no começo do rerun e usa sempre a mesma até o fim: nunca
+vê um conjunto pela metade e nunca espera por uma reconstrução. Só a
+primeira carga de um conjunto no processo espera (não há versão anterior
+para mostrar). Se a construção falhar, a versão anterior continua
+publicada e o erro aparece no painel de status.
+
+As publicações são compartilhadas por todas as sessões: não devem ser
+alteradas no lugar.
+
+Uso::
+
+    atualizador = atualizador_dados()
+    atualizador.registrar("conclusao", lambda: versao_dados(arquivo), montar_conclusao)
+    publicacao = atualizador.obter("conclusao")
+    df = publicacao.valor
+    exibir_status_dados(["conclusao"])
+"""
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+import streamlit as st
+
+INTERVALO_VERIFICACAO = float(os.environ.get("INTERVALO_ATUALIZACAO_DADOS", 30))
+
+
+@dataclass(frozen=True)
+class Publicacao:
+    """Uma versão pronta de um conjunto de dados."""
+
+    nome: str
+    versao: str
+    valor: object
+    construido_em: datetime
+    segundos: float
+
+
+class AtualizadorDados:
+    def __init__(self, intervalo=INTERVALO_VERIFICACAO):
+        self.intervalo = intervalo
+        self._fontes = {}
+        self._publicadas = {}
+        self._erros = {}
+        self._construindo = set()
+        self._prontas = {}
+        self._acordar = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, nome, versao, construir, base=None):
+        """Passa a manter ``nome`` atualizado; registros repetidos (a cada rerun) são ignorados.
+
+        As funções ficam guardadas pelo processo inteiro: devem ser de um
+        módulo, não do script da página (cujo namespace seria mantido vivo).
+        """
+        with self._trava:
+            if nome in self._fontes:
+                return
+            self._fontes[nome] = (versao, construir, base)
+            self._prontas[nome] = threading.Event()
+            self._acordar[nome] = threading.Event()
+        threading.Thread(target=self._vigiar, args=(nome,), name=f"atualizacao-{nome}", daemon=True).start()
+
+    def publicacao(self, nome):
+        """Publicação atual de ``nome`` ou ``None``, sem esperar."""
+        with self._trava:
+            return self._publicadas.get(nome)
+
+    def obter(self, nome, timeout=None):
+        """Publicação atual de ``nome``; só espera se nenhuma versão ficou pronta ainda.
+
+        Se a primeira construção falhou, repassa a exceção dela.
+        """
+        self._prontas[nome].wait(timeout)
+        with self._trava:
+            publicacao = self._publicadas.get(nome)
+            erro = self._erros.get(nome)
+        if publicacao is not None:
+            return publicacao
+        if erro is not None:
+            raise erro[1]
+        raise TimeoutError(f"O conjunto '{nome}' ainda não foi construído")
+
+    def estado(self, nome):
+        """``(construindo, (versão, exceção, quando) da última falha ou None)``."""
+        with self._trava:
+            return nome in self._construindo, self._erros.get(nome)
+
+    def verificar_agora(self):
+        """Antecipa a próxima verificação de todas as fontes (ex.: logo depois de uma carga)."""
+        for evento in list(self._acordar.values()):
+            evento.set()
+
+    def _vigiar(self, nome):
+        while True:
+            self._atualizar(nome)
+            self._acordar[nome].wait(self.intervalo)
+            self._acordar[nome].clear()
+
+    def _atualizar(self, nome):
+        obter_versao, construir, base = self._fontes[nome]
+        atual = self.publicacao(nome)
+        versao = None
+        argumentos = ()
+        try:
+            if base is None:
+                versao = obter_versao()
+            else:
+                publicacao_base = self.publicacao(base)
+                if publicacao_base is None:
+                    self._repassar_falha(nome, base)
+                    return
+                versao = publicacao_base.versao
+                if obter_versao is not None:
+                    versao = f"{versao}|{obter_versao()}"
+                argumentos = (publicacao_base.valor,)
+            if versao is None or (atual is not None and versao == atual.versao):
+                return
+            falha = self._erros.get(nome)
+            # Uma versão que já falhou só é tentada de novo se não houver outra para mostrar
+            if falha is not None and falha[0] == versao and atual is not None:
+                return
+            with self._trava:
+                self._construindo.add(nome)
+            inicio = time.perf_counter()
+            valor = construir(versao, *argumentos)
+            publicacao = Publicacao(nome, versao, valor, datetime.now(), time.perf_counter() - inicio)
+        except Exception as e:
+            with self._trava:
+                self._erros[nome] = (versao, e, datetime.now())
+                self._construindo.discard(nome)
+            self._prontas[nome].set()
+            return
+
+        with self._trava:
+            # Troca atômica: quem já pegou a versão anterior continua com ela até o fim do rerun
+            self._publicadas[nome] = publicacao
+            self._erros.pop(nome, None)
+            self._construindo.discard(nome)
+        self._prontas[nome].set()
+        # Conjuntos derivados deste podem ter mudado de versão
+        self.verificar_agora()
+
+    def _repassar_falha(self, nome, base):
+        """Sem versão da base: se ela falhou, quem espera pelo derivado recebe o mesmo erro."""
+        with self._trava:
+            falha = self._erros.get(base)
+            if falha is None:
+                return
+            self._erros[nome] = falha
+        self._prontas[nome].set()
+
+
+@st.cache_resource
+def atualizador_dados():
+    """Atualizador único do processo, compartilhado por todas as sessões."""
+    return AtualizadorDados()
+
+
+def exibir_status_dados(nomes):
+    """Painel na barra lateral com a versão publicada de cada conjunto e quando foi construída."""
+    atualizador = atualizador_dados()
+    with st.sidebar.expander("🔄 Atualização dos dados"):
+        for nome in nomes:
+            publicacao = atualizador.publicacao(nome)
+            construindo, falha = atualizador.estado(nome)
+            if publicacao is None:
+                st.caption(f"**{nome}**: aguardando a primeira carga")
+            else:
+                st.caption(
+                    f"**{nome}**: versão `{publicacao.versao}`, construída em "
+                    f"{publicacao.construido_em:%d/%m/%Y %H:%M:%S} ({publicacao.segundos:.1f}s)"
+                )
+            if construindo:
+                st.caption("⏳ Nova versão em construção; a atual continua em uso.")
+            if falha is not None:
+                versao, erro, quando = falha
+                st.warning(f"Falha ao construir a versão `{versao}` em {quando:%d/%m %H:%M:%S}: {erro}")
+        st.caption(f"Fontes verificadas a cada {atualizador.intervalo:.0f}s.")
@@ -0,0 +1,51 @@
+"""Benchmark: leitura direta do .xlsx vs. leitura pelo cache Parquet.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_cache_excel [planilha.xlsx ...]
+
+Sem argumentos, mede todas as planilhas .xlsx da raiz.
+"""
+
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from cache_dados import garantir_cache, ler_excel
+
+REPETICOES = 5
+
+
+def medir(funcao, repeticoes=REPETICOES):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main(argv):
+    raiz = Path(__file__).resolve().parent.parent
+    planilhas = [Path(p) for p in argv] or sorted(raiz.glob("*.xlsx"))
+
+    print(f"{'Planilha':<40} {'xlsx (s)':>10} {'conversão (s)':>14} {'cache (ms)':>11} {'ganho':>8}")
+    for planilha in planilhas:
+        t_xlsx = medir(lambda: pd.read_excel(planilha, sheet_name=None), repeticoes=1)
+
+        inicio = time.perf_counter()
+        garantir_cache(planilha)
+        t_conversao = time.perf_counter() - inicio
+
+        t_cache = medir(lambda: ler_excel(planilha, sheet_name=None))
+        print(
+            f"{planilha.name:<40} {t_xlsx:>10.2f} {t_conversao:>14.2f} "
+            f"{t_cache * 1000:>11.1f} {t_xlsx / t_cache:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,81 @@
+"""Benchmark: backend pandas vs. DuckDB nas consultas de ``streamlit_atualizado.py``.
+
+Replica ``Acessos_tratado.xlsx`` em 1×, 10× e 100× e mede, para cada
+backend, o tempo de carga, o tempo das agregações de um rerun típico
+(métricas do topo e contagens de todas as visões) e o tempo de materializar
+a tabela de dados filtrados como DataFrame.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_consultas_acessos [escala ...]
+"""
+
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from cache_dados import ler_excel
+from consultas_acessos import BACKENDS, Filtros, criar_consultas, normalizar_acessos
+
+ESCALAS = (1, 10, 100)
+REPETICOES = 5
+
+
+def replicar(df, escala):
+    copias = []
+    for i in range(escala):
+        copia = df.copy()
+        copia['nome'] = copia['nome'] + f" #{i}"
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def agregacoes(consultas, filtros):
+    """As agregações que um rerun do dashboard dispara (todas as visões)."""
+    consultas.metricas(filtros)
+    consultas.contagem(filtros, ['estado'])
+    consultas.contagem(filtros, ['cidade']).nlargest(10)
+    consultas.contagem(filtros, ['estado', 'acesso']).unstack(fill_value=0)
+    consultas.contagem(filtros, ['id_coorte', 'acesso']).unstack(fill_value=0)
+    consultas.contagem(filtros, ['estado', 'id_coorte', 'acesso']).unstack(fill_value=0)
+    consultas.contagem(filtros, ['cidade', 'estado', 'acesso']).unstack(fill_value=0)
+
+
+def medir(funcao):
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main(argv):
+    escalas = [int(e) for e in argv] or ESCALAS
+    base = normalizar_acessos(ler_excel('Acessos_tratado.xlsx', sheet_name='Sheet1'))
+    cenarios = {
+        "sem filtro": Filtros(),
+        "2 estados": Filtros(estado=('CE', 'PI')),
+        "1 estado + acesso": Filtros(estado=('MA',), acesso=('nunca acessou',)),
+    }
+
+    print(f"{'escala':>6} {'linhas':>9} {'backend':>8} {'carga (ms)':>11}  " +
+          "  ".join(f"{nome + ' (agreg./tabela ms)':>36}" for nome in cenarios))
+    for escala in escalas:
+        df = replicar(base, escala)
+        for backend in BACKENDS:
+            inicio = time.perf_counter()
+            consultas = criar_consultas(df, backend)
+            t_carga = time.perf_counter() - inicio
+            tempos = [
+                (medir(lambda f=f: agregacoes(consultas, f)), medir(lambda f=f: consultas.filtrar(f)))
+                for f in cenarios.values()
+            ]
+            print(f"{escala:>5}× {len(df):>9} {backend:>8} {t_carga * 1000:>11.1f}  " +
+                  "  ".join(f"{t_agreg * 1000:>26.1f} / {t_tabela * 1000:>7.1f}" for t_agreg, t_tabela in tempos))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
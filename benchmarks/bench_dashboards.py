@@ -0,0 +1,481 @@
+"""Benchmark ponta a ponta dos seis dashboards com o ``AppTest`` do Streamlit.
+
+Para cada escala (1×, 10× e 100× por padrão) monta uma massa de dados em um
+diretório próprio, replicando as planilhas do repositório com ids de aluno
+deslocados e nomes com sufixo, e ingere o log de acessos no armazenamento
+de ``ingestao_acessos``. Com ``--sintetico`` a massa vem de
+``dados_sinteticos`` (alunos e acessos multiplicados pela escala), sem
+depender das planilhas reais. Cada script roda em um processo separado (caches
+do Streamlit vazios e pico de memória isolado), que executa em sequência,
+na mesma sessão:
+
+- a carga inicial (tempo frio: processo novo, sem ``st.cache_*``);
+- cada cenário do script (opção do menu, troca de turma, aluno, filtro...),
+  medindo a primeira execução após a interação e a mediana dos reruns
+  seguintes (tempo quente).
+
+As abas (``st.tabs``) são todas executadas em cada rerun, então entram no
+tempo de cada cenário. Para cada passo ficam registrados os tempos, o pico
+de memória (RSS) do processo até ali e as exceções exibidas pelo app.
+
+A primeira pintura (``primeira_pintura_s``) é o tempo até o script enviar
+o primeiro elemento visível (spinners e marcadores vazios não contam): é
+quando o navegador deixa de mostrar a página em branco. O processo filho
+roda com ``-X importtime``, e os módulos importados durante a carga inicial
+do script (o que vem depois do ``streamlit`` e do ``pandas``, já carregados)
+entram no resultado com o tempo acumulado de cada import de primeiro nível.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_dashboards [--escalas 1 10 100] [--scripts ...] [--sintetico] [--saida resultados.json]
+    python -m benchmarks.bench_dashboards --comparar antes.json depois.json
+
+As massas ficam em ``--fixtures`` (padrão: diretório temporário do sistema)
+e são reaproveitadas entre execuções.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+RAIZ = Path(__file__).resolve().parent.parent
+if str(RAIZ) not in sys.path:
+    sys.path.insert(0, str(RAIZ))
+
+import dados_sinteticos  # noqa: E402
+from cache_dados import gravar_cache, ler_excel  # noqa: E402
+from ingestao_acessos import DIRETORIO_STORE, ingerir  # noqa: E402
+
+ESCALAS = (1, 10, 100)
+REPETICOES_QUENTE = 3
+TIMEOUT_APP = 600
+MAIORES_IMPORTACOES = 5
+MARCA_INICIO_IMPORTACOES = "bench_dashboards: inicio da carga inicial"
+MARCA_FIM_IMPORTACOES = "bench_dashboards: fim da carga inicial"
+DIRETORIO_FIXTURES = Path(tempfile.gettempdir()) / "bench_dashboards"
+ALUNOS_SINTETICOS = 3400
+
+# Cada cópia desloca os ids de aluno e acrescenta " #i" às colunas de nome,
+# para que as cópias sejam alunos distintos e não colapsem em joins e groupbys.
+# Abas fora da lista (cursos, atividades, módulos) não são replicadas.
+DESLOCAMENTO_ID = 10_000_000
+REPLICACAO = {
+    "Acessos_tratado.xlsx": {"Sheet1": ([], ["nome"])},
+    "estado_de_conclusao_tratado.xlsx": {"Sheet1": ([], ["nome_aluno", "aluno", "email"])},
+    "dados_moodle.xlsx": {
+        "usuarios": (["id"], ["lastname", "email"]),
+        "envios_assign": (["userid"], []),
+    },
+    "dados_nf.xlsx": {
+        "Matriculas": (["userid"], []),
+        "Usuarios": (["userid"], ["lastname", "email"]),
+        "Perfil": (["userid"], []),
+        "Conclusoes_Modulos": (["userid"], []),
+        "Funcoes": (["userid"], []),
+    },
+}
+LOG_ACESSOS = ("dados_acessos.xlsx", ["user_id"], ["lastname"])
+
+SCRIPTS = [
+    "streamlit_atualizado.py",
+    "3-acompanhamento_atividades_dashboard.py",
+    "dashboard_cursistas.py",
+    "conclusao_atividades_estado.py",
+    "9-acesso-alunos-offline.py",
+    "10-frequencia-aluno.py",
+]
+
+
+# ---------- Massa de dados ----------
+
+def replicar(df, escala, ids=(), nomes=()):
+    copias = [df]
+    for i in range(1, escala):
+        copia = df.copy()
+        for coluna in ids:
+            copia[coluna] = copia[coluna] + i * DESLOCAMENTO_ID
+        for coluna in nomes:
+            copia[coluna] = copia[coluna].where(copia[coluna].isna(), copia[coluna].astype(str) + f" #{i}")
+        copias.append(copia)
+    return pd.concat(copias, ignore_index=True)
+
+
+def preparar_fixture(escala, diretorio=DIRETORIO_FIXTURES, sintetico=False):
+    """Diretório com todas as entradas dos dashboards na escala pedida."""
+    destino = Path(diretorio) / (f"sintetico_{escala}" if sintetico else f"escala_{escala}")
+    pronto = destino / ".pronto"
+    if pronto.exists():
+        return destino
+    destino.mkdir(parents=True, exist_ok=True)
+
+    if sintetico:
+        dados_sinteticos.gerar(destino, alunos=ALUNOS_SINTETICOS * escala, xlsx=False)
+        pronto.touch()
+        return destino
+
+    for arquivo, regras in REPLICACAO.items():
+        abas = ler_excel(RAIZ / arquivo, sheet_name=None)
+        abas = {
+            nome: replicar(df, escala, *regras[nome]) if nome in regras else df
+            for nome, df in abas.items()
+        }
+        # Acima de ~1M linhas o .xlsx não comporta: os dados vão direto para o cache Parquet
+        gravar_cache(destino / arquivo, abas)
+
+    arquivo, ids, nomes = LOG_ACESSOS
+    exportacao = destino / "dados_acessos.parquet"
+    replicar(ler_excel(RAIZ / arquivo), escala, ids, nomes).to_parquet(exportacao, index=False)
+    ingerir(exportacao, store=destino / DIRETORIO_STORE)
+    exportacao.unlink()
+
+    pronto.touch()
+    return destino
+
+
+# ---------- Cenários por script ----------
+
+def _cenarios_atualizado(at):
+    radio = at.sidebar.radio[0]
+    passos = [(f"menu: {opcao}", lambda at, o=opcao: at.sidebar.radio[0].set_value(o)) for opcao in radio.options]
+    passos.append(("busca por nome", _buscar_nome))
+    return passos
+
+
+def _buscar_nome(at):
+    # O campo de busca só existe com o menu "Buscar por Nome" aberto
+    at.sidebar.radio[0].set_value(next(o for o in at.sidebar.radio[0].options if "Buscar" in o)).run()
+    at.text_input(key="busca_nome").input("maria")
+
+
+def _selecionar_aluno(at):
+    """O selectbox de alunos guarda userids e mostra nomes: acha o userid da 2ª opção."""
+    caixa = at.sidebar.selectbox[1]
+    rotulo = caixa.options[1]
+    for userid in ler_excel("dados_moodle.xlsx", sheet_name="envios_assign")["userid"].unique():
+        try:
+            if caixa.format_func(userid) == rotulo:
+                return caixa.set_value(userid)
+        except KeyError:
+            continue
+    raise LookupError(f"Nenhum userid com o rótulo {rotulo!r}")
+
+
+def _cenarios_acompanhamento(at):
+    return [
+        ("outra turma", lambda at: at.sidebar.selectbox[0].select_index(1)),
+        ("um aluno", _selecionar_aluno),
+    ]
+
+
+def _cenarios_cursistas(at):
+    return [("outro curso", lambda at: at.selectbox[0].select_index(1))]
+
+
+def _cenarios_conclusao(at):
+    return [
+        ("um estado", lambda at: at.sidebar.multiselect[2].set_value(at.sidebar.multiselect[2].options[:1])),
+        ("um tipo de atividade", lambda at: at.sidebar.multiselect[1].set_value(at.sidebar.multiselect[1].options[:1])),
+    ]
+
+
+def _cenarios_acessos_offline(at):
+    return [
+        ("um curso", lambda at: at.sidebar.multiselect[0].set_value(at.sidebar.multiselect[0].options[:1])),
+        ("só inativos", lambda at: at.sidebar.multiselect[1].set_value(["Inativo"])),
+    ]
+
+
+def _cenarios_frequencia(at):
+    return [
+        ("outro curso", lambda at: at.sidebar.selectbox[0].select_index(1)),
+        ("um aluno", lambda at: at.sidebar.selectbox[1].select_index(1)),
+    ]
+
+
+CENARIOS = {
+    "streamlit_atualizado.py": _cenarios_atualizado,
+    "3-acompanhamento_atividades_dashboard.py": _cenarios_acompanhamento,
+    "dashboard_cursistas.py": _cenarios_cursistas,
+    "conclusao_atividades_estado.py": _cenarios_conclusao,
+    "9-acesso-alunos-offline.py": _cenarios_acessos_offline,
+    "10-frequencia-aluno.py": _cenarios_frequencia,
+}
+
+
+# ---------- Execução de um script (processo filho) ----------
+
+def _pico_rss_mb():
+    # VmHWM é o pico deste processo; o ru_maxrss herda o RSS do pai no fork
+    try:
+        with open("/proc/self/status") as f:
+            for linha in f:
+                if linha.startswith("VmHWM:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB, macOS em bytes
+    return pico / 1024 ** 2 if sys.platform == "darwin" else pico / 1024
+
+
+class _PrimeiraPintura:
+    """Instante em que o script enviou o primeiro elemento visível desde ``zerar()``."""
+
+    def __init__(self):
+        self.instante = None
+
+    def zerar(self):
+        self.instante = None
+
+    def instalar(self):
+        from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+
+        enqueue = ScriptRunContext.enqueue
+        registro = self
+
+        def enqueue_medido(ctx, msg):
+            if registro.instante is None and _elemento_visivel(msg):
+                registro.instante = time.perf_counter()
+            enqueue(ctx, msg)
+
+        ScriptRunContext.enqueue = enqueue_medido
+        return self
+
+
+def _elemento_visivel(msg):
+    if not msg.HasField("delta") or msg.delta.WhichOneof("type") != "new_element":
+        return False
+    return msg.delta.new_element.WhichOneof("type") not in ("spinner", "empty")
+
+
+def _medir_passo(at, nome, acao=None, pintura=None):
+    if acao is not None:
+        acao(at)
+    if pintura is not None:
+        pintura.zerar()
+    inicio = time.perf_counter()
+    at.run()
+    primeira = time.perf_counter() - inicio
+    primeira_pintura = None
+    if pintura is not None and pintura.instante is not None:
+        primeira_pintura = round(pintura.instante - inicio, 4)
+
+    reruns = []
+    for _ in range(REPETICOES_QUENTE):
+        inicio = time.perf_counter()
+        at.run()
+        reruns.append(time.perf_counter() - inicio)
+
+    return {
+        "cenario": nome,
+        "primeira_execucao_s": round(primeira, 4),
+        "primeira_pintura_s": primeira_pintura,
+        "rerun_mediana_s": round(statistics.median(reruns), 4),
+        "pico_rss_mb": round(_pico_rss_mb(), 1),
+        "excecoes": [str(e.value)[:300] for e in at.exception],
+    }
+
+
+def executar_script(script, fixture):
+    """Mede um script em uma massa de dados (chamado no processo filho)."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(fixture)
+    rss_inicial = _pico_rss_mb()
+    pintura = _PrimeiraPintura().instalar()
+    at = AppTest.from_file(str(RAIZ / script), default_timeout=TIMEOUT_APP)
+    # Delimita no stderr (saída do -X importtime) os imports feitos pelo script
+    print(MARCA_INICIO_IMPORTACOES, file=sys.stderr, flush=True)
+    passos = [_medir_passo(at, "carga inicial", pintura=pintura)]
+    print(MARCA_FIM_IMPORTACOES, file=sys.stderr, flush=True)
+    for nome, acao in CENARIOS[script](at):
+        try:
+            passos.append(_medir_passo(at, nome, acao, pintura))
+        except Exception as e:  # widget ausente nesta massa, timeout...
+            passos.append({"cenario": nome, "erro": f"{type(e).__name__}: {e}"[:300]})
+    return {"rss_inicial_mb": round(rss_inicial, 1), "passos": passos}
+
+
+def perfil_importacoes(stderr):
+    """Imports de primeiro nível entre as marcas da carga inicial, na saída do ``-X importtime``.
+
+    Cada linha é ``import time: própria | acumulada | nome``, com o nome
+    recuado dois espaços por nível de aninhamento; só o primeiro nível entra
+    na soma, já que o acumulado dele inclui os imports aninhados.
+    """
+    importacoes = []
+    dentro = False
+    for linha in stderr.splitlines():
+        if linha.startswith(MARCA_INICIO_IMPORTACOES):
+            dentro = True
+        elif linha.startswith(MARCA_FIM_IMPORTACOES):
+            break
+        elif dentro and linha.startswith("import time:"):
+            campos = linha[len("import time:"):].split("|")
+            if len(campos) != 3 or not campos[1].strip().isdigit():
+                continue  # cabeçalho
+            nome = campos[2][1:]
+            if not nome.startswith(" "):
+                importacoes.append((nome, int(campos[1]) / 1000))
+    importacoes.sort(key=lambda item: item[1], reverse=True)
+    return {
+        "total_ms": round(sum(ms for _, ms in importacoes), 1),
+        "modulos": len(importacoes),
+        "maiores": [[nome, round(ms, 1)] for nome, ms in importacoes[:MAIORES_IMPORTACOES]],
+    }
+
+
+def _rodar_em_subprocesso(script, fixture):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        saida = Path(f.name)
+    try:
+        processo = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "benchmarks.bench_dashboards",
+             "--executar", script, "--fixture", str(fixture), "--resultado", str(saida)],
+            cwd=RAIZ, capture_output=True, text=True,
+        )
+        if processo.returncode < 0:
+            # SIGKILL aqui quase sempre é o OOM killer
+            return {"erro": f"encerrado pelo sinal {-processo.returncode}", "codigo_saida": processo.returncode}
+        if processo.returncode != 0:
+            linhas = [l for l in processo.stderr.strip().splitlines() if "Error" in l or "Exception" in l]
+            erro = linhas[-1] if linhas else f"código de saída {processo.returncode}"
+            return {"erro": erro[:300], "codigo_saida": processo.returncode}
+        resultado = json.loads(saida.read_text(encoding="utf-8"))
+        resultado["importacoes"] = perfil_importacoes(processo.stderr)
+        return resultado
+    finally:
+        saida.unlink(missing_ok=True)
+
+
+# ---------- Relatório ----------
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ambiente():
+    import streamlit
+
+    return {
+        "commit": _commit_atual(),
+        "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "streamlit": streamlit.__version__,
+        "maquina": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _imprimir(escala, script, resultado):
+    if "erro" in resultado:
+        print(f"{escala:>5}× {script:<42} FALHOU: {resultado['erro']}")
+        return
+    for passo in resultado["passos"]:
+        if "erro" in passo:
+            print(f"{escala:>5}× {script:<42} {passo['cenario']:<34} ERRO: {passo['erro']}")
+            continue
+        alerta = " (!)" if passo["excecoes"] else ""
+        pintura = passo.get("primeira_pintura_s")
+        pintura = f"{pintura * 1000:>9.0f}" if pintura is not None else f"{'-':>9}"
+        print(f"{escala:>5}× {script:<42} {passo['cenario']:<34} "
+              f"{pintura} {passo['primeira_execucao_s'] * 1000:>9.0f} {passo['rerun_mediana_s'] * 1000:>9.0f} "
+              f"{passo['pico_rss_mb']:>9.0f}{alerta}")
+    importacoes = resultado.get("importacoes")
+    if importacoes:
+        maiores = ", ".join(f"{nome} {ms:.0f}" for nome, ms in importacoes["maiores"])
+        print(f"{escala:>5}× {script:<42} {'imports na carga inicial':<34} "
+              f"{importacoes['total_ms']:>9.0f} ms em {importacoes['modulos']} módulos ({maiores})")
+
+
+def _indexar(resultados):
+    tabela = {}
+    for item in resultados["execucoes"]:
+        for passo in item.get("passos", []):
+            if "erro" not in passo:
+                tabela[(item["escala"], item["script"], passo["cenario"])] = passo
+    return tabela
+
+
+def comparar(arquivo_antes, arquivo_depois):
+    """Razão depois/antes dos tempos e da memória para os passos em comum."""
+    antes = json.loads(Path(arquivo_antes).read_text(encoding="utf-8"))
+    depois = json.loads(Path(arquivo_depois).read_text(encoding="utf-8"))
+    print(f"antes: {antes['ambiente']['commit']}  depois: {depois['ambiente']['commit']}")
+    print(f"{'escala':>6} {'script':<42} {'cenário':<34} {'pintura':>9} {'1ª exec.':>9} {'rerun':>9} {'RSS':>9}")
+    tabela_antes = _indexar(antes)
+    for chave, passo in _indexar(depois).items():
+        anterior = tabela_antes.get(chave)
+        if anterior is None:
+            continue
+        # Resultados anteriores à medição da primeira pintura não têm a coluna
+        razoes = [
+            passo[c] / anterior[c] if passo.get(c) is not None and anterior.get(c) else float("nan")
+            for c in ("primeira_pintura_s", "primeira_execucao_s", "rerun_mediana_s", "pico_rss_mb")
+        ]
+        escala, script, cenario = chave
+        print(f"{escala:>5}× {script:<42} {cenario:<34} " + " ".join(f"{r:>8.2f}×" for r in razoes))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Benchmark dos dashboards com AppTest")
+    parser.add_argument("--escalas", type=int, nargs="+", default=list(ESCALAS))
+    parser.add_argument("--scripts", nargs="+", default=SCRIPTS, choices=SCRIPTS)
+    parser.add_argument("--fixtures", type=Path, default=DIRETORIO_FIXTURES)
+    parser.add_argument("--sintetico", action="store_true", help="massa gerada por dados_sinteticos")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON com os resultados")
+    parser.add_argument("--comparar", nargs=2, metavar=("ANTES", "DEPOIS"))
+    # Uso interno: execução de um único script no processo filho
+    parser.add_argument("--executar", help=argparse.SUPPRESS)
+    parser.add_argument("--fixture", help=argparse.SUPPRESS)
+    parser.add_argument("--resultado", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        comparar(*args.comparar)
+        return
+    if args.executar:
+        resultado = executar_script(args.executar, args.fixture)
+        Path(args.resultado).write_text(json.dumps(resultado, ensure_ascii=False), encoding="utf-8")
+        return
+
+    ambiente = _ambiente()
+    saida = args.saida or RAIZ / "benchmarks" / "resultados" / f"dashboards-{ambiente['commit'] or 'local'}.json"
+    execucoes = []
+
+    print(f"{'escala':>6} {'script':<42} {'cenário':<34} {'pintura':>9} {'1ª (ms)':>9} {'rerun':>9} {'RSS (MB)':>9}")
+    for escala in args.escalas:
+        inicio = time.perf_counter()
+        fixture = preparar_fixture(escala, args.fixtures, args.sintetico)
+        print(f"{escala:>5}× massa de dados em {fixture} ({time.perf_counter() - inicio:.1f}s)")
+        for script in args.scripts:
+            resultado = _rodar_em_subprocesso(script, fixture)
+            _imprimir(escala, script, resultado)
+            execucoes.append({"escala": escala, "script": script, "sintetico": args.sintetico, **resultado})
+
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(
+        json.dumps({"ambiente": ambiente, "execucoes": execucoes}, ensure_ascii=False, indent=2),
+        encoding="utf-8",
+    )
+    print(f"Resultados em {saida}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
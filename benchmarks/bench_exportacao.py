@@ -0,0 +1,81 @@
+"""Benchmark: exportação imediata (``to_csv`` em todo rerun) vs. sob demanda em blocos.
+
+Gera o log de acessos sintético (``dados_sinteticos``) em 1× e 10× e mede:
+
+- o custo que todo rerun pagava antes, com ou sem download:
+  ``df.to_csv(index=False).encode()`` para montar o ``st.download_button``;
+- o custo de cada formato de ``exportacao.exportar`` (CSV, Parquet, XLSX),
+  que agora só é pago quando o usuário pede o arquivo, com o pico de memória
+  Python (``tracemalloc``) e o tamanho do arquivo gerado.
+
+Com a exportação sob demanda, um rerun sem download não serializa nada.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_exportacao [escala ...]
+"""
+
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+from dados_sinteticos import ACESSOS_POR_ALUNO, INICIO_PADRAO, gerar_alunos, gerar_cursos, gerar_log_acessos
+from exportacao import FORMATOS, LIMITE_LINHAS_XLSX, exportar
+
+ESCALAS = (1, 10)
+ALUNOS = 3400
+REPETICOES = 3
+
+
+def gerar_log(escala, semente=42):
+    rng = np.random.default_rng(semente)
+    cursos = gerar_cursos(rng, 4, 12)
+    alunos = gerar_alunos(rng, cursos, ALUNOS * escala, INICIO_PADRAO)
+    log, _ = gerar_log_acessos(rng, alunos, ACESSOS_POR_ALUNO * ALUNOS * escala, 60, INICIO_PADRAO)
+    return log
+
+
+def medir(funcao):
+    """Mediana do tempo (s) e pico de memória Python (MB).
+
+    O pico vem de uma execução separada sob ``tracemalloc``, que deixa o
+    código bem mais lento e por isso fica fora da medição de tempo.
+    """
+    tempos = []
+    for _ in range(REPETICOES):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start()
+    funcao()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(tempos), pico / 1024 ** 2
+
+
+def main(argv):
+    escalas = [int(e) for e in argv] or ESCALAS
+    print(f"{'escala':>6} {'linhas':>9} {'modo':>28} {'tempo (ms)':>11} {'pico (MB)':>10} {'arquivo (MB)':>13}")
+    with tempfile.TemporaryDirectory() as diretorio:
+        for escala in escalas:
+            df = gerar_log(escala)
+            t, pico = medir(lambda: df.to_csv(index=False).encode('utf-8'))
+            print(f"{escala:>5}× {len(df):>9} {'to_csv a cada rerun (antes)':>28} {t * 1000:>11.1f} {pico:>10.1f} {'-':>13}")
+            print(f"{escala:>5}× {len(df):>9} {'rerun sem download (agora)':>28} {0.0:>11.1f} {0.0:>10.1f} {'-':>13}")
+            for formato, (extensao, _, _) in FORMATOS.items():
+                if extensao == ".xlsx" and len(df) >= LIMITE_LINHAS_XLSX:
+                    print(f"{escala:>5}× {len(df):>9} {formato:>28} {'acima do limite do Excel':>37}")
+                    continue
+                destino = Path(diretorio) / f"exportacao{extensao}"
+                t, pico = medir(lambda: exportar(df, destino, formato))
+                tamanho = destino.stat().st_size / 1024 ** 2
+                print(f"{escala:>5}× {len(df):>9} {formato:>28} {t * 1000:>11.1f} {pico:>10.1f} {tamanho:>13.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
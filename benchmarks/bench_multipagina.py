@@ -0,0 +1,186 @@
+"""Benchmark: memória do app multipágina (``app.py``) contra os seis apps separados.
+
+Na mesma massa de dados do ``bench_dashboards`` (``preparar_fixture``), mede
+duas formas de servir os dashboards, cada uma com ``--sessoes`` sessões
+(``AppTest`` distintos no mesmo processo, que compartilham os
+``st.cache_resource`` como as sessões de um servidor):
+
+- separados: um processo por script, como seis ``streamlit run``; cada
+  sessão faz a carga inicial e percorre os cenários do script
+  (``bench_dashboards.CENARIOS``);
+- multipágina: um único processo com o ``app.py``; cada sessão abre todas
+  as páginas e percorre os mesmos cenários. Cada página entra por um
+  ``AppTest`` próprio, aberto direto nela (``switch_page`` antes do
+  primeiro ``run``): depois de trocar de página, o ``AppTest`` reenviaria
+  o estado dos widgets da página anterior.
+
+As sessões ficam vivas até a medição, como abas abertas no navegador.
+
+Com todas as páginas em uso, a memória dos separados é a soma do RSS dos
+seis processos; a do multipágina é o RSS do processo único. Para cada
+processo ficam o RSS ao final, o pico e o tempo total. O RSS final é lido
+depois de ``gc.collect()`` e, na glibc, de ``malloc_trim(0)``: com várias
+threads (sessões, atualizador) a folga que o alocador guarda nas arenas
+varia de uma execução para outra e escondia a memória de fato em uso.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_multipagina [--escala 1] [--sessoes 1 3] [--sintetico] [--saida resultados.json]
+"""
+
+import argparse
+import ctypes
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_dashboards import (
+    CENARIOS,
+    DIRETORIO_FIXTURES,
+    RAIZ,
+    SCRIPTS,
+    TIMEOUT_APP,
+    _ambiente,
+    _pico_rss_mb,
+    preparar_fixture,
+)
+
+APP = "app.py"
+SESSOES = (1, 3)
+
+
+def _rss_atual_mb():
+    with open("/proc/self/status") as f:
+        for linha in f:
+            if linha.startswith("VmRSS:"):
+                return int(linha.split()[1]) / 1024
+    return float("nan")
+
+
+def _devolver_folga():
+    gc.collect()
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):  # fora da glibc
+        pass
+
+
+def _percorrer(at, script, erros):
+    """Carga da página e cenários do script, na sessão ``at``."""
+    at.run()
+    for nome, acao in CENARIOS[script](at):
+        try:
+            acao(at)
+            at.run()
+        except Exception as e:  # widget ausente nesta massa, timeout...
+            erros.append(f"{script} / {nome}: {type(e).__name__}: {e}"[:300])
+    erros.extend(f"{script}: {str(e.value)[:300]}" for e in at.exception)
+
+
+def executar(alvo, fixture, sessoes):
+    """Mede um processo: um script sozinho ou o ``app.py`` com todas as páginas."""
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(fixture)
+    inicio = time.perf_counter()
+    erros = []
+    abertas = []
+    for _ in range(sessoes):
+        for script in SCRIPTS if alvo == APP else [alvo]:
+            at = AppTest.from_file(str(RAIZ / alvo), default_timeout=TIMEOUT_APP)
+            if alvo == APP:
+                at.switch_page(script)
+            _percorrer(at, script, erros)
+            abertas.append(at)
+    _devolver_folga()
+    return {
+        "alvo": alvo,
+        "segundos": round(time.perf_counter() - inicio, 2),
+        "rss_mb": round(_rss_atual_mb(), 1),
+        "pico_rss_mb": round(_pico_rss_mb(), 1),
+        "erros": erros,
+    }
+
+
+def _rodar_em_subprocesso(alvo, fixture, sessoes):
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        saida = Path(f.name)
+    try:
+        processo = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_multipagina", "--executar", alvo,
+             "--fixture", str(fixture), "--sessoes", str(sessoes), "--resultado", str(saida)],
+            cwd=RAIZ, capture_output=True, text=True,
+        )
+        if processo.returncode != 0:
+            linhas = [l for l in processo.stderr.strip().splitlines() if "Error" in l or "Exception" in l]
+            erro = linhas[-1] if linhas else f"código de saída {processo.returncode}"
+            return {"alvo": alvo, "erro": erro[:300]}
+        return json.loads(saida.read_text(encoding="utf-8"))
+    finally:
+        saida.unlink(missing_ok=True)
+
+
+def _imprimir(modo, sessoes, resultado):
+    if "erro" in resultado:
+        print(f"{modo:<12} {sessoes:>7} {resultado['alvo']:<42} FALHOU: {resultado['erro']}")
+        return
+    alerta = f" ({len(resultado['erros'])} erros)" if resultado["erros"] else ""
+    print(f"{modo:<12} {sessoes:>7} {resultado['alvo']:<42} {resultado['rss_mb']:>9.0f} "
+          f"{resultado['pico_rss_mb']:>9.0f} {resultado['segundos']:>9.1f}{alerta}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Memória do app multipágina contra os apps separados")
+    parser.add_argument("--escala", type=int, default=1)
+    parser.add_argument("--sessoes", type=int, nargs="+", default=list(SESSOES))
+    parser.add_argument("--fixtures", type=Path, default=DIRETORIO_FIXTURES)
+    parser.add_argument("--sintetico", action="store_true", help="massa gerada por dados_sinteticos")
+    parser.add_argument("--saida", type=Path, default=None, help="arquivo JSON com os resultados")
+    # Uso interno: execução de um único processo medido
+    parser.add_argument("--executar", help=argparse.SUPPRESS)
+    parser.add_argument("--fixture", help=argparse.SUPPRESS)
+    parser.add_argument("--resultado", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.executar:
+        resultado = executar(args.executar, args.fixture, args.sessoes[0])
+        Path(args.resultado).write_text(json.dumps(resultado, ensure_ascii=False), encoding="utf-8")
+        return
+
+    fixture = preparar_fixture(args.escala, args.fixtures, args.sintetico)
+    print(f"massa de dados em {fixture}")
+    print(f"{'modo':<12} {'sessões':>7} {'processo':<42} {'RSS (MB)':>9} {'pico':>9} {'tempo (s)':>9}")
+    medicoes = []
+    for sessoes in args.sessoes:
+        separados = [_rodar_em_subprocesso(script, fixture, sessoes) for script in SCRIPTS]
+        for resultado in separados:
+            _imprimir("separados", sessoes, resultado)
+        multipagina = _rodar_em_subprocesso(APP, fixture, sessoes)
+        _imprimir("multipágina", sessoes, multipagina)
+
+        medicao = {"sessoes": sessoes, "separados": separados, "multipagina": multipagina}
+        if all("erro" not in r for r in separados + [multipagina]):
+            soma = sum(r["rss_mb"] for r in separados)
+            medicao["rss_separados_mb"] = round(soma, 1)
+            print(f"{'total':<12} {sessoes:>7} {'6 processos separados':<42} {soma:>9.0f}")
+            print(f"{'total':<12} {sessoes:>7} {'1 processo multipágina':<42} {multipagina['rss_mb']:>9.0f} "
+                  f"({multipagina['rss_mb'] / soma:.2f}× dos separados)")
+        medicoes.append(medicao)
+
+    if args.saida:
+        args.saida.parent.mkdir(parents=True, exist_ok=True)
+        args.saida.write_text(
+            json.dumps({"ambiente": _ambiente(), "escala": args.escala, "sintetico": args.sintetico,
+                        "medicoes": medicoes}, ensure_ascii=False, indent=2),
+            encoding="utf-8",
+        )
+        print(f"Resultados em {args.saida}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,55 @@
+"""Benchmark: sessionização do log de acessos (``sessoes_acessos``) em escala.
+
+Gera logs sintéticos (``dados_sinteticos.gerar_log_acessos``) de 1, 10 e 20
+milhões de acessos, embaralha as linhas (como chegam do armazenamento
+particionado por mês) e mede ``montar_sessoes`` e as agregações de tempo na
+plataforma. Também mede o caso em que o log já vem ordenado, em que a
+ordenação é dispensada.
+
+Uso (a partir da raiz do repositório)::
+
+    python -m benchmarks.bench_sessoes [milhões de acessos ...]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from dados_sinteticos import ACESSOS_POR_ALUNO, INICIO_PADRAO, gerar_alunos, gerar_cursos, gerar_log_acessos
+from sessoes_acessos import montar_sessoes, tempo_por_aluno, tempo_por_dia
+
+TAMANHOS_MILHOES = (1, 10, 20)
+
+
+def gerar_log(acessos, semente=42):
+    rng = np.random.default_rng(semente)
+    cursos = gerar_cursos(rng, 4, 12)
+    alunos = gerar_alunos(rng, cursos, max(acessos // ACESSOS_POR_ALUNO, 1), INICIO_PADRAO)
+    log, _ = gerar_log_acessos(rng, alunos, acessos, 60, INICIO_PADRAO)
+    return log[['user_id', 'course_name', 'access_time']], rng
+
+
+def cronometrar(funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    return resultado, time.perf_counter() - inicio
+
+
+def main(argv):
+    tamanhos = [float(t) for t in argv] or TAMANHOS_MILHOES
+    print(f"{'acessos':>11} {'sessões':>10} {'ordenado (s)':>13} {'embaralhado (s)':>16} "
+          f"{'acessos/s':>12} {'por aluno (s)':>14} {'por dia (s)':>12}")
+    for milhoes in tamanhos:
+        log, rng = gerar_log(int(milhoes * 1_000_000))
+        _, t_ordenado = cronometrar(lambda: montar_sessoes(log))
+        log = log.iloc[rng.permutation(len(log))]
+        sessoes, t_embaralhado = cronometrar(lambda: montar_sessoes(log))
+        _, t_aluno = cronometrar(lambda: tempo_por_aluno(sessoes))
+        _, t_dia = cronometrar(lambda: tempo_por_dia(sessoes))
+        print(f"{len(log):>11,} {len(sessoes):>10,} {t_ordenado:>13.2f} {t_embaralhado:>16.2f} "
+              f"{len(log) / t_embaralhado:>12,.0f} {t_aluno:>14.2f} {t_dia:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,165 @@
+"""Índice de busca de alunos por nome, sem diferenciar acentos e maiúsculas.
+
+Os nomes são normalizados (acentos removidos, minúsculas, só letras e
+dígitos) e quebrados em trigramas por palavra. O índice guarda, para cada
+trigrama, o array de linhas que o contêm; uma consulta soma as listas dos
+seus trigramas com ``np.bincount``. São resultados os nomes que contêm a
+consulta normalizada como trecho (busca exata) e os que têm trigramas
+suficientes em comum com ela.
+
+A busca exata não depende da pontuação ("ilv" acha "silva" mesmo sem os
+trigramas de borda): os candidatos são a interseção das listas dos
+trigramas que todo nome com o trecho tem (``trigramas_do_trecho``), e só
+eles são conferidos com ``in``. Consultas de uma palavra com menos de 3
+letras não têm trigrama garantido e percorrem todos os nomes. A ordem é:
+
+1. nome que contém a consulta normalizada como trecho;
+2. fração dos trigramas da consulta presentes no nome (tolera erros de
+   digitação, como "marai" para "maria");
+3. similaridade de Jaccard entre os conjuntos de trigramas.
+
+O índice é montado uma vez por carga dos dados.
+"""
+
+import re
+import unicodedata
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+SIMILARIDADE_MINIMA = 0.5
+
+
+def normalizar_texto(texto):
+    """'  JOSÉ da Conceição ' -> 'jose da conceicao'."""
+    texto = unicodedata.normalize("NFKD", str(texto)).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", " ", texto.lower()).strip()
+
+
+def trigramas(texto_normalizado):
+    """Trigramas de cada palavra, com espaços nas bordas para marcar início e fim."""
+    tris = set()
+    for palavra in texto_normalizado.split():
+        palavra = f"  {palavra} "
+        tris.update(palavra[i:i + 3] for i in range(len(palavra) - 2))
+    return tris
+
+
+def trigramas_do_trecho(texto_normalizado):
+    """Trigramas presentes em todo nome que contém ``texto_normalizado`` como trecho.
+
+    A primeira palavra da consulta pode ser o fim de uma palavra do nome, e a
+    última, o começo: só levam a borda de espaços do lado em que há outra
+    palavra da consulta.
+    """
+    palavras = texto_normalizado.split()
+    tris = set()
+    for i, palavra in enumerate(palavras):
+        palavra = f"{'  ' if i > 0 else ''}{palavra}{' ' if i < len(palavras) - 1 else ''}"
+        tris.update(palavra[j:j + 3] for j in range(len(palavra) - 2))
+    return tris
+
+
+def normalizar_serie(nomes):
+    """``normalizar_texto`` vetorizado para uma Series inteira."""
+    return (
+        nomes.fillna("").astype(str)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore").str.decode("ascii")
+        .str.lower()
+        .str.replace(r"[^a-z0-9]+", " ", regex=True)
+        .str.strip()
+    )
+
+
+class IndiceNomes:
+    def __init__(self, nomes):
+        self.nomes = pd.Series(nomes).reset_index(drop=True)
+        normalizados = normalizar_serie(self.nomes)
+        self.normalizados = normalizados.to_numpy(dtype=object)
+        self._serie_normalizada = normalizados
+
+        # Palavras se repetem muito entre nomes (MARIA, SILVA, DA...): os trigramas
+        # são calculados uma vez por palavra distinta e espalhados para as linhas.
+        palavras = normalizados.str.split().explode().dropna()
+        codigos_palavra, vocabulario_palavras = pd.factorize(palavras)
+        linhas_palavra = palavras.index.to_numpy(dtype=np.int64)
+
+        tris_por_palavra = [sorted(trigramas(p)) for p in vocabulario_palavras]
+        qtd_por_palavra = np.fromiter((len(t) for t in tris_por_palavra), dtype=np.int64,
+                                      count=len(tris_por_palavra))
+        codigos_tri, vocabulario = pd.factorize(
+            np.fromiter(chain.from_iterable(tris_por_palavra), dtype=object, count=int(qtd_por_palavra.sum()))
+        )
+        inicio_palavra = np.concatenate(([0], np.cumsum(qtd_por_palavra)))[:-1]
+
+        # Pares (linha, trigrama) sem repetição
+        qtd = qtd_por_palavra[codigos_palavra]
+        deslocamento = np.arange(qtd.sum()) - np.repeat(np.cumsum(qtd) - qtd, qtd)
+        tri_do_par = codigos_tri[np.repeat(inicio_palavra[codigos_palavra], qtd) + deslocamento]
+        linha_do_par = np.repeat(linhas_palavra, qtd)
+        pares = np.unique(tri_do_par.astype(np.int64) * len(self.nomes) + linha_do_par)
+        tri_do_par, linha_do_par = np.divmod(pares, max(len(self.nomes), 1))
+
+        self.qtd_trigramas = np.bincount(linha_do_par, minlength=len(self.nomes)).astype(np.int32)
+
+        # Listas invertidas: trigrama -> linhas, guardadas em um único array ordenado
+        self._linhas = linha_do_par.astype(np.int32)
+        limites = np.concatenate(([0], np.cumsum(np.bincount(tri_do_par, minlength=len(vocabulario)))))
+        self._vocabulario = {tri: (limites[i], limites[i + 1]) for i, tri in enumerate(vocabulario)}
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def buscar(self, consulta, limite=None, similaridade_minima=SIMILARIDADE_MINIMA):
+        """Posições (linhas) de todos os nomes que casam com ``consulta``, da melhor para a pior.
+
+        Retorna ``(posicoes, pontuacoes)``; a pontuação vai de 0 a 1 (1 = o nome
+        contém a consulta ou todos os trigramas dela). ``limite`` corta o
+        resultado já ordenado; por padrão volta tudo.
+        """
+        consulta_normalizada = normalizar_texto(consulta)
+        if not consulta_normalizada:
+            return np.array([], dtype=np.int32), np.array([])
+
+        # Trecho exato, antes de qualquer corte por pontuação
+        posicoes_exatas = self._com_trecho(consulta_normalizada)
+
+        tris = [t for t in trigramas(consulta_normalizada) if t in self._vocabulario]
+        total = len(trigramas(consulta_normalizada))
+        if tris:
+            listas = [self._linhas[slice(*self._vocabulario[t])] for t in tris]
+            comuns = np.bincount(np.concatenate(listas), minlength=len(self))
+            parecidos = np.flatnonzero(comuns >= np.ceil(similaridade_minima * total))
+        else:
+            comuns = np.zeros(len(self), dtype=np.int64)
+            parecidos = np.array([], dtype=np.int64)
+
+        candidatos = np.union1d(posicoes_exatas, parecidos)
+        comuns = comuns[candidatos]
+        exato = np.isin(candidatos, posicoes_exatas, assume_unique=True)
+        pontuacao = comuns / total
+        jaccard = comuns / (total + self.qtd_trigramas[candidatos] - comuns)
+
+        ordem = np.lexsort((-jaccard, -pontuacao, ~exato))[:limite]
+        return candidatos[ordem], np.where(exato[ordem], 1.0, pontuacao[ordem])
+
+    def _com_trecho(self, consulta_normalizada):
+        """Posições, em ordem, dos nomes que contêm ``consulta_normalizada``."""
+        garantidos = trigramas_do_trecho(consulta_normalizada)
+        if not garantidos:
+            return np.flatnonzero(
+                self._serie_normalizada.str.contains(consulta_normalizada, regex=False).to_numpy(dtype=bool)
+            )
+        if any(t not in self._vocabulario for t in garantidos):
+            return np.array([], dtype=np.int64)
+        listas = sorted((self._linhas[slice(*self._vocabulario[t])] for t in garantidos), key=len)
+        candidatos = listas[0]
+        for lista in listas[1:]:
+            candidatos = np.intersect1d(candidatos, lista, assume_unique=True)
+        confirmados = np.fromiter(
+            (consulta_normalizada in nome for nome in self.normalizados[candidatos]),
+            dtype=bool, count=len(candidatos),
+        )
+        return candidatos[confirmados].astype(np.int64)
@@ -0,0 +1,194 @@
+"""Cache colunar (Parquet) na frente das planilhas Excel.
+
+Cada planilha (.xlsx) é convertida uma única vez em um arquivo Parquet por
+aba, guardado em ``.cache_dados/`` ao lado da planilha. A chave do cache é o
+par (mtime, tamanho) do arquivo, conferido pelo hash SHA-256 do conteúdo:
+se o arquivo foi apenas "tocado" (mtime novo, mesmo conteúdo) o cache é
+reaproveitado; se o conteúdo mudou, as abas são convertidas de novo.
+
+Uso nos dashboards::
+
+    from cache_dados import ler_excel
+    df = ler_excel("Acessos_tratado.xlsx", sheet_name="Sheet1")
+
+``ler_excel`` aceita ``sheet_name`` com a mesma semântica de
+``pd.read_excel`` (nome, índice, lista ou ``None`` para todas as abas). As
+abas com esquema declarado em ``esquemas.ESQUEMAS`` já voltam com os tipos
+compactos (categorias, ids em int32...).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from esquemas import esquema_da_aba, ler_parquet, registrar_memoria
+
+DIRETORIO_CACHE = ".cache_dados"
+
+
+def _hash_arquivo(caminho, tamanho_bloco=1 << 20):
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(tamanho_bloco), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _diretorio_cache(caminho):
+    return caminho.parent / DIRETORIO_CACHE
+
+
+def _caminho_manifesto(caminho):
+    return _diretorio_cache(caminho) / f"{caminho.name}.json"
+
+
+def _ler_manifesto(caminho):
+    try:
+        with open(_caminho_manifesto(caminho), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _gravar_atomico(destino, escrever):
+    """Grava em um arquivo temporário e troca pelo destino de uma só vez."""
+    temporario = destino.with_name(f"{destino.name}.{uuid.uuid4().hex}.tmp")
+    escrever(temporario)
+    os.replace(temporario, destino)
+
+
+def _gravar_manifesto(caminho, manifesto):
+    def escrever(destino):
+        with open(destino, "w", encoding="utf-8") as f:
+            json.dump(manifesto, f, ensure_ascii=False, indent=2)
+
+    _gravar_atomico(_caminho_manifesto(caminho), escrever)
+
+
+def _preparar_para_parquet(df):
+    """Converte colunas object com tipos misturados (ex.: CPF numérico e texto)
+    para texto, já que o Parquet exige um tipo por coluna."""
+    df = df.copy()
+    for coluna in df.columns[df.dtypes == object]:
+        tipo = pd.api.types.infer_dtype(df[coluna], skipna=True)
+        if tipo.startswith("mixed"):
+            df[coluna] = df[coluna].where(df[coluna].isna(), df[coluna].astype(str))
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def _converter(caminho, sha256, stat):
+    """Lê todas as abas da planilha e grava um Parquet por aba."""
+    return _gravar_abas(caminho, pd.read_excel(caminho, sheet_name=None), sha256, stat)
+
+
+def _gravar_abas(caminho, abas, sha256, stat):
+    pasta = _diretorio_cache(caminho) / f"{caminho.name}-{sha256[:16]}"
+    pasta.mkdir(parents=True, exist_ok=True)
+
+    arquivos = {}
+    for i, (nome_aba, df) in enumerate(abas.items()):
+        destino = pasta / f"aba_{i:02d}.parquet"
+        _gravar_atomico(destino, lambda tmp, df=df: _preparar_para_parquet(df).to_parquet(tmp, index=False))
+        arquivos[nome_aba] = destino.name
+
+    manifesto = {
+        "arquivo": caminho.name,
+        "mtime_ns": stat.st_mtime_ns,
+        "tamanho": stat.st_size,
+        "sha256": sha256,
+        "pasta": pasta.name,
+        "abas": arquivos,
+    }
+    _gravar_manifesto(caminho, manifesto)
+
+    # Remove versões antigas desta mesma planilha
+    for antiga in _diretorio_cache(caminho).glob(f"{caminho.name}-*"):
+        if antiga.is_dir() and antiga != pasta:
+            shutil.rmtree(antiga, ignore_errors=True)
+
+    return manifesto
+
+
+def _manifesto_valido(caminho, manifesto):
+    if manifesto is None:
+        return False
+    pasta = _diretorio_cache(caminho) / manifesto["pasta"]
+    return all((pasta / nome).exists() for nome in manifesto["abas"].values())
+
+
+def garantir_cache(caminho):
+    """Garante que o cache Parquet da planilha está atualizado e devolve o manifesto."""
+    caminho = Path(caminho)
+    stat = os.stat(caminho)
+    manifesto = _ler_manifesto(caminho)
+
+    if (
+        _manifesto_valido(caminho, manifesto)
+        and manifesto["mtime_ns"] == stat.st_mtime_ns
+        and manifesto["tamanho"] == stat.st_size
+    ):
+        return manifesto
+
+    sha256 = _hash_arquivo(caminho)
+    if _manifesto_valido(caminho, manifesto) and manifesto["sha256"] == sha256:
+        # Arquivo tocado sem mudança de conteúdo: só atualiza a chave
+        manifesto.update(mtime_ns=stat.st_mtime_ns, tamanho=stat.st_size)
+        _gravar_manifesto(caminho, manifesto)
+        return manifesto
+
+    _diretorio_cache(caminho).mkdir(parents=True, exist_ok=True)
+    return _converter(caminho, sha256, stat)
+
+
+def gravar_cache(caminho, abas):
+    """Grava ``abas`` ({nome: DataFrame}) direto como cache de ``caminho``.
+
+    A planilha em ``caminho`` é criada só com os cabeçalhos. Serve para
+    massas de teste e benchmark maiores que o limite de linhas do Excel
+    (1.048.576): os dashboards leem os dados completos pelo ``ler_excel``.
+    """
+    caminho = Path(caminho)
+    with pd.ExcelWriter(caminho) as escritor:
+        for nome_aba, df in abas.items():
+            df.head(0).to_excel(escritor, sheet_name=nome_aba, index=False)
+    _diretorio_cache(caminho).mkdir(parents=True, exist_ok=True)
+    return _gravar_abas(caminho, abas, _hash_arquivo(caminho), os.stat(caminho))
+
+
+def versao_dados(caminho):
+    """Identificador curto do conteúdo atual da planilha (prefixo do SHA-256)."""
+    return garantir_cache(caminho)["sha256"][:16]
+
+
+def ler_excel(caminho, sheet_name=0, filtros=None):
+    """Equivalente a ``pd.read_excel`` lendo do cache Parquet.
+
+    ``filtros`` (``{coluna: valor ou lista}``) são aplicados na leitura do
+    Parquet (``esquemas.ler_parquet``).
+    """
+    caminho = Path(caminho)
+    manifesto = garantir_cache(caminho)
+    pasta = _diretorio_cache(caminho) / manifesto["pasta"]
+    nomes_abas = list(manifesto["abas"])
+
+    def ler_aba(aba):
+        if isinstance(aba, int):
+            aba = nomes_abas[aba]
+        if aba not in manifesto["abas"]:
+            raise ValueError(f"Worksheet named '{aba}' not found")
+        arquivo = pasta / manifesto["abas"][aba]
+        df = ler_parquet(arquivo, esquema_da_aba(caminho, aba), filtros=filtros)
+        registrar_memoria(f"{caminho.name} [{aba}]", df, [arquivo])
+        return df
+
+    if sheet_name is None:
+        return {aba: ler_aba(aba) for aba in nomes_abas}
+    if isinstance(sheet_name, list):
+        return {aba: ler_aba(aba) for aba in sheet_name}
+    return ler_aba(sheet_name)
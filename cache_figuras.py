@@ -0,0 +1,119 @@
+"""Cache de figuras matplotlib já renderizadas, com LRU limitado por tamanho.
+
+Cada gráfico é identificado por (visão, hash do estado dos filtros, versão
+dos dados). Na primeira vez a figura é desenhada, salva em PNG (ou SVG) e
+fechada na hora com ``plt.close``; nos reruns seguintes com a mesma chave os
+bytes guardados são enviados direto, sem tocar no matplotlib. O cache é
+único por processo (``st.cache_resource``) e descarta as figuras usadas há
+mais tempo quando passa do limite de bytes.
+
+Uso::
+
+    def desenhar():
+        fig, ax = plt.subplots()
+        ...
+        return fig
+
+    exibir_figura("visao_geral", desenhar, filtros=filtros, versao=versao)
+
+O desenho e o ``savefig`` rodam sob uma trava do processo: o estado do
+``pyplot`` e os ``rcParams`` são globais, e as sessões de todas as páginas
+desenham em threads próprias. ``estilo`` (ex.: ``graficos.tema_seaborn``) é
+aplicado só enquanto a figura é desenhada e salva.
+"""
+
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+
+import streamlit as st
+
+LIMITE_MB_PADRAO = float(os.environ.get("LIMITE_CACHE_FIGURAS_MB", 64))
+
+# Mesmos parâmetros que o st.pyplot usa por padrão
+DPI = 200
+
+_trava_matplotlib = threading.Lock()
+
+
+def chave_figura(visao, filtros=None, versao=None):
+    """(visão, hash do estado dos filtros, versão dos dados)."""
+    estado = hashlib.sha1(repr(filtros).encode("utf-8")).hexdigest()
+    return visao, estado, versao
+
+
+class CacheFiguras:
+    def __init__(self, limite_bytes):
+        self.limite_bytes = limite_bytes
+        self._figuras = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def __len__(self):
+        return len(self._figuras)
+
+    @property
+    def bytes_ocupados(self):
+        return self._bytes
+
+    def obter(self, chave):
+        with self._trava:
+            imagem = self._figuras.get(chave)
+            if imagem is None:
+                self.falhas += 1
+                return None
+            self._figuras.move_to_end(chave)
+            self.acertos += 1
+            return imagem
+
+    def guardar(self, chave, imagem):
+        if len(imagem) > self.limite_bytes:
+            return
+        with self._trava:
+            antiga = self._figuras.pop(chave, None)
+            if antiga is not None:
+                self._bytes -= len(antiga)
+            self._figuras[chave] = imagem
+            self._bytes += len(imagem)
+            while self._bytes > self.limite_bytes:
+                _, descartada = self._figuras.popitem(last=False)
+                self._bytes -= len(descartada)
+
+    def renderizar(self, chave, desenhar, formato="png", estilo=None):
+        """Bytes da figura: do cache ou desenhando com ``desenhar()`` dentro de ``estilo()``."""
+        imagem = self.obter(chave)
+        if imagem is not None:
+            return imagem
+
+        import matplotlib.pyplot as plt
+
+        with _trava_matplotlib, (estilo or nullcontext)():
+            # Fecha toda figura aberta aqui, também se ``desenhar`` falhar no meio
+            abertas = set(plt.get_fignums())
+            try:
+                fig = desenhar()
+                buffer = io.BytesIO()
+                fig.savefig(buffer, format=formato, dpi=DPI, bbox_inches="tight")
+            finally:
+                for numero in set(plt.get_fignums()) - abertas:
+                    plt.close(numero)
+        imagem = buffer.getvalue()
+        self.guardar(chave, imagem)
+        return imagem
+
+
+@st.cache_resource
+def cache_figuras():
+    """Cache único do processo, compartilhado por todas as sessões."""
+    return CacheFiguras(int(LIMITE_MB_PADRAO * 1024 * 1024))
+
+
+def exibir_figura(visao, desenhar, filtros=None, versao=None, estilo=None):
+    """Equivalente a ``st.pyplot(desenhar())`` passando pelo cache de figuras."""
+    imagem = cache_figuras().renderizar(chave_figura(visao, filtros, versao), desenhar, estilo=estilo)
+    st.image(imagem, use_container_width=True)
@@ -0,0 +1,153 @@
+"""Regras de certificação e cálculo de carga horária para a turma inteira.
+
+O cálculo é feito de uma vez para todos os alunos: cada envio é classificado
+em um tipo de atividade, e um único groupby (userid × tipo) produz a matriz
+de itens completos, da qual saem horas, status do mínimo por tipo e
+elegibilidade ao certificado.
+
+A classificação roda uma vez por atividade (poucas por curso), não por
+envio: ``tipos_das_atividades`` devolve o tipo de cada ``assignment`` e os
+envios recebem o tipo por ``map``. Cada nome é testado com uma única regex
+compilada a partir de ``TIPO_POR_ATIVIDADE`` e o resultado fica em cache.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+HORAS_TOTAIS = 120
+FREQUENCIA_MINIMA = 90
+
+# --- Mapeamento de Atividades do Documento ---
+MAPEAMENTO_ATIVIDADES = {
+    "Encontros Presenciais": {"horas": 20, "ch_por_item": 10, "minimo": 1},
+    "Webinários": {"horas": 15, "ch_por_item": 3, "minimo": 4},
+    "Atividades dos módulos": {"horas": 20, "ch_por_item": 4, "minimo": 3},
+    "Encontros Síncronos": {"horas": 12, "ch_por_item": 2, "minimo": 5},
+    "Fóruns": {"horas": 12, "ch_por_item": 2, "minimo": 5},
+    "Atividade Final": {"horas": 21, "obrigatoria": True},
+    "Estudos e Leituras": {"horas": 20, "nao_conta_frequencia": True}
+}
+
+# Trecho do nome da atividade -> tipo. A ordem importa: vale a primeira chave encontrada.
+TIPO_POR_ATIVIDADE = {
+    "avaliação": "Atividades dos módulos",
+    "atividade 1": "Atividades dos módulos",
+    "plano de estudos": "Estudos e Leituras",
+    "portfólio": "Atividade Final"
+}
+
+TIPOS = list(MAPEAMENTO_ATIVIDADES)
+NAO_RECONHECIDA = "Não Reconhecida"
+
+# Um lookahead opcional por chave: um único ``match`` diz quais trechos aparecem
+# em qualquer posição do nome, e o primeiro grupo preenchido (na ordem do
+# dicionário) decide o tipo, como no teste chave a chave.
+_PADRAO_TIPO = re.compile(
+    "".join(f"(?=(?:.*?({re.escape(chave)}))?)" for chave in TIPO_POR_ATIVIDADE),
+    re.DOTALL,
+)
+_TIPOS_DO_PADRAO = list(TIPO_POR_ATIVIDADE.values())
+
+REGRAS = pd.DataFrame(
+    {
+        "horas_exigidas": [d["horas"] for d in MAPEAMENTO_ATIVIDADES.values()],
+        "itens_exigidos": [d["horas"] / d.get("ch_por_item", 1) for d in MAPEAMENTO_ATIVIDADES.values()],
+        "minimo_requerido": [d.get("minimo", 0) for d in MAPEAMENTO_ATIVIDADES.values()],
+        "obrigatoria": [d.get("obrigatoria", False) for d in MAPEAMENTO_ATIVIDADES.values()],
+        "nao_conta_frequencia": [d.get("nao_conta_frequencia", False) for d in MAPEAMENTO_ATIVIDADES.values()],
+    },
+    index=pd.Index(TIPOS, name="tipo"),
+)
+
+
+@lru_cache(maxsize=4096)
+def tipo_da_atividade(nome):
+    """Tipo de atividade pelo nome (None quando não reconhecida)."""
+    grupos = _PADRAO_TIPO.match(nome.lower()).groups()
+    return next((tipo for tipo, trecho in zip(_TIPOS_DO_PADRAO, grupos) if trecho is not None), None)
+
+
+def tipos_das_atividades(atividades, coluna_id="id", coluna_nome="name"):
+    """Tipo de cada atividade, indexado pelo id (para ``envios["assignment"].map``)."""
+    atividades = atividades.drop_duplicates(coluna_id)
+    tipos = [tipo_da_atividade(str(nome)) for nome in atividades[coluna_nome]]
+    return pd.Series(tipos, index=atividades[coluna_id].to_numpy(), dtype=object, name="tipo_atividade")
+
+
+def classificar_envios(nomes_atividades):
+    """Tipo de atividade de cada envio (None quando não reconhecida).
+
+    Cada nome distinto é classificado uma vez; os envios recebem o tipo pelos
+    códigos do ``factorize``.
+    """
+    codigos, nomes = pd.factorize(nomes_atividades.astype(str))
+    tipos = np.array([tipo_da_atividade(nome) for nome in nomes] + [None], dtype=object)
+    return pd.Series(tipos[codigos], index=nomes_atividades.index, dtype=object)
+
+
+def calcular_certificacao_turma(envios):
+    """Calcula o status de certificação de todos os alunos de uma vez.
+
+    ``envios`` são os envios do curso já unidos a usuários e atividades
+    (colunas ``userid``, ``firstname``, ``lastname`` e ``name_atividade``).
+    Se houver uma coluna ``tipo_atividade`` ela é usada no lugar da
+    classificação pelos nomes.
+
+    Retorna ``(resumo, detalhes)``:
+
+    - ``resumo``: uma linha por ``userid`` com ``aluno``, ``horas_frequencia``,
+      ``atividade_final_ok`` e ``apto_certificado``;
+    - ``detalhes``: uma linha por (``userid``, ``tipo``) com itens e horas
+      completados/exigidos e se o mínimo do tipo foi cumprido.
+    """
+    if "tipo_atividade" in envios.columns:
+        tipo = envios["tipo_atividade"]
+    else:
+        tipo = classificar_envios(envios["name_atividade"])
+
+    nomes = envios.groupby("userid", sort=True)[["firstname", "lastname"]].first()
+    nomes = nomes.dropna()
+    userids = nomes.index
+
+    itens = (
+        envios.assign(tipo=tipo)
+        .groupby(["userid", "tipo"])
+        .size()
+        .unstack(fill_value=0)
+        .reindex(index=userids, columns=TIPOS, fill_value=0)
+    )
+
+    matriz_itens = itens.to_numpy()
+    conta_frequencia = ~REGRAS["nao_conta_frequencia"].to_numpy()
+    proporcao = np.minimum(matriz_itens / REGRAS["itens_exigidos"].to_numpy(), 1)
+    matriz_horas = proporcao * REGRAS["horas_exigidas"].to_numpy() * conta_frequencia
+
+    horas_frequencia = matriz_horas.sum(axis=1)
+    atividade_final_ok = matriz_itens[:, TIPOS.index("Atividade Final")] > 0
+
+    resumo = pd.DataFrame(
+        {
+            "aluno": nomes["firstname"] + " " + nomes["lastname"],
+            "horas_frequencia": horas_frequencia,
+            "atividade_final_ok": atividade_final_ok,
+            "apto_certificado": (horas_frequencia >= FREQUENCIA_MINIMA) & atividade_final_ok,
+        },
+        index=userids,
+    )
+
+    indice = pd.MultiIndex.from_product([userids, TIPOS], names=["userid", "tipo"])
+    n_alunos = len(userids)
+    detalhes = pd.DataFrame(
+        {
+            "itens_completos": matriz_itens.ravel(),
+            "horas_completadas": matriz_horas.ravel(),
+            **{coluna: np.tile(REGRAS[coluna].to_numpy(), n_alunos) for coluna in REGRAS.columns},
+        },
+        index=indice,
+    )
+    detalhes["minimo_ok"] = detalhes["itens_completos"] >= detalhes["minimo_requerido"]
+
+    return resumo, detalhes
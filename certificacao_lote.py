@@ -0,0 +1,159 @@
+"""Relatório de certificação de todas as turmas, em lote e em paralelo.
+
+O dashboard ``3-acompanhamento_atividades_dashboard.py`` mostra uma turma
+por vez. Aqui as regras de ``certificacao`` rodam para todas as turmas [NF]
+dos estados pedidos, uma turma por tarefa em um ``ProcessPoolExecutor``. O
+resultado é um único relatório (Parquet ou XLSX, pela extensão do destino)
+com uma linha por aluno e turma: horas de frequência, atividade final e
+aptidão ao certificado.
+
+As planilhas são lidas uma vez no processo principal (pelo cache Parquet de
+``cache_dados`` ou, com ``MOODLE_DB_URL``, do banco por ``fonte_moodle``).
+Atividades e envios vêm já filtrados pelos cursos dos estados pedidos
+(``filtros`` de ``ler_tabela``); os envios unidos a usuários e atividades
+são repartidos por turma e cada processo recebe só a sua parte.
+
+Uso (a partir da raiz do repositório)::
+
+    python certificacao_lote.py relatorio_certificacao.parquet [--arquivo dados_moodle.xlsx]
+                                [--estados CE MA PI PE] [--processos N]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from fonte_moodle import ler_tabela
+from certificacao import calcular_certificacao_turma, tipos_das_atividades
+from dimensao_cursos import ESTADOS, montar_dimensao_cursos
+from exportacao import exportar, formato_do_arquivo
+
+COLUNAS_RELATORIO = [
+    "estado", "turma", "curso", "courseid", "userid", "aluno",
+    "horas_frequencia", "atividade_final_ok", "apto_certificado",
+]
+
+
+def cursos_dos_estados(cursos, estados=tuple(ESTADOS)):
+    """Cursos dos ``estados``, com as colunas ``estado`` e ``turma``."""
+    dimensao = montar_dimensao_cursos(cursos["fullname"])
+    cursos = cursos.assign(
+        estado=cursos["fullname"].map(dimensao["estado_sigla"]),
+        turma=cursos["fullname"].map(dimensao["turma"]),
+    )
+    return cursos[cursos["estado"].isin(estados)]
+
+
+def ler_dados(arquivo, estados=tuple(ESTADOS)):
+    """Abas usadas por ``preparar_turmas``, com atividades e envios só dos cursos dos ``estados``."""
+    cursos = cursos_dos_estados(ler_tabela(arquivo, sheet_name="cursos"), estados)
+    filtros = {"course": cursos["id"].tolist()}
+    return {
+        "cursos": cursos,
+        "usuarios": ler_tabela(arquivo, sheet_name="usuarios"),
+        "atividades_assign": ler_tabela(arquivo, sheet_name="atividades_assign", filtros=filtros),
+        "envios_assign": ler_tabela(arquivo, sheet_name="envios_assign", filtros=filtros),
+    }
+
+
+def preparar_turmas(dados, estados=tuple(ESTADOS)):
+    """Uma tarefa por turma: ``(courseid, curso, estado, turma, envios)``.
+
+    ``envios`` são os envios da turma unidos a usuários e atividades, com o
+    tipo de cada atividade (como no dashboard).
+    """
+    cursos = cursos_dos_estados(dados["cursos"], estados)
+
+    atividades = dados["atividades_assign"]
+    envios = dados["envios_assign"]
+    envios = envios[envios["course"].isin(cursos["id"])]
+    envios = envios.merge(dados["usuarios"], left_on="userid", right_on="id")
+    envios = envios.merge(
+        atividades[["id", "course", "name"]].rename(columns={"id": "id_atividade", "course": "curso_atividade"}),
+        left_on="assignment", right_on="id_atividade",
+    )
+    # Como no dashboard: só atividades do próprio curso
+    envios = envios[envios["curso_atividade"] == envios["course"]]
+    envios = envios.rename(columns={"name": "name_atividade"})
+    envios["tipo_atividade"] = envios["assignment"].map(tipos_das_atividades(atividades))
+
+    colunas = ["userid", "firstname", "lastname", "name_atividade", "tipo_atividade"]
+    por_curso = dict(tuple(envios.groupby("course", sort=False)[colunas]))
+    return [
+        (curso.id, curso.fullname, curso.estado, curso.turma, por_curso[curso.id])
+        for curso in cursos.itertuples()
+        if curso.id in por_curso
+    ]
+
+
+def certificar_turma(tarefa):
+    """Resumo de certificação de uma turma com as colunas do relatório."""
+    courseid, curso, estado, turma, envios = tarefa
+    resumo, _ = calcular_certificacao_turma(envios)
+    resumo = resumo.reset_index()
+    resumo.insert(0, "courseid", courseid)
+    resumo.insert(0, "curso", curso)
+    resumo.insert(0, "turma", turma)
+    resumo.insert(0, "estado", estado)
+    return resumo[COLUNAS_RELATORIO]
+
+
+def certificar_todas(tarefas, processos=None):
+    """Concatena os resumos de todas as turmas; ``processos=1`` roda sem pool."""
+    if processos == 1:
+        resumos = [certificar_turma(tarefa) for tarefa in tarefas]
+    else:
+        processos = processos or os.cpu_count()
+        # Algumas turmas por envio ao processo: menos ida e volta de pickle
+        lote = max(1, len(tarefas) // (processos * 4))
+        with ProcessPoolExecutor(max_workers=processos) as executor:
+            resumos = list(executor.map(certificar_turma, tarefas, chunksize=lote))
+    if not resumos:
+        return pd.DataFrame(columns=COLUNAS_RELATORIO)
+    relatorio = pd.concat(resumos, ignore_index=True)
+    for coluna in ("estado", "turma", "curso"):
+        relatorio[coluna] = relatorio[coluna].astype("category")
+    return relatorio
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("destino", type=Path, help="relatório de saída (.parquet, .xlsx ou .csv)")
+    parser.add_argument("--arquivo", default="dados_moodle.xlsx", help="planilha do Moodle")
+    parser.add_argument("--estados", nargs="+", default=list(ESTADOS), help="siglas dos estados")
+    parser.add_argument("--processos", type=int, default=os.cpu_count(), help="processos do pool (1 = sem pool)")
+    args = parser.parse_args(argv)
+
+    inicio = time.perf_counter()
+    estados = [estado.upper() for estado in args.estados]
+    dados = ler_dados(args.arquivo, estados)
+    tarefas = preparar_turmas(dados, estados)
+    t_preparo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    relatorio = certificar_todas(tarefas, args.processos)
+    t_calculo = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    exportar(relatorio, args.destino, formato_do_arquivo(args.destino))
+    t_escrita = time.perf_counter() - inicio
+
+    alunos = len(relatorio)
+    print(
+        f"{len(tarefas)} turmas, {alunos} alunos, {int(relatorio['apto_certificado'].sum())} aptos "
+        f"-> {args.destino}"
+    )
+    print(
+        f"leitura e preparo: {t_preparo:.2f}s  cálculo ({args.processos} processos): {t_calculo:.2f}s  "
+        f"escrita: {t_escrita:.2f}s  ({alunos / max(t_calculo, 1e-9):,.0f} alunos/s no cálculo, "
+        f"{alunos / (t_preparo + t_calculo + t_escrita):,.0f} alunos/s no total)"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
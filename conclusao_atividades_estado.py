@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from atualizacao_dados import exibir_status_dados
+from conjuntos_dados import obter_conjunto
+from esquemas import exibir_relatorio_memoria
+from graficos import plotly_express
 
 st.set_page_config(page_title="Dashboard de Conclusão", layout="wide")
 st.title("📊 Dashboard de Conclusão de Atividades")
@@ -8,13 +12,13 @@ st.title("📊 Dashboard de Conclusão de Atividades")
 # ==============================
 # Carregar dados
 # ==============================
-@st.cache_data
-def load_data(file_name):
-    df = pd.read_excel(file_name)
-    df.columns = df.columns.str.strip().str.lower()
-    return df
-
-df = load_data("estado_de_conclusao_tratado.xlsx")
+# Planilha e bitmaps dos filtros (turma, tipo de atividade, estado) montados em
+# segundo plano pelo atualizador do processo (``conjuntos_dados``)
+dados = obter_conjunto('conclusao_atividades').valor
+df = dados['df']
+indice = dados['indice']
+exibir_relatorio_memoria()
+exibir_status_dados(['conclusao_atividades'])
 
 # ==============================
 # Filtros na barra lateral
@@ -36,15 +40,12 @@ estados = st.sidebar.multiselect(
     default=df['estado'].unique()
 )
 
-df_filtrado = df[
-    df['turma'].isin(turmas) &
-    df['tipo_atividade'].isin(atividades) &
-    df['estado'].isin(estados)
-]
+df_filtrado = df[indice.mascara(turma=turmas, tipo_atividade=atividades, estado=estados)]
 
 # ==============================
 # Criar abas
 # ==============================
+px = plotly_express()
 tab1, tab2, tab3 = st.tabs([
     "Conclusão Geral",
     "Conclusão por Turma",
@@ -58,7 +59,7 @@ with tab1:
     st.subheader("📌 Conclusão Geral por Tipo de Atividade")
 
     conclusao_geral = (
-        df_filtrado.groupby("tipo_atividade")
+        df_filtrado.groupby("tipo_atividade", observed=True)
         .agg(
             total_atividades=('estado_conclusao','count'),
             atividades_concluidas=('estado_conclusao','sum')
@@ -91,7 +92,7 @@ with tab2:
     st.subheader("📌 Conclusão por Turma e Tipo de Atividade")
 
     pivot_turma = (
-        df_filtrado.groupby(["turma","tipo_atividade"])
+        df_filtrado.groupby(["turma","tipo_atividade"], observed=True)
         .agg(
             total_atividades=('estado_conclusao','count'),
             atividades_concluidas=('estado_conclusao','sum')
@@ -126,7 +127,7 @@ with tab3:
     st.subheader("📌 Comparação de Conclusão por Estado")
 
     pivot_estado = (
-        df_filtrado.groupby(["estado","tipo_atividade"])
+        df_filtrado.groupby(["estado","tipo_atividade"], observed=True)
         .agg(
             total_atividades=('estado_conclusao','count'),
             atividades_concluidas=('estado_conclusao','sum')
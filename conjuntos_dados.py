@@ -0,0 +1,162 @@
+"""Conjuntos de dados dos dashboards, construídos em segundo plano pelo ``atualizacao_dados``.
+
+Cada entrada de ``CONJUNTOS`` diz como saber a versão da fonte e como
+montar o conjunto pronto para a página: leitura, colunas derivadas, índices
+dos filtros e agregados. As páginas pegam a publicação atual com
+``obter_conjunto(nome)``; a primeira chamada registra o conjunto no
+atualizador do processo, e daí em diante ele é remontado fora dos reruns
+sempre que a fonte muda.
+
+O atualizador é um ``st.cache_resource``: no app multipágina (``app.py``)
+os conjuntos são montados uma vez por servidor e compartilhados por todas
+as páginas e sessões; conjuntos usados por mais de uma página (o log de
+acessos das páginas 9 e 10) existem uma vez só. Os valores publicados não
+devem ser alterados no lugar.
+"""
+
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from agregados_acessos import montar_agregados
+from atualizacao_dados import atualizador_dados
+from busca_nomes import IndiceNomes
+from cache_dados import ler_excel, versao_dados
+from consultas_acessos import BACKEND_PADRAO, criar_consultas, normalizar_acessos
+from dimensao_cursos import juntar_dimensao
+from esquemas import concatenar_categorias
+from filtros_bitmap import IndiceBitmap
+from fonte_moodle import ler_tabela, sincronizar_replicas, versao_tabelas
+from ingestao_acessos import COLUNAS, ler_acessos, versao_store
+
+DIAS_ATIVO = 30
+TTL_STATUS = 3600  # segundos
+ARQUIVO_CONCLUSAO = "estado_de_conclusao_tratado.xlsx"
+ARQUIVO_ACESSOS_TRATADO = "Acessos_tratado.xlsx"
+ARQUIVO_MOODLE = "dados_moodle.xlsx"
+ARQUIVO_NF = "dados_nf.xlsx"
+ABAS_NF = ["Cursos_NF", "Matriculas", "Usuarios", "Perfil", "Conclusoes_Modulos", "Funcoes"]
+
+
+# ---------- 9-acesso-alunos-offline.py ----------
+
+def montar_acessos_offline(versao):
+    """Log de acessos com data, hora, aluno e estado, e o último acesso de cada usuário."""
+    df = ler_acessos()
+    df['access_time'] = pd.to_datetime(df['access_time'], errors='coerce')
+    df['aluno'] = concatenar_categorias(df['firstname'], df['lastname'])
+    df['data'] = df['access_time'].dt.date
+    df['hora'] = df['access_time'].dt.hour
+    # Estado extraído uma vez por curso e juntado aos acessos por código categórico
+    df['estado'] = juntar_dimensao(df['course_name'], preencher='Outro')['estado']
+    return {
+        'versao': versao,
+        'df': df,
+        'ultimo_acesso': df.groupby('user_id', sort=False)['access_time'].max(),
+    }
+
+
+def janela_status():
+    """Muda a cada ``TTL_STATUS``: o status Ativo/Inativo depende da hora atual."""
+    return str(int(time.time() // TTL_STATUS))
+
+
+def montar_status_offline(versao, acessos):
+    """Status de cada usuário e de cada acesso, com os bitmaps e agregados que dependem dele."""
+    calculado_em = datetime.now()
+    ultimo_acesso = acessos['ultimo_acesso']
+    dias = (calculado_em - ultimo_acesso).dt.days
+    status = pd.Categorical(
+        np.where(dias.to_numpy() <= DIAS_ATIVO, 'Ativo', 'Inativo'), categories=['Ativo', 'Inativo']
+    )
+    status_usuarios = pd.DataFrame({'dias_desde_ultimo_acesso': dias, 'status': status}, index=ultimo_acesso.index)
+
+    log = acessos['df']
+    # -1 para user_id fora de status_usuarios (nulo): a linha fica sem status
+    posicoes = status_usuarios.index.get_indexer(log['user_id'])
+    # Cópia rasa: as colunas do log são as mesmas da publicação anterior, que continua intacta
+    df = log.copy(deep=False)
+    df['dias_desde_ultimo_acesso'] = status_usuarios['dias_desde_ultimo_acesso'].array.take(posicoes, allow_fill=True)
+    df['status'] = status_usuarios['status'].array.take(posicoes, allow_fill=True)
+    return {
+        'versao': acessos['versao'],
+        'df': df,
+        'status_usuarios': status_usuarios,
+        'calculado_em': calculado_em,
+        'indice': IndiceBitmap(df, ['course_name', 'status', 'estado']),
+        'agregados': montar_agregados(df),
+    }
+
+
+# ---------- 10-frequencia-aluno.py ----------
+
+def montar_presenca(versao, acessos):
+    """Log de acessos da página 9 com o dia do acesso e o nome do aluno."""
+    log = acessos['df']
+    faltantes = [c for c in COLUNAS if c not in log.columns]
+    if faltantes:
+        raise ValueError(f"Colunas faltantes: {', '.join(faltantes)}")
+    # Cópia rasa: as colunas do log continuam sendo as da página 9
+    df = log.copy(deep=False)
+    df['data_acesso'] = df['access_time'].dt.normalize()
+    df['nome_aluno'] = df['aluno']
+    return df
+
+
+# ---------- conclusao_atividades_estado.py ----------
+
+def montar_conclusao(versao):
+    """Planilha de conclusão com colunas padronizadas e bitmaps dos filtros."""
+    df = ler_excel(ARQUIVO_CONCLUSAO)
+    df.columns = df.columns.str.strip().str.lower()
+    return {'df': df, 'indice': IndiceBitmap(df, ['turma', 'tipo_atividade', 'estado'])}
+
+
+# ---------- streamlit_atualizado.py ----------
+
+def montar_acessos_tratado(versao):
+    """Acessos por aluno, backend de consultas e índice de busca por nome."""
+    df = normalizar_acessos(ler_excel(ARQUIVO_ACESSOS_TRATADO, sheet_name='Sheet1'))
+    return {'df': df, 'consultas': criar_consultas(df, BACKEND_PADRAO), 'indice_nomes': IndiceNomes(df['nome'])}
+
+
+# ---------- 3-acompanhamento_atividades_dashboard.py e dashboard_cursistas.py ----------
+
+def versao_moodle(arquivo):
+    """Versão das abas de ``arquivo``, sincronizando antes as réplicas vencidas do banco."""
+    # Roda na thread do atualizador: a sincronização nunca entra no rerun
+    sincronizar_replicas(arquivo)
+    return versao_tabelas(arquivo)
+
+
+def montar_tabelas(arquivo, abas=None):
+    """Construção de ``{aba: DataFrame}`` com as abas de ``arquivo`` (todas, com ``abas=None``)."""
+    return lambda versao: ler_tabela(arquivo, sheet_name=abas)
+
+
+# nome -> (versão da fonte, construção, conjunto base); sem versão própria, vale a da base
+CONJUNTOS = {
+    'acessos_offline': (versao_store, montar_acessos_offline, None),
+    'status_acessos_offline': (janela_status, montar_status_offline, 'acessos_offline'),
+    'presenca': (None, montar_presenca, 'acessos_offline'),
+    'conclusao_atividades': (lambda: versao_dados(ARQUIVO_CONCLUSAO), montar_conclusao, None),
+    'acessos_tratado': (lambda: versao_dados(ARQUIVO_ACESSOS_TRATADO), montar_acessos_tratado, None),
+    'tabelas_moodle': (lambda: versao_moodle(ARQUIVO_MOODLE), montar_tabelas(ARQUIVO_MOODLE), None),
+    'tabelas_nf': (lambda: versao_moodle(ARQUIVO_NF), montar_tabelas(ARQUIVO_NF, ABAS_NF), None),
+}
+
+
+def _registrar(atualizador, nome):
+    versao, construir, base = CONJUNTOS[nome]
+    if base is not None:
+        _registrar(atualizador, base)
+    atualizador.registrar(nome, versao, construir, base)
+
+
+def obter_conjunto(nome):
+    """Publicação atual do conjunto ``nome`` (só a primeira carga do processo espera)."""
+    atualizador = atualizador_dados()
+    _registrar(atualizador, nome)
+    return atualizador.obter(nome)
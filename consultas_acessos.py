@@ -0,0 +1,201 @@
+"""Consultas do dashboard de acessos (``streamlit_atualizado.py``).
+
+Os filtros da barra lateral e as agregações de cada visão passam por um
+objeto de consultas com a mesma interface em dois backends:
+
+- ``pandas``: máscaras de bitmaps pré-calculados (``filtros_bitmap``) e
+  groupby sobre o DataFrame em memória;
+- ``duckdb``: SQL em um banco DuckDB em processo, com os filtros no
+  ``WHERE`` (empurrados para a varredura da tabela ou do Parquet).
+
+Na carga, os dois backends materializam um cubo de contagens no grão
+(estado, cidade, id_coorte, acesso): alguns milhares de linhas, em vez de uma
+por aluno. Métricas e contagens das visões são somas sobre o cubo filtrado;
+só a tabela de dados filtrados e as datas de último acesso leem as linhas
+originais.
+
+O backend é escolhido pela variável de ambiente ``BACKEND_CONSULTAS``
+(``pandas`` por padrão).
+"""
+
+import os
+from dataclasses import dataclass, fields, replace
+
+import pandas as pd
+
+from esquemas import transformar_categorias
+from filtros_bitmap import IndiceBitmap
+
+BACKENDS = ("pandas", "duckdb")
+BACKEND_PADRAO = os.environ.get("BACKEND_CONSULTAS", "pandas").strip().lower()
+
+COLUNAS_ACESSOS = ['nome', 'cidade', 'id_coorte', 'acesso', 'estado', 'ultimo_acesso']
+DIMENSOES_CUBO = ['estado', 'cidade', 'id_coorte', 'acesso']
+
+
+def montar_cubo(df):
+    """Quantidade de alunos por (estado, cidade, id_coorte, acesso)."""
+    return df.groupby(DIMENSOES_CUBO, dropna=False, observed=True).size().reset_index(name='n')
+
+
+def normalizar_acessos(df):
+    """Padroniza nomes de colunas e valores da planilha Acessos_tratado."""
+    df = df.copy()
+    df.columns = COLUNAS_ACESSOS
+    # Uma vez por categoria, não por linha; as colunas continuam categóricas
+    df['estado'] = transformar_categorias(df['estado'], lambda s: s.str.upper().str.strip())
+    df['cidade'] = transformar_categorias(df['cidade'], lambda s: s.str.strip())
+    df['acesso'] = transformar_categorias(df['acesso'], lambda s: s.str.strip().str.lower())
+    return df
+
+
+@dataclass(frozen=True)
+class Filtros:
+    """Seleção por coluna. ``None`` = sem filtro; tupla vazia = nada passa."""
+
+    estado: tuple | None = None
+    cidade: tuple | None = None
+    acesso: tuple | None = None
+    id_coorte: tuple | None = None
+
+    @classmethod
+    def da_barra_lateral(cls, estados, cidades, acessos):
+        """Multiselects vazios significam "todos"."""
+        return cls(
+            estado=tuple(estados) or None,
+            cidade=tuple(cidades) or None,
+            acesso=tuple(acessos) or None,
+        )
+
+    def restringir(self, **selecoes):
+        """Novo filtro com a interseção entre a seleção atual e ``selecoes``."""
+        novos = {}
+        for coluna, valores in selecoes.items():
+            atual = getattr(self, coluna)
+            novos[coluna] = tuple(v for v in valores if atual is None or v in atual)
+        return replace(self, **novos)
+
+    def itens(self):
+        for campo in fields(self):
+            valores = getattr(self, campo.name)
+            if valores is not None:
+                yield campo.name, valores
+
+
+def _rotulos_simples(contagem):
+    """Índice sem categorias: gráficos (seaborn) desenhariam também as categorias sem contagem."""
+    if isinstance(contagem.index, pd.MultiIndex):
+        contagem.index = contagem.index.set_levels(
+            [nivel.astype(object) for nivel in contagem.index.levels]
+        )
+    else:
+        contagem.index = contagem.index.astype(object)
+    return contagem
+
+
+class ConsultasPandas:
+    nome = "pandas"
+
+    def __init__(self, df):
+        self.df = df
+        self.cubo = montar_cubo(df)
+        # Um bitmap por valor de cada dimensão, nas linhas originais e no cubo
+        self.indice = IndiceBitmap(df, DIMENSOES_CUBO)
+        self.indice_cubo = IndiceBitmap(self.cubo, DIMENSOES_CUBO)
+
+    @staticmethod
+    def _mascara(indice, filtros):
+        return indice.mascara(**dict(filtros.itens()))
+
+    def filtrar(self, filtros, colunas=None):
+        filtrado = self.df[self._mascara(self.indice, filtros)]
+        return filtrado if colunas is None else filtrado[colunas]
+
+    def metricas(self, filtros):
+        """(total de registros, estados distintos, cidades distintas)."""
+        cubo = self.cubo[self._mascara(self.indice_cubo, filtros)]
+        return int(cubo['n'].sum()), cubo['estado'].nunique(), cubo['cidade'].nunique()
+
+    def contagem(self, filtros, por):
+        """Quantidade de alunos por combinação das colunas ``por`` (ordenada)."""
+        por = list(por)
+        cubo = self.cubo[self._mascara(self.indice_cubo, filtros)]
+        return _rotulos_simples(cubo.groupby(por, observed=True)['n'].sum().rename(None))
+
+
+class ConsultasDuckDB:
+    nome = "duckdb"
+
+    def __init__(self, df=None, parquet=None):
+        import duckdb
+
+        self.conexao = duckdb.connect(database=":memory:")
+        if parquet is not None:
+            # Consulta direta ao Parquet: os filtros do WHERE viram predicados da varredura
+            self.conexao.execute(
+                "CREATE VIEW acessos AS SELECT * FROM read_parquet(?)", [str(parquet)]
+            )
+        else:
+            self.conexao.register("df_acessos", df)
+            self.conexao.execute("CREATE TABLE acessos AS SELECT * FROM df_acessos")
+            self.conexao.unregister("df_acessos")
+
+        dimensoes = ", ".join(f'"{c}"' for c in DIMENSOES_CUBO)
+        self.conexao.execute(
+            f"CREATE TABLE cubo AS SELECT {dimensoes}, count(*) AS n FROM acessos GROUP BY {dimensoes}"
+        )
+
+    def _executar(self, sql, parametros):
+        # Um cursor por consulta: a conexão é compartilhada entre sessões/threads
+        with self.conexao.cursor() as cursor:
+            return cursor.execute(sql, parametros).df()
+
+    @staticmethod
+    def _where(filtros):
+        condicoes, parametros = [], []
+        for coluna, valores in filtros.itens():
+            if not valores:
+                condicoes.append("FALSE")
+                continue
+            condicoes.append(f'"{coluna}" IN ({", ".join("?" * len(valores))})')
+            parametros.extend(valores)
+        where = f"WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return where, parametros
+
+    def filtrar(self, filtros, colunas=None):
+        selecao = ", ".join(f'"{c}"' for c in colunas) if colunas else "*"
+        where, parametros = self._where(filtros)
+        return self._executar(f"SELECT {selecao} FROM acessos {where}", parametros)
+
+    def metricas(self, filtros):
+        where, parametros = self._where(filtros)
+        resultado = self._executar(
+            "SELECT coalesce(sum(n), 0) AS total, count(DISTINCT estado) AS estados, "
+            f"count(DISTINCT cidade) AS cidades FROM cubo {where}",
+            parametros,
+        )
+        total, estados, cidades = resultado.iloc[0]
+        return int(total), int(estados), int(cidades)
+
+    def contagem(self, filtros, por):
+        por = list(por)
+        colunas = ", ".join(f'"{c}"' for c in por)
+        where, parametros = self._where(filtros)
+        nao_nulos = " AND ".join(f'"{c}" IS NOT NULL' for c in por)
+        where = f"{where} AND {nao_nulos}" if where else f"WHERE {nao_nulos}"
+        resultado = self._executar(
+            f"SELECT {colunas}, sum(n)::BIGINT AS n FROM cubo {where} "
+            f"GROUP BY {colunas} ORDER BY {colunas}",
+            parametros,
+        )
+        return _rotulos_simples(resultado.set_index(por)["n"].rename(None))
+
+
+def criar_consultas(df, backend=None):
+    """Objeto de consultas para ``df`` no backend escolhido."""
+    backend = backend or BACKEND_PADRAO
+    if backend == "duckdb":
+        return ConsultasDuckDB(df)
+    if backend == "pandas":
+        return ConsultasPandas(df)
+    raise ValueError(f"Backend de consultas desconhecido: {backend!r} (use um de {BACKENDS})")
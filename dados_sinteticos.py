@@ -0,0 +1,485 @@
+"""Gerador de dados sintéticos no formato do Moodle, em qualquer escala.
+
+Escreve todas as entradas que os dashboards leem, com os mesmos nomes de
+arquivo, abas e colunas das planilhas reais:
+
+- ``dados_moodle.xlsx``: cursos, usuarios, atividades_assign, envios_assign, modulos;
+- ``dados_nf.xlsx``: Cursos_NF, Matriculas, Usuarios, Perfil, Conclusoes_Modulos, Funcoes;
+- ``Acessos_tratado.xlsx`` e ``estado_de_conclusao_tratado.xlsx``;
+- o log de acessos (``dados_acessos.parquet``), já ingerido no armazenamento
+  de ``ingestao_acessos`` lido pelos scripts 9 e 10.
+
+Os dados são determinísticos a partir da semente. As distribuições imitam
+as reais:
+- o tamanho das turmas é desigual;
+- cerca de um terço dos alunos nunca acessa;
+- a atividade por aluno segue uma lognormal (poucos alunos concentram os acessos);
+- os acessos caem ao longo do curso e se concentram em horário comercial e à noite;
+- os nomes têm acentos e caixa misturada, como no Moodle.
+Tudo é gerado com numpy vetorizado, e o log usa códigos categóricos em vez
+de strings por linha.
+
+Planilhas com alguma aba acima do limite de linhas do Excel (ou todas, com
+``--somente-cache``) vão direto para o cache Parquet
+(``cache_dados.gravar_cache``); escrever .xlsx grandes é a etapa mais lenta.
+
+Uso (a partir da raiz do repositório)::
+
+    python dados_sinteticos.py DESTINO [--estados 4] [--coortes 12] [--alunos 3400]
+                                       [--dias 60] [--acessos 77000] [--semente 42]
+                                       [--somente-cache] [--sem-ingestao]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from busca_nomes import normalizar_serie
+from cache_dados import gravar_cache
+from dimensao_cursos import ESTADOS
+from ingestao_acessos import DIRETORIO_STORE, ingerir
+
+LIMITE_LINHAS_EXCEL = 1_048_575
+INICIO_PADRAO = "2025-03-31"
+ACESSOS_POR_ALUNO = 22
+ID_CURSO_INICIAL = 47
+ID_USUARIO_INICIAL = 5000
+
+UFS = list(ESTADOS.items()) + [
+    ('BA', 'Bahia'), ('RN', 'Rio Grande do Norte'), ('PB', 'Paraíba'), ('AL', 'Alagoas'),
+    ('SE', 'Sergipe'), ('PA', 'Pará'), ('TO', 'Tocantins'), ('AM', 'Amazonas'),
+]
+
+NOME_CURSO = "Formação Continuada para Equipes Técnicas das Secretarias Estaduais e Municipais de Educação"
+
+PRENOMES = [
+    'Maria', 'José', 'Antônia', 'João', 'Francisca', 'Antônio', 'Ana', 'Francisco', 'Raimunda',
+    'Luís', 'Márcia', 'Sebastião', 'Luzia', 'Fábio', 'Cícera', 'Cláudio', 'Inácia', 'Vânia',
+    'Ângela', 'Júlio', 'Célia', 'Sônia', 'Lúcia', 'Mônica', 'Patrícia', 'Márcio', 'Edilene',
+    'Rosângela', 'Conceição', 'Géssica', 'Tânia', 'Luciene', 'Joaquim', 'Adriana', 'Sandra',
+    'Rosalva', 'Tainá', 'Janaína', 'Vitória', 'Iracema',
+]
+SOBRENOMES = [
+    'Silva', 'Santos', 'Sousa', 'Oliveira', 'Pereira', 'Lima', 'Carvalho', 'Ferreira', 'Rodrigues',
+    'Almeida', 'Costa', 'Gomes', 'Ribeiro', 'Araújo', 'Conceição', 'Nascimento', 'Gonçalves',
+    'Brito', 'Magalhães', 'Feitosa', 'Leão', 'Bezerra', 'Nogueira', 'Damasceno', 'Fontenele',
+    'Conrado', 'Galvão', 'Simões', 'Guimarães', 'Assunção', 'Furtado', 'Romão', 'Nepomuceno',
+]
+CONECTIVOS = ['da', 'de', 'dos', 'do']
+DOMINIOS = ['gmail.com', 'hotmail.com', 'yahoo.com.br', 'outlook.com', 'educacao.gov.br']
+
+PREFIXOS_CIDADE = ['', 'SAO JOSE DO', 'SANTA', 'NOVA', 'BOM JESUS DO', 'SANTO ANTONIO DO', 'VILA', 'BARRA DO']
+BASES_CIDADE = [
+    'RIACHO', 'CAMPO GRANDE', 'ALTO', 'MORRO', 'LAGOA', 'VARZEA', 'SERRA', 'CRATEUS', 'ICO',
+    'PARNAIBA', 'CAXIAS', 'BACABAL', 'ARARIPINA', 'PICOS', 'TIANGUA', 'SOBRAL', 'ORIENTE', 'PAU',
+]
+
+# (tipo, nome) das atividades acompanhadas em estado_de_conclusao_tratado
+ATIVIDADES_CONCLUSAO = [
+    ('resource', '[Doc] Edite o seu perfil'),
+    ('resource', '[Doc] Passo a passo para gerir recebimento de e-mails no Moodle'),
+    ('resource', 'Cronograma'),
+    ('resource', '[Material didático] Módulo 1 - O Programa Escola em Tempo Integral (ETI) e seus ordenamentos jurídicos'),
+    ('forum', 'Fórum de apresentação e integração'),
+    ('page', 'Atividade - Módulo 1 - Legislação'),
+    ('forum', 'Fórum - Módulo 1 - Reflexão sobre a Educação em Tempo Integral'),
+    ('forum', 'Fórum - Módulo 1 - Desafios para a estruturação da Educação em Tempo Integral'),
+    ('assign', 'Atividade - Plano de Estudos'),
+    ('forum', 'Fórum - Módulo 2 - Refletindo sobre a experiência relatada no Projeto Burareiro'),
+    ('assign', 'Atividade - Módulo 2'),
+    ('forum', 'Fórum - Módulo 3'),
+    ('assign', 'Atividade - Módulo 3'),
+    ('forum', 'Fórum - Módulo 4'),
+    ('assign', 'Atividade - Módulos 4 e 5 - Relato de Experiências'),
+    ('forum', 'Fórum - Módulo 6 - Educação em Direitos Humanos e Formação para a Convivência'),
+    ('assign', 'Atividade Final - Módulo 6'),
+]
+TAREFAS = [nome for tipo, nome in ATIVIDADES_CONCLUSAO if tipo == 'assign']
+
+# tipo de módulo -> (id do módulo no Moodle, peso na composição de um curso)
+TIPOS_MODULO = {
+    'label': (13, 26), 'url': (21, 10), 'forum': (9, 6), 'resource': (18, 6), 'attendance': (24, 3),
+    'assign': (1, 2.5), 'hvp': (26, 2), 'bigbluebuttonbn': (29, 1.2), 'page': (16, 0.7),
+    'folder': (8, 0.7), 'glossary': (10, 0.6), 'book': (3, 0.4),
+}
+MODULOS_CONCLUIDOS = {'forum': 24, 'resource': 23, 'url': 19, 'hvp': 17, 'assign': 11, 'page': 6}
+RACA_COR = {'Parda': 757, 'Branca': 342, 'Preta': 132, 'Prefiro não declarar': 10, 'Amarela': 8, 'Indígena': 4}
+
+# Peso de cada hora do dia nos acessos: manhã, tarde e pico à noite
+PESO_HORA = np.array([1, 0.5, 0.3, 0.2, 0.2, 0.5, 2, 5, 9, 11, 11, 9, 6, 8, 10, 10, 9, 7, 7, 9, 10, 9, 6, 3])
+
+
+def _pesos_zipf(n, expoente=1.1):
+    pesos = 1 / np.arange(1, n + 1) ** expoente
+    return pesos / pesos.sum()
+
+
+def _escolher(rng, valores, n, pesos=None):
+    valores = np.asarray(valores, dtype=object)
+    return valores[rng.choice(len(valores), size=n, p=pesos)]
+
+
+def _categorico(valores_por_aluno, indices):
+    """Coluna categórica com o valor de cada aluno repetido nas linhas ``indices``."""
+    codigos, categorias = pd.factorize(valores_por_aluno)
+    return pd.Categorical.from_codes(codigos[indices], categories=categorias)
+
+
+def _unix(datas):
+    return (pd.to_datetime(datas).astype('datetime64[s]').astype(np.int64)).astype(np.int64)
+
+
+# ---------- Entidades ----------
+
+def gerar_cursos(rng, estados, coortes):
+    linhas = []
+    for i, (sigla, _) in enumerate(UFS[:estados]):
+        for coorte in range(1, coortes + 1):
+            linhas.append((sigla, coorte, 13 + i))
+    cursos = pd.DataFrame(linhas, columns=['estado_sigla', 'coorte', 'category'])
+    cursos['id'] = ID_CURSO_INICIAL + np.arange(len(cursos))
+    cursos['turma'] = 'NF' + cursos['estado_sigla'] + '_' + cursos['coorte'].map('{:02d}'.format)
+    cursos['fullname'] = '[' + cursos['turma'] + '] ' + NOME_CURSO
+    # Os nomes curtos reais nem sempre têm espaço depois do colchete
+    espaco = np.where(rng.random(len(cursos)) < 0.5, ' ', '')
+    cursos['shortname'] = '[' + cursos['turma'] + ']' + espaco + 'Formação Continuada'
+    return cursos
+
+
+def gerar_alunos(rng, cursos, alunos, inicio):
+    """Uma linha por aluno: curso, cidade, nome, e-mail e engajamento."""
+    # Turmas de tamanhos desiguais
+    proporcao = rng.dirichlet(np.full(len(cursos), 4.0))
+    curso = rng.choice(len(cursos), size=alunos, p=proporcao)
+
+    firstname = _escolher(rng, PRENOMES, alunos, _pesos_zipf(len(PRENOMES), 0.8))
+    segundo = rng.random(alunos) < 0.35
+    firstname[segundo] = firstname[segundo] + ' ' + _escolher(rng, PRENOMES, segundo.sum())
+    lastname = _escolher(rng, SOBRENOMES, alunos, _pesos_zipf(len(SOBRENOMES), 0.9))
+    composto = rng.random(alunos) < 0.6
+    lastname[composto] = (
+        _escolher(rng, SOBRENOMES, composto.sum()) + ' ' + _escolher(rng, CONECTIVOS, composto.sum())
+        + ' ' + lastname[composto]
+    )
+    df = pd.DataFrame({'firstname': firstname, 'lastname': lastname})
+    # Parte dos cadastros em maiúsculas, parte como digitado
+    maiusculas = rng.random(alunos) < 0.55
+    df.loc[maiusculas, 'firstname'] = df.loc[maiusculas, 'firstname'].str.upper()
+    df.loc[maiusculas, 'lastname'] = df.loc[maiusculas, 'lastname'].str.upper()
+
+    df['userid'] = ID_USUARIO_INICIAL + np.arange(alunos)
+    df['curso'] = curso
+    df['courseid'] = cursos['id'].to_numpy()[curso]
+    df['estado_sigla'] = cursos['estado_sigla'].to_numpy()[curso]
+    df['turma'] = cursos['turma'].to_numpy()[curso]
+    df['course_name'] = cursos['fullname'].to_numpy()[curso]
+
+    # Cidades por estado com distribuição de Zipf (capital e polos concentram alunos)
+    nomes_cidade = np.array(sorted({f"{p} {b}".strip() for p in PREFIXOS_CIDADE for b in BASES_CIDADE}), dtype=object)
+    cidade = rng.choice(len(nomes_cidade), size=alunos, p=_pesos_zipf(len(nomes_cidade), 1.0))
+    deslocamento = pd.factorize(df['estado_sigla'])[0] * 7
+    df['cidade'] = nomes_cidade[(cidade + deslocamento) % len(nomes_cidade)]
+
+    primeiro = normalizar_serie(df['firstname']).str.split(' ').str[0]
+    ultimo = normalizar_serie(df['lastname']).str.split(' ').str[-1]
+    df['email'] = (
+        primeiro + '.' + ultimo + pd.Series(rng.integers(1, 99, alunos).astype(str))
+        + '@' + _escolher(rng, DOMINIOS, alunos, _pesos_zipf(len(DOMINIOS)))
+    )
+    # Cerca de 16% dos e-mails vêm anonimizados como hash
+    anonimos = rng.random(alunos) < 0.16
+    hashes = np.frombuffer(rng.bytes(16 * anonimos.sum()), dtype='S16')
+    df.loc[anonimos, 'email'] = [h.hex() for h in hashes]
+
+    df['acessou'] = rng.random(alunos) >= 0.3
+    df['engajamento'] = np.where(df['acessou'], rng.lognormal(0, 1.0, alunos), 0.0)
+    df['timecreated'] = _unix(pd.Timestamp(inicio) - pd.to_timedelta(rng.integers(1, 900, alunos), unit='D'))
+    df['inscrito_em'] = _unix(pd.Timestamp(inicio) - pd.to_timedelta(rng.integers(0, 5 * 86400, alunos), unit='s'))
+    return df
+
+
+def gerar_log_acessos(rng, alunos, acessos, dias, inicio):
+    """Log (user_id, firstname, lastname, course_name, access_time) ordenado por aluno e horário."""
+    peso = alunos['engajamento'].to_numpy()
+    contagens = rng.multinomial(acessos, peso / peso.sum())
+    indice = np.repeat(np.arange(len(alunos)), contagens)
+
+    # Cada aluno começa em algum dia do primeiro terço e os acessos rareiam com o tempo
+    comeco = rng.integers(0, max(dias // 3, 1), len(alunos))[indice]
+    dia = comeco + np.floor(rng.random(len(indice)) ** 1.8 * (dias - comeco)).astype(np.int64)
+    hora = rng.choice(24, size=len(indice), p=PESO_HORA / PESO_HORA.sum())
+    segundos = dia * 86400 + hora * 3600 + rng.integers(0, 3600, len(indice))
+
+    ordem = np.lexsort((segundos, indice))
+    indice, segundos = indice[ordem], segundos[ordem]
+    access_time = np.datetime64(pd.Timestamp(inicio), 's') + segundos.astype('timedelta64[s]')
+
+    log = pd.DataFrame({
+        'user_id': alunos['userid'].to_numpy()[indice],
+        'firstname': _categorico(alunos['firstname'].to_numpy(), indice),
+        'lastname': _categorico(alunos['lastname'].to_numpy(), indice),
+        'course_name': _categorico(alunos['course_name'].to_numpy(), indice),
+        'access_time': access_time.astype('datetime64[ns]'),
+    })
+
+    # Último acesso de cada aluno: o log está ordenado, então é a última linha de cada um
+    ultimo = np.full(len(alunos), np.datetime64('NaT'), dtype='datetime64[ns]')
+    com_acesso = contagens > 0
+    ultimo[com_acesso] = log['access_time'].to_numpy()[np.cumsum(contagens)[com_acesso] - 1]
+    return log, pd.Series(ultimo, index=alunos.index)
+
+
+def gerar_equipe(rng, cursos, primeiro_id):
+    """Um professor editor por turma e alguns gestores em todas as turmas."""
+    n_gestores = 2
+    userid = primeiro_id + np.arange(len(cursos) + n_gestores)
+    equipe = pd.DataFrame({
+        'userid': userid,
+        'firstname': _escolher(rng, PRENOMES, len(userid)),
+        'lastname': _escolher(rng, SOBRENOMES, len(userid)),
+    })
+    equipe['email'] = normalizar_serie(equipe['firstname']) + '.' + normalizar_serie(equipe['lastname']) + '@educacao.gov.br'
+    funcoes = pd.concat([
+        pd.DataFrame({'userid': userid[:len(cursos)], 'courseid': cursos['id'], 'papel': 'editingteacher'}),
+        pd.DataFrame({
+            'userid': np.repeat(userid[len(cursos):], len(cursos)),
+            'courseid': np.tile(cursos['id'].to_numpy(), n_gestores),
+            'papel': 'manager',
+        }),
+    ], ignore_index=True)
+    return equipe, funcoes
+
+
+# ---------- Planilhas ----------
+
+def montar_dados_moodle(rng, cursos, alunos, equipe, inicio, dias):
+    usuarios = (
+        pd.concat([alunos[['userid', 'firstname', 'lastname', 'email']], equipe], ignore_index=True)
+        .rename(columns={'userid': 'id'})
+    )
+
+    atividades = pd.DataFrame(
+        [(curso_id, nome) for curso_id in cursos['id'] for nome in TAREFAS],
+        columns=['course', 'name'],
+    )
+    atividades.insert(0, 'id', 1 + np.arange(len(atividades)))
+    atividades['duedate'] = 0
+
+    # Envios: cada aluno engajado entrega as tarefas do seu curso com probabilidade decrescente
+    n_tarefas = len(TAREFAS)
+    aluno = np.repeat(np.arange(len(alunos)), n_tarefas)
+    ordem = np.tile(np.arange(n_tarefas), len(alunos))
+    engajamento = alunos['engajamento'].to_numpy()[aluno]
+    entregou = rng.random(len(aluno)) < np.clip(engajamento / 2, 0, 0.95) * (0.9 ** ordem)
+    aluno, ordem = aluno[entregou], ordem[entregou]
+    curso = alunos['curso'].to_numpy()[aluno]
+    momento = pd.Timestamp(inicio) + pd.to_timedelta(
+        (ordem + rng.random(len(ordem))) / n_tarefas * dias * 86400, unit='s'
+    )
+    envios = pd.DataFrame({
+        'course': cursos['id'].to_numpy()[curso],
+        'userid': alunos['userid'].to_numpy()[aluno],
+        'assignment': atividades['id'].to_numpy()[curso * n_tarefas + ordem],
+        'timemodified': _unix(momento),
+    })
+
+    # Módulos: composição de tipos parecida com a real, ~100 por curso
+    tipos = list(TIPOS_MODULO)
+    pesos = np.array([p for _, p in TIPOS_MODULO.values()])
+    por_curso = rng.integers(60, 140, len(cursos))
+    curso_modulo = np.repeat(cursos['id'].to_numpy(), por_curso)
+    tipo = _escolher(rng, tipos, len(curso_modulo), pesos / pesos.sum())
+    modulos = pd.DataFrame({
+        'id': 500 + np.arange(len(curso_modulo)),
+        'course': curso_modulo,
+        'module': pd.Series(tipo).map({t: m for t, (m, _) in TIPOS_MODULO.items()}).to_numpy(),
+        'instance': rng.integers(1, 1500, len(curso_modulo)),
+        'tipo_atividade': tipo,
+    })
+
+    return {
+        'cursos': cursos[['id', 'fullname', 'shortname', 'category']],
+        'usuarios': usuarios,
+        'atividades_assign': atividades,
+        'envios_assign': envios,
+        'modulos': modulos,
+    }
+
+
+def montar_dados_nf(rng, cursos, alunos, equipe, funcoes_equipe, ultimo_acesso):
+    lastaccess = np.where(
+        ultimo_acesso.notna(), _unix(ultimo_acesso.fillna(pd.Timestamp(0))), 0
+    )
+    usuarios = pd.concat([
+        pd.DataFrame({
+            'userid': alunos['userid'], 'firstname': alunos['firstname'], 'lastname': alunos['lastname'],
+            'email': alunos['email'], 'lastaccess': lastaccess, 'timecreated': alunos['timecreated'],
+        }),
+        equipe.assign(lastaccess=_unix(pd.Series(ultimo_acesso.max(), index=equipe.index).fillna(pd.Timestamp(0))),
+                      timecreated=alunos['timecreated'].min()),
+    ], ignore_index=True)
+
+    # Perfil (formato longo) para cerca de 35% dos alunos
+    com_perfil = alunos[rng.random(len(alunos)) < 0.35]
+    n = len(com_perfil)
+    estado_perfil = com_perfil['estado_sigla'].map(dict(UFS)).to_numpy(dtype=object)
+    outro_estado = rng.random(n) < 0.01
+    estado_perfil[outro_estado] = _escolher(rng, [nome for _, nome in UFS], outro_estado.sum())
+    perfil = pd.DataFrame({
+        'userid': np.repeat(com_perfil['userid'].to_numpy(), 3),
+        'campo': np.tile(['cpf', 'racacor', 'estado'], n),
+        'data': np.column_stack([
+            pd.Series(rng.integers(0, 10 ** 11, n)).map('{:011d}'.format).to_numpy(),
+            _escolher(rng, list(RACA_COR), n, np.array(list(RACA_COR.values())) / sum(RACA_COR.values())),
+            estado_perfil,
+        ]).ravel(),
+    })
+
+    # Conclusões de módulos: quantidade proporcional ao engajamento
+    qtd = rng.poisson(alunos['engajamento'].to_numpy() * 8)
+    aluno = np.repeat(np.arange(len(alunos)), qtd)
+    pesos = np.array(list(MODULOS_CONCLUIDOS.values()), dtype=float)
+    conclusoes = pd.DataFrame({
+        'userid': alunos['userid'].to_numpy()[aluno],
+        'courseid': alunos['courseid'].to_numpy()[aluno],
+        'modulename': _escolher(rng, list(MODULOS_CONCLUIDOS), len(aluno), pesos / pesos.sum()),
+        'completionstate': np.where(rng.random(len(aluno)) < 0.999, 1, 0),
+    })
+
+    funcoes = pd.concat([
+        pd.DataFrame({'userid': alunos['userid'], 'courseid': alunos['courseid'], 'papel': 'student'}),
+        funcoes_equipe,
+    ], ignore_index=True)
+
+    return {
+        'Cursos_NF': cursos[['id', 'fullname']].rename(columns={'id': 'courseid'}),
+        'Matriculas': alunos[['userid', 'courseid', 'inscrito_em']],
+        'Usuarios': usuarios,
+        'Perfil': perfil,
+        'Conclusoes_Modulos': conclusoes,
+        'Funcoes': funcoes,
+    }
+
+
+def montar_acessos_tratado(alunos, ultimo_acesso):
+    return {'Sheet1': pd.DataFrame({
+        'nome': normalizar_serie(alunos['firstname'] + ' ' + alunos['lastname']).str.upper(),
+        'cidade': alunos['cidade'],
+        'id_coorte': alunos['turma'],
+        'acesso': np.where(ultimo_acesso.notna(), 'já acessou', 'nunca acessou'),
+        'estado': alunos['estado_sigla'],
+        'ultimo_acesso': ultimo_acesso.dt.strftime('%d/%m/%Y %H:%M:%S').fillna('Nunca acessou'),
+    })}
+
+
+def montar_estado_conclusao(rng, alunos, ultimo_acesso):
+    n_atividades = len(ATIVIDADES_CONCLUSAO)
+    aluno = np.repeat(np.arange(len(alunos)), n_atividades)
+    ordem = np.tile(np.arange(n_atividades), len(alunos))
+    tipos, nomes = (np.array(c, dtype=object) for c in zip(*ATIVIDADES_CONCLUSAO))
+    engajamento = alunos['engajamento'].to_numpy()[aluno]
+    concluiu = rng.random(len(aluno)) < np.clip(engajamento, 0, 0.97) * (0.93 ** ordem)
+
+    nome_aluno = (alunos['firstname'] + ' ' + alunos['lastname']).to_numpy(dtype=object)
+    ultimo = ultimo_acesso.dt.strftime('%Y-%m-%d %H:%M:%S').fillna('Nunca Acessou').to_numpy(dtype=object)
+    return {'Sheet1': pd.DataFrame({
+        'nome_aluno': nome_aluno[aluno],
+        'email': alunos['email'].to_numpy(dtype=object)[aluno],
+        'nome_curso': alunos['course_name'].to_numpy(dtype=object)[aluno],
+        'tipo_atividade': tipos[ordem],
+        'nome_atividade': nomes[ordem],
+        'estado_conclusao': concluiu.astype(np.int64),
+        'ultimo_acesso': ultimo[aluno],
+        'aluno': pd.Series(nome_aluno).str.upper().to_numpy(dtype=object)[aluno],
+        'estado': alunos['estado_sigla'].to_numpy(dtype=object)[aluno],
+        'turma': alunos['turma'].to_numpy(dtype=object)[aluno],
+    })}
+
+
+def gravar_planilha(caminho, abas, xlsx=True):
+    """.xlsx de verdade quando cabe no Excel; senão direto no cache Parquet."""
+    if not xlsx or max(len(df) for df in abas.values()) > LIMITE_LINHAS_EXCEL:
+        gravar_cache(caminho, abas)
+        return
+    with pd.ExcelWriter(caminho) as escritor:
+        for nome_aba, df in abas.items():
+            df.to_excel(escritor, sheet_name=nome_aba, index=False)
+
+
+# ---------- Orquestração ----------
+
+def gerar(destino, estados=4, coortes=12, alunos=3400, dias=60, acessos=None, semente=42,
+          inicio=INICIO_PADRAO, ingerir_log=True, xlsx=True):
+    """Gera todas as entradas dos dashboards em ``destino``. Devolve tempos e tamanhos."""
+    if not 1 <= estados <= len(UFS):
+        raise ValueError(f"estados deve estar entre 1 e {len(UFS)}")
+    destino = Path(destino)
+    destino.mkdir(parents=True, exist_ok=True)
+    acessos = ACESSOS_POR_ALUNO * alunos if acessos is None else acessos
+    rng = np.random.default_rng(semente)
+    tempos = {}
+
+    inicio_geracao = time.perf_counter()
+    cursos = gerar_cursos(rng, estados, coortes)
+    df_alunos = gerar_alunos(rng, cursos, alunos, inicio)
+    log, ultimo_acesso = gerar_log_acessos(rng, df_alunos, acessos, dias, inicio)
+    equipe, funcoes_equipe = gerar_equipe(rng, cursos, ID_USUARIO_INICIAL + alunos)
+    planilhas = {
+        'dados_moodle.xlsx': montar_dados_moodle(rng, cursos, df_alunos, equipe, inicio, dias),
+        'dados_nf.xlsx': montar_dados_nf(rng, cursos, df_alunos, equipe, funcoes_equipe, ultimo_acesso),
+        'Acessos_tratado.xlsx': montar_acessos_tratado(df_alunos, ultimo_acesso),
+        'estado_de_conclusao_tratado.xlsx': montar_estado_conclusao(rng, df_alunos, ultimo_acesso),
+    }
+    tempos['geracao_s'] = time.perf_counter() - inicio_geracao
+
+    inicio_escrita = time.perf_counter()
+    exportacao = destino / 'dados_acessos.parquet'
+    log.to_parquet(exportacao, index=False)
+    tempos['log_parquet_s'] = time.perf_counter() - inicio_escrita
+
+    inicio_escrita = time.perf_counter()
+    for arquivo, abas in planilhas.items():
+        gravar_planilha(destino / arquivo, abas, xlsx)
+    tempos['planilhas_s'] = time.perf_counter() - inicio_escrita
+
+    if ingerir_log:
+        inicio_ingestao = time.perf_counter()
+        ingerir(exportacao, store=destino / DIRETORIO_STORE)
+        tempos['ingestao_s'] = time.perf_counter() - inicio_ingestao
+
+    linhas = {f"{arquivo}:{aba}": len(df) for arquivo, abas in planilhas.items() for aba, df in abas.items()}
+    linhas['dados_acessos.parquet'] = len(log)
+    return {'tempos': tempos, 'linhas': linhas}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("destino", type=Path)
+    parser.add_argument("--estados", type=int, default=4, help=f"1 a {len(UFS)} (CE, MA, PI, PE, ...)")
+    parser.add_argument("--coortes", type=int, default=12, help="turmas por estado")
+    parser.add_argument("--alunos", type=int, default=3400)
+    parser.add_argument("--dias", type=int, default=60, help="duração do período de acessos")
+    parser.add_argument("--acessos", type=int, default=None,
+                        help=f"linhas do log de acessos (padrão: {ACESSOS_POR_ALUNO} por aluno)")
+    parser.add_argument("--inicio", default=INICIO_PADRAO, help="primeiro dia do período (AAAA-MM-DD)")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--sem-ingestao", action="store_true", help="não ingere o log no armazenamento")
+    parser.add_argument("--somente-cache", action="store_true",
+                        help="grava as planilhas só no cache Parquet, sem o conteúdo no .xlsx")
+    args = parser.parse_args(argv)
+
+    resultado = gerar(
+        args.destino, args.estados, args.coortes, args.alunos, args.dias, args.acessos,
+        args.semente, args.inicio, ingerir_log=not args.sem_ingestao, xlsx=not args.somente_cache,
+    )
+    for nome, linhas in resultado['linhas'].items():
+        print(f"{nome:<45} {linhas:>12,}")
+    print("  ".join(f"{etapa}: {segundos:.1f}s" for etapa, segundos in resultado['tempos'].items()))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,23 +1,34 @@
 import pandas as pd
 import streamlit as st
 from datetime import datetime
-import matplotlib.pyplot as plt
+
+from atualizacao_dados import exibir_status_dados
+from cache_figuras import exibir_figura
+from conjuntos_dados import obter_conjunto
+from dimensao_cursos import juntar_dimensao
+from esquemas import exibir_relatorio_memoria
+from graficos import pyplot
 
 st.set_page_config(layout="wide")
 st.title("📊 Dashboard dos Cursos [NF]")
 
 # --- Carregar dados ---
+# Abas montadas em segundo plano (``conjuntos_dados``) e compartilhadas entre sessões: não alterar no lugar
 try:
-    dados_path = "dados_nf.xlsx"
-    cursos = pd.read_excel(dados_path, sheet_name="Cursos_NF")
-    matriculas = pd.read_excel(dados_path, sheet_name="Matriculas")
-    usuarios = pd.read_excel(dados_path, sheet_name="Usuarios")
-    perfil = pd.read_excel(dados_path, sheet_name="Perfil")
-    conclusoes = pd.read_excel(dados_path, sheet_name="Conclusoes_Modulos")
-    funcoes = pd.read_excel(dados_path, sheet_name="Funcoes")
+    publicacao = obter_conjunto('tabelas_nf')
 except FileNotFoundError:
     st.error("❌ Arquivo 'dados_nf.xlsx' não encontrado no diretório atual.")
     st.stop()
+versao = publicacao.versao
+cursos = publicacao.valor["Cursos_NF"]
+matriculas = publicacao.valor["Matriculas"]
+usuarios = publicacao.valor["Usuarios"]
+perfil = publicacao.valor["Perfil"]
+conclusoes = publicacao.valor["Conclusoes_Modulos"]
+funcoes = publicacao.valor["Funcoes"]
+
+exibir_relatorio_memoria()
+exibir_status_dados(['tabelas_nf'])
 
 
 #_#_#_#    
@@ -49,7 +60,7 @@ st.metric("Formadores", qtd_editingteacher)
 st.header("📘 Conclusões por Módulo")
 
 concluintes = conclusoes[conclusoes['completionstate'] == 1]
-resumo_modulos = concluintes.groupby(['courseid', 'modulename'])['userid'].nunique().reset_index()
+resumo_modulos = concluintes.groupby(['courseid', 'modulename'], observed=True)['userid'].nunique().reset_index()
 resumo_modulos.columns = ['courseid', 'modulo', 'concluintes']
 
 curso_select = st.selectbox("📌 Selecione um Curso", cursos['fullname'].unique())
@@ -81,69 +92,69 @@ matriculas_cursos = matriculas.merge(cursos[['courseid', 'fullname']], on='cours
 matriculas_cursos = matriculas_cursos.merge(usuarios[['userid', 'lastaccess']], on='userid', how='left')
 
 # Extrair estado da turma (NFXX)
-def extrair_estado(turma):
-    if pd.isna(turma):
-        return "Desconhecido"
-    turma = turma.strip()
-    if turma.startswith('[NF') and len(turma) >= 5:
-        return turma[3:5]  # Pega a sigla do estado
-    return "Desconhecido"
-
-matriculas_cursos['estado'] = matriculas_cursos['fullname'].apply(extrair_estado)
+matriculas_cursos['estado'] = juntar_dimensao(
+    matriculas_cursos['fullname'], colunas=['estado_sigla'], preencher="Desconhecido"
+)['estado_sigla']
 
 # Criar status de acesso
 matriculas_cursos['status'] = matriculas_cursos['lastaccess'].apply(lambda x: 'Nunca Acessaram' if x == 0 else 'Ativo')
 
-# Agrupar por estado e status
-estado_status = matriculas_cursos.groupby(['estado', 'status']).size().unstack(fill_value=0)
+def desenhar_estudantes_estado():
+    plt = pyplot()
+    # Agrupar por estado e status
+    estado_status = matriculas_cursos.groupby(['estado', 'status'], observed=True).size().unstack(fill_value=0)
 
-# Ordenar por total
-estado_status['Total'] = estado_status.sum(axis=1)
-estado_status = estado_status.sort_values(by='Total', ascending=False)
+    # Ordenar por total
+    estado_status['Total'] = estado_status.sum(axis=1)
+    estado_status = estado_status.sort_values(by='Total', ascending=False)
 
-# Plotar gráfico barras empilhadas
-fig, ax = plt.subplots(figsize=(12, 6))
-cores = ['#4CAF50', '#F44336']  # Verde para Ativo, vermelho para Nunca Acessaram
-estado_status[['Ativo', 'Nunca Acessaram']].plot(kind='bar', stacked=True, color=cores, ax=ax)
+    # Plotar gráfico barras empilhadas
+    fig, ax = plt.subplots(figsize=(12, 6))
+    cores = ['#4CAF50', '#F44336']  # Verde para Ativo, vermelho para Nunca Acessaram
+    estado_status[['Ativo', 'Nunca Acessaram']].plot(kind='bar', stacked=True, color=cores, ax=ax)
 
-# Adicionar rótulos nas barras
-for container in ax.containers:
-    ax.bar_label(container, label_type='center', fontsize=9)
+    # Adicionar rótulos nas barras
+    for container in ax.containers:
+        ax.bar_label(container, label_type='center', fontsize=9)
 
-ax.set_title("Estudantes por Estado (baseado na Turma)")
-ax.set_xlabel("Estado")
-ax.set_ylabel("Quantidade de Estudantes")
-ax.legend(title="Status de Acesso")
-plt.xticks(rotation=45)
+    ax.set_title("Estudantes por Estado (baseado na Turma)")
+    ax.set_xlabel("Estado")
+    ax.set_ylabel("Quantidade de Estudantes")
+    ax.legend(title="Status de Acesso")
+    plt.xticks(rotation=45)
+    return fig
 
-st.pyplot(fig)
+exibir_figura("estudantes_por_estado", desenhar_estudantes_estado, versao=versao)
 
 #############################
 
-import matplotlib.pyplot as plt
-
 st.header("🏫 Quantidade de Turmas por Estado")
 
 # Extrair estado da turma dos cursos
-cursos['estado'] = cursos['fullname'].apply(lambda x: x[3:5] if isinstance(x, str) and x.startswith('[NF') else 'Desconhecido')
+cursos = cursos.assign(
+    estado=juntar_dimensao(cursos['fullname'], colunas=['estado_sigla'], preencher='Desconhecido')['estado_sigla']
+)
 
-# Contar turmas por estado
-turmas_por_estado = cursos.groupby('estado').size().sort_values(ascending=False)
+def desenhar_turmas_estado():
+    plt = pyplot()
+    # Contar turmas por estado
+    turmas_por_estado = cursos.groupby('estado', observed=True).size().sort_values(ascending=False)
 
-# Plotar gráfico de barras
-fig, ax = plt.subplots(figsize=(10, 6))
-turmas_por_estado.plot(kind='bar', color='#007acc', ax=ax)
+    # Plotar gráfico de barras
+    fig, ax = plt.subplots(figsize=(10, 6))
+    turmas_por_estado.plot(kind='bar', color='#007acc', ax=ax)
 
-# Adicionar rótulos nas barras
-for i, v in enumerate(turmas_por_estado):
-    ax.text(i, v + 0.2, str(v), ha='center', fontsize=10)
+    # Adicionar rótulos nas barras
+    for i, v in enumerate(turmas_por_estado):
+        ax.text(i, v + 0.2, str(v), ha='center', fontsize=10)
 
-ax.set_title("Quantidade de Turmas por Estado")
-ax.set_xlabel("Estado")
-ax.set_ylabel("Número de Turmas")
-plt.xticks(rotation=45)
+    ax.set_title("Quantidade de Turmas por Estado")
+    ax.set_xlabel("Estado")
+    ax.set_ylabel("Número de Turmas")
+    plt.xticks(rotation=45)
+    return fig
 
-st.pyplot(fig)
+exibir_figura("turmas_por_estado", desenhar_turmas_estado, versao=versao)
 
 
 ##################
@@ -164,22 +175,16 @@ Nesta análise, identificamos as **turmas (cursos) com o menor número de conclu
 concluintes = conclusoes[conclusoes['completionstate'] == 1]
 
 # Contar concluintes por curso e módulo
-resumo_modulos = concluintes.groupby(['courseid', 'modulename'])['userid'].nunique().reset_index()
+resumo_modulos = concluintes.groupby(['courseid', 'modulename'], observed=True)['userid'].nunique().reset_index()
 resumo_modulos.columns = ['courseid', 'modulo', 'concluintes']
 
 # Juntar com cursos para ter nome da turma e extrair estado
 resumo_modulos = resumo_modulos.merge(cursos[['courseid', 'fullname']], on='courseid', how='left')
 
 # Extrair estado do nome da turma
-def extrair_estado(turma):
-    if pd.isna(turma):
-        return "Desconhecido"
-    turma = turma.strip()
-    if turma.startswith('[NF') and len(turma) >= 5:
-        return turma[3:5]
-    return "Desconhecido"
-
-resumo_modulos['estado'] = resumo_modulos['fullname'].apply(extrair_estado)
+resumo_modulos['estado'] = juntar_dimensao(
+    resumo_modulos['fullname'], colunas=['estado_sigla'], preencher="Desconhecido"
+)['estado_sigla']
 
 # Ordenar por menor número de concluintes
 menor_conclusao = resumo_modulos.sort_values(by='concluintes').head(10)
@@ -196,8 +201,6 @@ st.dataframe(menor_conclusao[['fullname', 'modulo', 'concluintes', 'estado']].re
 
 # --- Gráfico comparativo por estado das turmas com menos concluintes ---
 
-import matplotlib.pyplot as plt
-
 st.subheader("Comparação dos Estados nas Turmas com Menor Número de Concluintes")
 
 
@@ -211,21 +214,24 @@ Nesta análise, identificamos as **turmas (cursos) com o menor número de conclu
 - Em seguida, apresentamos um gráfico que compara o total de concluintes dessas turmas com menor desempenho, agrupados por estado, para identificar quais estados concentram as turmas com menor sucesso nos módulos.
 """)
 
-# Agrupar por estado somando concluintes dessas turmas selecionadas
-agrup_estado = menor_conclusao.groupby('estado')['concluintes'].sum().sort_values(ascending=False)
+def desenhar_menor_conclusao():
+    plt = pyplot()
+    # Agrupar por estado somando concluintes dessas turmas selecionadas
+    agrup_estado = menor_conclusao.groupby('estado', observed=True)['concluintes'].sum().sort_values(ascending=False)
 
-fig, ax = plt.subplots(figsize=(10,6))
-agrup_estado.plot(kind='bar', color='#d62728', ax=ax)
+    fig, ax = plt.subplots(figsize=(10,6))
+    agrup_estado.plot(kind='bar', color='#d62728', ax=ax)
 
-# Adicionar rótulos nas barras
-for i, v in enumerate(agrup_estado):
-    ax.text(i, v + 0.2, str(v), ha='center', fontsize=10)
+    # Adicionar rótulos nas barras
+    for i, v in enumerate(agrup_estado):
+        ax.text(i, v + 0.2, str(v), ha='center', fontsize=10)
 
-ax.set_title("Total de Concluintes por Estado nas Turmas com Menos Concluintes")
-ax.set_xlabel("Estado")
-ax.set_ylabel("Número de Concluintes")
-plt.xticks(rotation=45)
+    ax.set_title("Total de Concluintes por Estado nas Turmas com Menos Concluintes")
+    ax.set_xlabel("Estado")
+    ax.set_ylabel("Número de Concluintes")
+    plt.xticks(rotation=45)
+    return fig
 
-st.pyplot(fig)
+exibir_figura("menor_conclusao_estado", desenhar_menor_conclusao, versao=versao)
 
 #_#_#_#
@@ -0,0 +1,80 @@
+"""Dimensão de cursos: estado e turma extraídos do nome do curso.
+
+Os nomes das turmas seguem o padrão ``[NFXX_NN] Formação ...``, onde ``XX``
+é a sigla do estado e ``NN`` o número da coorte. A extração é feita uma
+única vez por nome de curso distinto (algumas dezenas), e as tabelas de
+fatos (acessos, matrículas, conclusões) recebem as colunas da dimensão por
+códigos categóricos, sem ``.apply`` linha a linha.
+"""
+
+import numpy as np
+import pandas as pd
+
+ESTADOS = {
+    'CE': 'Ceará',
+    'MA': 'Maranhão',
+    'PI': 'Piauí',
+    'PE': 'Pernambuco'
+}
+
+# "[NFCE_01] Formação ..." -> sigla "CE", coorte "01"
+PADRAO_TURMA = r"\[NF(?P<estado_sigla>[A-Z]{2})(?:_(?P<coorte>\d+))?\]?"
+
+COLUNAS_DIMENSAO = ['estado_sigla', 'estado', 'coorte', 'turma']
+
+
+def montar_dimensao_cursos(nomes_cursos):
+    """Uma linha por nome de curso distinto, indexada pelo nome.
+
+    Colunas: ``estado_sigla`` (ex.: ``CE``), ``estado`` (ex.: ``Ceará``),
+    ``coorte`` (número da turma no estado) e ``turma`` (ex.: ``NFCE_01``).
+    Cursos fora do padrão ficam com valores nulos.
+    """
+    nomes = pd.Index(pd.unique(pd.Series(nomes_cursos, dtype=object).dropna()), dtype=object, name='curso')
+    extraido = nomes.str.extract(PADRAO_TURMA)
+    extraido.index = nomes
+
+    sigla = extraido['estado_sigla']
+    coorte = pd.to_numeric(extraido['coorte'], errors='coerce').astype('Int16')
+    turma = ('NF' + sigla + '_' + extraido['coorte']).where(extraido['coorte'].notna())
+
+    return pd.DataFrame({
+        'estado_sigla': sigla,
+        'estado': sigla.map(ESTADOS),
+        'coorte': coorte,
+        'turma': turma,
+    }, index=nomes)
+
+
+def juntar_dimensao(nomes_cursos, colunas=('estado',), preencher=None):
+    """Colunas da dimensão alinhadas a uma tabela de fatos.
+
+    ``nomes_cursos`` é a coluna de nome do curso da tabela de fatos. Os nomes
+    são fatorados (um código por curso distinto), a dimensão é montada só
+    para os cursos distintos e cada coluna pedida volta como ``Categorical``
+    indexado pelos códigos. ``preencher`` substitui os valores ausentes
+    (cursos fora do padrão ou nome nulo).
+    """
+    codigos, cursos = pd.factorize(nomes_cursos)
+    dimensao = montar_dimensao_cursos(cursos)
+
+    resultado = {}
+    for coluna in colunas:
+        valores = pd.Categorical(dimensao[coluna].astype(object))
+        categorias = valores.categories
+        codigos_valor = valores.codes
+        if preencher is not None:
+            if preencher not in categorias:
+                categorias = categorias.append(pd.Index([preencher]))
+            codigos_valor = np.where(codigos_valor < 0, categorias.get_loc(preencher), codigos_valor)
+        # Código -1 (nome nulo) aponta para o último elemento: nulo ou o valor de preenchimento
+        ausente = categorias.get_loc(preencher) if preencher is not None else -1
+        codigos_valor = np.append(codigos_valor, ausente).astype(np.int32)
+        resultado[coluna] = pd.Categorical.from_codes(codigos_valor[codigos], categories=categorias)
+
+    return pd.DataFrame(resultado, index=getattr(nomes_cursos, 'index', None))
+
+
+def dimensao_do_curso(nome_curso):
+    """Atributos de um único curso (``estado_sigla``, ``estado``, ``coorte``, ``turma``)."""
+    return montar_dimensao_cursos([nome_curso]).iloc[0]
@@ -0,0 +1,298 @@
+"""Esquemas declarados das planilhas e do log de acessos, e relatório de memória.
+
+Cada aba conhecida tem um esquema ``{coluna: tipo}`` aplicado na carga
+(``cache_dados.ler_excel`` e ``ingestao_acessos.ler_acessos``):
+
+- ``"category"`` para textos de baixa cardinalidade (estado, cidade, turma,
+  curso, tipo de atividade, nomes repetidos em todo o log...). As colunas
+  são lidas do Parquet já como dicionário, sem passar por uma string Python
+  por linha, e as categorias ficam em ordem alfabética, como nas ordenações
+  e groupbys sobre texto;
+- ``"int32"``/``"int16"``/``"int8"`` para ids e flags: a conversão só é feita
+  se todos os valores couberem no tipo;
+- ``"datetime64[ns]"`` para datas que já vêm como data.
+
+Colunas fora do esquema (nomes completos, e-mails, datas em texto) ficam
+como estão. Cada carga registra linhas e bytes ocupados, no disco, sem e
+com o esquema, calculados uma vez no registro; o painel de debug
+(``exibir_relatorio_memoria``) só mostra esses números. O painel aparece com ``?debug=1`` na URL ou ``DEBUG_DASHBOARDS=1``.
+
+Atenção ao usar colunas categóricas: ``groupby`` precisa de
+``observed=True`` (senão aparecem combinações vazias), a concatenação de
+textos deve passar por ``concatenar_categorias`` e a limpeza de textos
+(``.str.strip()``...) por ``transformar_categorias``.
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+
+CATEGORIA = "category"
+
+ESQUEMAS = {
+    "Acessos_tratado.xlsx": {
+        "Sheet1": {"cidade": CATEGORIA, "id_coorte": CATEGORIA, "acesso": CATEGORIA, "estado": CATEGORIA},
+    },
+    "estado_de_conclusao_tratado.xlsx": {
+        "Sheet1": {
+            "nome_curso": CATEGORIA, "tipo_atividade": CATEGORIA, "nome_atividade": CATEGORIA,
+            "estado_conclusao": "int8", "estado": CATEGORIA, "turma": CATEGORIA,
+        },
+    },
+    "dados_moodle.xlsx": {
+        "cursos": {"id": "int32", "category": "int16"},
+        "usuarios": {"id": "int32"},
+        "atividades_assign": {"id": "int32", "course": "int32", "name": CATEGORIA},
+        "envios_assign": {"course": "int32", "userid": "int32", "assignment": "int32"},
+        "modulos": {
+            "id": "int32", "course": "int32", "module": "int16", "instance": "int32",
+            "tipo_atividade": CATEGORIA,
+        },
+    },
+    "dados_nf.xlsx": {
+        "Cursos_NF": {"courseid": "int32"},
+        "Matriculas": {"userid": "int32", "courseid": "int32"},
+        "Usuarios": {"userid": "int32"},
+        "Perfil": {"userid": "int32", "campo": CATEGORIA},
+        "Conclusoes_Modulos": {
+            "userid": "int32", "courseid": "int32", "modulename": CATEGORIA, "completionstate": "int8",
+        },
+        "Funcoes": {"userid": "int32", "courseid": "int32", "papel": CATEGORIA},
+    },
+}
+
+# Log de acessos: o mesmo curso e os mesmos nomes se repetem em milhares de linhas
+ESQUEMA_ACESSOS = {
+    "user_id": "int32",
+    "firstname": CATEGORIA,
+    "lastname": CATEGORIA,
+    "course_name": CATEGORIA,
+    "access_time": "datetime64[ns]",
+}
+
+_medicoes = {}
+_trava = threading.Lock()
+
+
+def esquema_da_aba(arquivo, aba):
+    """Esquema declarado para a aba ``aba`` de ``arquivo`` (só o nome do arquivo conta)."""
+    return ESQUEMAS.get(os.path.basename(str(arquivo)), {}).get(aba)
+
+
+def colunas_categoricas(esquema):
+    return [coluna for coluna, tipo in (esquema or {}).items() if tipo == CATEGORIA]
+
+
+def _categorias_em_ordem(serie):
+    categorias = serie.cat.categories
+    try:
+        ordenadas = categorias.sort_values()
+    except TypeError:  # tipos misturados não têm ordem
+        return serie
+    if categorias.equals(ordenadas):
+        return serie
+    return serie.cat.reorder_categories(ordenadas)
+
+
+def _converter(serie, tipo):
+    if tipo == CATEGORIA:
+        if not isinstance(serie.dtype, pd.CategoricalDtype):
+            serie = serie.astype(CATEGORIA)
+        return _categorias_em_ordem(serie.cat.remove_unused_categories())
+
+    if tipo.startswith("int"):
+        if not pd.api.types.is_integer_dtype(serie.dtype) or isinstance(serie.dtype, pd.CategoricalDtype):
+            return serie
+        limites = np.iinfo(tipo)
+        if len(serie) and (serie.min() < limites.min or serie.max() > limites.max):
+            return serie
+        return serie.astype(tipo)
+
+    if tipo.startswith("datetime64"):
+        if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+            return serie.astype(tipo)
+        return serie
+
+    return serie.astype(tipo)
+
+
+def aplicar_esquema(df, esquema):
+    """Converte as colunas de ``df`` presentes no esquema (no próprio DataFrame)."""
+    for coluna, tipo in (esquema or {}).items():
+        if coluna in df.columns:
+            df[coluna] = _converter(df[coluna], tipo)
+    return df
+
+
+def _filtro_parquet(campos, filtros):
+    """``{coluna: valor ou lista}`` como expressão do ``pyarrow`` (valores no tipo da coluna)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    expressao = None
+    for coluna, valores in filtros.items():
+        if coluna not in campos.names:
+            raise ValueError(f"Coluna '{coluna}' não existe no Parquet")
+        if not isinstance(valores, (list, tuple, set, frozenset, np.ndarray, pd.Index, pd.Series)):
+            valores = [valores]
+        tipo = campos.field(coluna).type
+        if pa.types.is_dictionary(tipo):
+            tipo = tipo.value_type
+        condicao = pc.field(coluna).isin(pa.array(list(valores)).cast(tipo))
+        expressao = condicao if expressao is None else expressao & condicao
+    return expressao
+
+
+def ler_parquet(caminho, esquema=None, colunas=None, filtros=None):
+    """``pd.read_parquet`` com as colunas categóricas do esquema lidas como dicionário.
+
+    ``filtros`` (``{coluna: valor ou lista}``) vão para o leitor: os grupos de
+    linhas sem nenhum valor pedido nem são lidos, e só as linhas que passam
+    chegam ao pandas.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    categoricas = set(colunas_categoricas(esquema))
+    campos = pq.read_schema(caminho)
+    dicionario = [
+        campo.name for campo in campos
+        if campo.name in categoricas and (pa.types.is_string(campo.type) or pa.types.is_large_string(campo.type))
+    ]
+    tabela = pq.read_table(
+        caminho, columns=colunas, read_dictionary=dicionario or None, partitioning=None,
+        filters=_filtro_parquet(campos, filtros) if filtros else None,
+    )
+    return aplicar_esquema(tabela.to_pandas(), esquema)
+
+
+def concatenar_categorias(a, b, separador=" "):
+    """``a + separador + b`` para colunas (categóricas ou não) com poucos pares distintos.
+
+    O texto é montado uma vez por par distinto e o resultado volta como
+    categoria; pares com algum lado nulo ficam nulos.
+    """
+    codigos_a, valores_a = pd.factorize(a)
+    codigos_b, valores_b = pd.factorize(b)
+    pares = codigos_a.astype(np.int64) * (len(valores_b) + 1) + codigos_b
+    codigos_par, pares_distintos = pd.factorize(pares)
+
+    qa, qb = np.divmod(pares_distintos, len(valores_b) + 1)
+    textos = [
+        f"{valores_a[i]}{separador}{valores_b[j]}" if i >= 0 and j >= 0 else None
+        for i, j in zip(qa, qb)
+    ]
+    codigos_texto, categorias = pd.factorize(pd.Series(textos, dtype=object))
+    resultado = pd.Categorical.from_codes(codigos_texto[codigos_par], categories=categorias)
+    return _categorias_em_ordem(pd.Series(resultado, index=getattr(a, "index", None)))
+
+
+def transformar_categorias(serie, funcao):
+    """``funcao`` (sobre uma Series de texto) aplicada uma vez por categoria.
+
+    Equivale a ``funcao(serie.astype(str))`` mantendo o resultado categórico;
+    categorias que passam a coincidir (ex.: ``"pe "`` e ``"PE"``) são unidas.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype(CATEGORIA)
+    if serie.isna().any():  # como no astype(str), nulo vira "nan"
+        if "nan" not in serie.cat.categories:
+            serie = serie.cat.add_categories("nan")
+        serie = serie.fillna("nan")
+    novas = funcao(pd.Series(serie.cat.categories.astype(str), dtype=object))
+    codigos_novos, categorias = pd.factorize(novas)
+    resultado = pd.Categorical.from_codes(codigos_novos[serie.cat.codes.to_numpy()], categories=categorias)
+    return _categorias_em_ordem(pd.Series(resultado, index=serie.index, name=serie.name))
+
+
+# ---------- Relatório de memória ----------
+
+def _bytes_sem_esquema(df):
+    """Bytes de ``df`` como viria do Parquet sem o esquema (textos como object, ids int64).
+
+    Calculado do próprio DataFrame, sem ler o arquivo de novo: uma coluna
+    categórica custa o ponteiro de cada linha mais o tamanho da sua string.
+    """
+    total = 0
+    for _, serie in df.items():
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            # Tamanho de uma string recém-lida (sem o cache UTF-8 que a categoria pode ter ganhado)
+            tamanhos = np.array(
+                [sys.getsizeof(c.encode("utf-8").decode("utf-8") if isinstance(c, str) else c)
+                 for c in serie.cat.categories] + [sys.getsizeof(None)],
+                dtype=np.int64,
+            )
+            total += 8 * len(serie) + int(tamanhos[serie.cat.codes.to_numpy()].sum())  # código -1 (nulo) -> None
+        elif pd.api.types.is_integer_dtype(serie.dtype) and serie.dtype.itemsize < 8:
+            total += 8 * len(serie)
+        else:
+            total += int(serie.memory_usage(deep=True, index=False))
+    return total
+
+
+def registrar_memoria(nome, df, arquivos=()):
+    """Guarda linhas e bytes de ``df`` carregado de ``arquivos`` (Parquet), sem e com o esquema."""
+    medicao = {
+        "linhas": len(df),
+        "colunas": df.shape[1],
+        "bytes_esquema": int(df.memory_usage(deep=True, index=False).sum()),
+        "bytes_sem_esquema": _bytes_sem_esquema(df),
+        "bytes_disco": sum(os.path.getsize(a) for a in arquivos),
+    }
+    with _trava:
+        _medicoes[nome] = medicao
+
+
+def relatorio_memoria():
+    """Uma linha por tabela carregada: linhas, bytes no disco, sem e com o esquema e a economia."""
+    with _trava:
+        medicoes = dict(_medicoes)
+    linhas = []
+    for nome, medicao in medicoes.items():
+        linhas.append({
+            "tabela": nome,
+            "linhas": medicao["linhas"],
+            "colunas": medicao["colunas"],
+            "MB no disco": medicao["bytes_disco"] / 1024 ** 2,
+            "MB sem esquema": medicao["bytes_sem_esquema"] / 1024 ** 2,
+            "MB com esquema": medicao["bytes_esquema"] / 1024 ** 2,
+        })
+    relatorio = pd.DataFrame(
+        linhas, columns=["tabela", "linhas", "colunas", "MB no disco", "MB sem esquema", "MB com esquema"]
+    )
+    relatorio["economia %"] = (1 - relatorio["MB com esquema"] / relatorio["MB sem esquema"]) * 100
+    return relatorio
+
+
+def debug_ativo():
+    if os.environ.get("DEBUG_DASHBOARDS", "").strip() not in ("", "0"):
+        return True
+    import streamlit as st
+
+    try:
+        return st.query_params.get("debug", "0") not in ("", "0")
+    except Exception:  # fora de uma sessão do Streamlit
+        return False
+
+
+def exibir_relatorio_memoria():
+    """Painel na barra lateral com a memória das tabelas carregadas (modo debug)."""
+    if not debug_ativo():
+        return
+    import streamlit as st
+
+    with st.sidebar.expander("🧮 Memória dos dados (debug)"):
+        relatorio = relatorio_memoria()
+        if relatorio.empty:
+            st.caption("Nenhuma tabela carregada por este processo.")
+            return
+        st.dataframe(
+            relatorio.round(2),
+            hide_index=True,
+            use_container_width=True,
+        )
+        total_antes, total_depois = relatorio["MB sem esquema"].sum(), relatorio["MB com esquema"].sum()
+        st.caption(f"Total: {total_antes:.1f} MB sem esquema → {total_depois:.1f} MB com esquema")
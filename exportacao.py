@@ -0,0 +1,182 @@
+"""Exportações sob demanda (CSV, Parquet e XLSX) gravadas em blocos.
+
+``st.download_button(data=df.to_csv().encode())`` serializa o arquivo
+inteiro em todo rerun, mesmo que ninguém baixe nada, e mantém na memória o
+texto e os bytes ao mesmo tempo. Aqui o arquivo só é gerado quando o
+usuário pede ("Preparar arquivo"): o DataFrame é obtido por uma função (que
+também só roda nessa hora) e gravado em um arquivo temporário, bloco a
+bloco:
+
+- CSV: ``to_csv`` de cada bloco anexado ao arquivo;
+- Parquet: um row group por bloco com ``pyarrow.parquet.ParquetWriter``;
+- XLSX: XlsxWriter em modo ``constant_memory``, que descarrega cada linha no
+  disco assim que é escrita.
+
+O arquivo pronto fica associado à sessão (``st.session_state``) e à
+assinatura dos filtros que o geraram; mudou o filtro, o arquivo antigo é
+descartado. Depois do download o arquivo temporário é apagado. Sessões
+fechadas antes do download deixam o arquivo para trás: antes de gerar um
+novo, os arquivos com mais de ``VALIDADE_EXPORTACAO`` segundos são apagados.
+
+Uso::
+
+    botao_exportacao("acessos", lambda: df_filtrado, "acessos_filtrados",
+                     assinatura=(cursos, status, periodo))
+"""
+
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+TAMANHO_BLOCO = 50_000
+LIMITE_LINHAS_XLSX = 1_048_576
+DIRETORIO_EXPORTACOES = Path(os.environ.get("DIRETORIO_EXPORTACOES", Path(tempfile.gettempdir()) / "exportacoes_dashboards"))
+VALIDADE_EXPORTACAO = int(os.environ.get("VALIDADE_EXPORTACAO", 3600))
+
+
+def _blocos(df, tamanho_bloco):
+    for inicio in range(0, len(df), tamanho_bloco):
+        yield df.iloc[inicio:inicio + tamanho_bloco]
+
+
+def gravar_csv(df, destino, tamanho_bloco=TAMANHO_BLOCO):
+    with open(destino, "w", encoding="utf-8", newline="") as f:
+        df.head(0).to_csv(f, index=False)
+        for bloco in _blocos(df, tamanho_bloco):
+            bloco.to_csv(f, index=False, header=False)
+
+
+def gravar_parquet(df, destino, tamanho_bloco=TAMANHO_BLOCO):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # Esquema do DataFrame inteiro: um bloco só de nulos não pode mudar o tipo da coluna
+    esquema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        for bloco in _blocos(df, tamanho_bloco):
+            escritor.write_table(pa.Table.from_pandas(bloco, schema=esquema, preserve_index=False))
+
+
+def gravar_xlsx(df, destino, tamanho_bloco=TAMANHO_BLOCO, aba="Dados"):
+    import xlsxwriter
+
+    if len(df) >= LIMITE_LINHAS_XLSX:
+        raise ValueError(
+            f"{len(df)} linhas não cabem em uma planilha do Excel (máximo {LIMITE_LINHAS_XLSX - 1}); "
+            "exporte em CSV ou Parquet."
+        )
+    livro = xlsxwriter.Workbook(destino, {
+        "constant_memory": True,
+        "default_date_format": "dd/mm/yyyy hh:mm:ss",
+        "remove_timezone": True,
+    })
+    try:
+        planilha = livro.add_worksheet(aba)
+        planilha.write_row(0, 0, [str(c) for c in df.columns])
+        linha = 1
+        for bloco in _blocos(df, tamanho_bloco):
+            valores = bloco.astype(object).where(bloco.notna(), None)
+            for registro in valores.itertuples(index=False, name=None):
+                planilha.write_row(linha, 0, registro)
+                linha += 1
+    finally:
+        livro.close()
+
+
+FORMATOS = {
+    "CSV": (".csv", "text/csv", gravar_csv),
+    "Parquet": (".parquet", "application/vnd.apache.parquet", gravar_parquet),
+    "Excel (XLSX)": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", gravar_xlsx),
+}
+
+
+def formato_do_arquivo(caminho):
+    """Chave de ``FORMATOS`` correspondente à extensão de ``caminho``."""
+    extensao = Path(caminho).suffix.lower()
+    for formato, (extensao_formato, _, _) in FORMATOS.items():
+        if extensao == extensao_formato:
+            return formato
+    raise ValueError(f"Extensão '{extensao}' não suportada; use uma de: {', '.join(e for e, _, _ in FORMATOS.values())}")
+
+
+def exportar(df, destino, formato="CSV", tamanho_bloco=TAMANHO_BLOCO):
+    """Grava ``df`` em ``destino`` no ``formato`` pedido (uma das chaves de ``FORMATOS``)."""
+    _, _, gravar = FORMATOS[formato]
+    gravar(df, destino, tamanho_bloco)
+    return destino
+
+
+def _descartar(chave):
+    pronto = st.session_state.pop(f"_exportacao_{chave}", None)
+    if pronto is not None:
+        Path(pronto["caminho"]).unlink(missing_ok=True)
+
+
+def _apagar_vencidos(diretorio=DIRETORIO_EXPORTACOES, validade=VALIDADE_EXPORTACAO):
+    """Apaga os arquivos gerados há mais de ``validade`` segundos."""
+    limite = time.time() - validade
+    for arquivo in diretorio.glob("*"):
+        try:
+            if arquivo.is_file() and arquivo.stat().st_mtime < limite:
+                arquivo.unlink()
+        except FileNotFoundError:  # outra sessão apagou antes
+            pass
+
+
+def botao_exportacao(chave, obter_df, nome_arquivo, rotulo="Exportar", assinatura=None, formatos=tuple(FORMATOS)):
+    """Escolha do formato, botão "Preparar arquivo" e, com o arquivo pronto, o download.
+
+    ``obter_df`` só é chamada quando o usuário pede o arquivo; ``assinatura``
+    identifica o recorte exportado (filtros) e invalida um arquivo antigo.
+    """
+    estado = f"_exportacao_{chave}"
+    pronto = st.session_state.get(estado)
+    if pronto is not None and not Path(pronto["caminho"]).exists():  # vencido
+        st.session_state.pop(estado)
+        pronto = None
+    if pronto is not None and pronto["assinatura"] != repr(assinatura):
+        _descartar(chave)
+        pronto = None
+
+    formato = st.selectbox(f"{rotulo} — formato", formatos, key=f"{chave}_formato")
+    if pronto is not None and pronto["formato"] != formato:
+        _descartar(chave)
+        pronto = None
+
+    if pronto is None:
+        if st.button(f"⚙️ Preparar arquivo ({formato})", key=f"{chave}_preparar"):
+            extensao, mime, _ = FORMATOS[formato]
+            DIRETORIO_EXPORTACOES.mkdir(parents=True, exist_ok=True)
+            _apagar_vencidos()
+            caminho = DIRETORIO_EXPORTACOES / f"{chave}-{uuid.uuid4().hex}{extensao}"
+            try:
+                with st.spinner("Gerando arquivo..."):
+                    exportar(obter_df(), caminho, formato)
+            except ValueError as e:
+                Path(caminho).unlink(missing_ok=True)
+                st.error(f"❌ {e}")
+                return
+            pronto = {
+                "caminho": str(caminho),
+                "formato": formato,
+                "mime": mime,
+                "nome": f"{nome_arquivo}{extensao}",
+                "assinatura": repr(assinatura),
+            }
+            st.session_state[estado] = pronto
+
+    if pronto is not None:
+        with open(pronto["caminho"], "rb") as arquivo:
+            st.download_button(
+                label=f"📥 Baixar {pronto['nome']}",
+                data=arquivo,
+                file_name=pronto["nome"],
+                mime=pronto["mime"],
+                key=f"{chave}_baixar",
+                on_click=_descartar,
+                args=(chave,),
+            )
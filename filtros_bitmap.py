@@ -0,0 +1,89 @@
+"""Índice de bitmaps para os filtros da barra lateral.
+
+Na carga dos dados, cada valor distinto das colunas filtráveis ganha um
+bitmap compactado (``np.packbits``: 1 bit por linha) com as linhas em que
+aparece. Uma seleção é um OU entre os bitmaps dos valores escolhidos de uma
+coluna e um E entre colunas, feitos sobre ``uint8`` com n/8 bytes — sem
+``isin`` sobre o DataFrame a cada rerun. Colunas sem filtro (``None``) ou com
+todos os valores selecionados não custam nada.
+
+Uso::
+
+    indice = IndiceBitmap(df, ['estado', 'cidade', 'acesso'])
+    df_filtrado = df[indice.mascara(estado=['PE', 'CE'], acesso=None)]
+"""
+
+import numpy as np
+import pandas as pd
+
+# Quantidade de bits 1 em cada byte, para contar linhas sem descompactar
+_BITS_POR_BYTE = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+class IndiceBitmap:
+    def __init__(self, df, colunas):
+        self.linhas = len(df)
+        self.com_nulos = {}
+        self.bitmaps = {coluna: self._indexar(coluna, df[coluna]) for coluna in colunas}
+
+    def _indexar(self, coluna, serie):
+        codigos, valores = pd.factorize(serie)
+        # Linhas nulas não entram em nenhum bitmap
+        self.com_nulos[coluna] = bool((codigos < 0).any())
+        ordem = np.argsort(codigos, kind="stable")
+        limites = np.searchsorted(codigos[ordem], np.arange(len(valores) + 1))
+        bitmaps = {}
+        presentes = np.zeros(self.linhas, dtype=bool)
+        for i, valor in enumerate(valores):
+            linhas = ordem[limites[i]:limites[i + 1]]
+            presentes[linhas] = True
+            bitmaps[valor] = np.packbits(presentes)
+            presentes[linhas] = False
+        return bitmaps
+
+    def __len__(self):
+        return self.linhas
+
+    def valores(self, coluna):
+        """Valores distintos (não nulos) indexados em ``coluna``."""
+        return list(self.bitmaps[coluna])
+
+    def _bitmap_coluna(self, coluna, selecionados):
+        bitmaps = self.bitmaps[coluna]
+        escolhidos = [bitmaps[v] for v in dict.fromkeys(selecionados) if v in bitmaps]
+        if len(escolhidos) == len(bitmaps) and not self.com_nulos[coluna]:
+            return None  # tudo selecionado: não restringe
+        if not escolhidos:
+            return np.zeros((self.linhas + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce(escolhidos) if len(escolhidos) > 1 else escolhidos[0]
+
+    @staticmethod
+    def _contar_bits(bitmap):
+        return int(_BITS_POR_BYTE[bitmap].sum())
+
+    def bitmap(self, **selecoes):
+        """Bitmap compactado da seleção, ou ``None`` se nenhuma coluna restringe.
+
+        ``None`` em uma coluna = sem filtro; lista vazia = nenhuma linha passa.
+        """
+        resultado = None
+        for coluna, selecionados in selecoes.items():
+            if selecionados is None:
+                continue
+            parcial = self._bitmap_coluna(coluna, selecionados)
+            if parcial is None:
+                continue
+            resultado = parcial.copy() if resultado is None else np.bitwise_and(resultado, parcial, out=resultado)
+        return resultado
+
+    def mascara(self, **selecoes):
+        """Máscara booleana (uma posição por linha) da seleção."""
+        bits = self.bitmap(**selecoes)
+        if bits is None:
+            return np.ones(self.linhas, dtype=bool)
+        return np.unpackbits(bits, count=self.linhas).view(bool)
+
+    def contar(self, **selecoes):
+        """Quantidade de linhas que passam na seleção."""
+        bits = self.bitmap(**selecoes)
+        return self.linhas if bits is None else self._contar_bits(bits)
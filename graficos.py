@@ -0,0 +1,54 @@
+"""Bibliotecas de gráficos importadas só quando uma visão desenha um gráfico.
+
+Importar ``matplotlib.pyplot`` custa ~0,6 s, ``seaborn`` ~1,3 s (traz o
+scipy junto) e ``plotly.express`` ~0,15 s. No topo dos scripts, esse tempo
+vinha antes do primeiro elemento da página em todo processo novo, mesmo
+quando a tela inicial não tinha gráfico ou quando as figuras saíam prontas
+do ``cache_figuras``. Aqui cada biblioteca é importada na primeira chamada;
+depois ela fica em ``sys.modules`` e chamar de novo a cada desenho custa só
+uma consulta ao dicionário.
+
+Uso::
+
+    def desenhar():
+        plt = pyplot()
+        fig, ax = plt.subplots()
+        ...
+"""
+
+from contextlib import contextmanager
+
+
+def pyplot():
+    """``matplotlib.pyplot``."""
+    import matplotlib.pyplot as plt
+
+    return plt
+
+
+def seaborn():
+    """``(pyplot, seaborn)``."""
+    import seaborn as sns
+
+    return pyplot(), sns
+
+
+@contextmanager
+def tema_seaborn():
+    """Tema seaborn (``seaborn-v0_8`` + ``whitegrid``) só enquanto a figura é desenhada e salva.
+
+    O tema mexe nos ``rcParams``, que são globais do processo: aplicado de
+    vez, valeria também para as figuras das outras páginas do app.
+    """
+    plt, sns = seaborn()
+    with plt.rc_context():
+        plt.style.use('seaborn-v0_8')
+        sns.set_theme(style="whitegrid")
+        yield
+
+
+def plotly_express():
+    """``plotly.express``."""
+    import plotly.express as px
+
+    return px
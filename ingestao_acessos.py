@@ -0,0 +1,257 @@
+"""Ingestão incremental do log de acessos do Moodle em um armazenamento Parquet.
+
+Substitui o notebook ``tratar_dados_acessos.ipynb``, que relia o histórico
+inteiro e sobrescrevia a própria planilha de origem. Aqui a exportação
+(``.xlsx``, ``.csv`` ou ``.parquet``) é lida em blocos de tamanho fixo; de
+cada bloco ficam só os cursos [NF] e as linhas a partir da marca d'água
+(maior ``access_time`` já ingerido). As linhas novas são anexadas a um
+diretório particionado por mês::
+
+    dados_store/acessos/
+        _manifesto.json
+        ano_mes=2025-04/parte-<lote>-00000.parquet
+        ...
+
+Ao fim de cada ingestão, os meses que receberam linhas são compactados em
+um único arquivo sem duplicatas de (user_id, course_name, access_time). A
+memória fica limitada ao tamanho do bloco e de um mês de acessos, qualquer
+que seja o tamanho do log. A planilha de origem nunca é alterada.
+
+Uso (a partir da raiz do repositório)::
+
+    python ingestao_acessos.py dados_acessos.xlsx [--store dados_store/acessos] [--bloco 100000]
+
+Nos dashboards::
+
+    from ingestao_acessos import ler_acessos
+    df = ler_acessos()
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from esquemas import ESQUEMA_ACESSOS, ler_parquet, registrar_memoria
+
+DIRETORIO_STORE = os.environ.get("STORE_ACESSOS", "dados_store/acessos")
+MANIFESTO = "_manifesto.json"
+PARTICAO = "ano_mes"
+
+PREFIXOS_CURSOS = ('[NFPE', '[NFPI', '[NFMA', '[NFCE')
+COLUNAS = ['user_id', 'firstname', 'lastname', 'course_name', 'access_time']
+CHAVE = ['user_id', 'course_name', 'access_time']
+TAMANHO_BLOCO = 100_000
+
+
+# ---------- Leitura da exportação em blocos ----------
+
+def _blocos_xlsx(caminho, tamanho):
+    import openpyxl
+
+    livro = openpyxl.load_workbook(caminho, read_only=True)
+    try:
+        linhas = livro.active.iter_rows(values_only=True)
+        cabecalho = [str(c) for c in next(linhas)]
+        bloco = []
+        for linha in linhas:
+            bloco.append(linha)
+            if len(bloco) == tamanho:
+                yield pd.DataFrame(bloco, columns=cabecalho)
+                bloco = []
+        if bloco:
+            yield pd.DataFrame(bloco, columns=cabecalho)
+    finally:
+        livro.close()
+
+
+def _blocos_parquet(caminho, tamanho):
+    import pyarrow.parquet as pq
+
+    for lote in pq.ParquetFile(caminho).iter_batches(batch_size=tamanho):
+        yield lote.to_pandas()
+
+
+def ler_em_blocos(caminho, tamanho=TAMANHO_BLOCO):
+    """DataFrames de no máximo ``tamanho`` linhas lidos da exportação."""
+    sufixo = Path(caminho).suffix.lower()
+    if sufixo in (".xlsx", ".xlsm"):
+        return _blocos_xlsx(caminho, tamanho)
+    if sufixo == ".csv":
+        return pd.read_csv(caminho, chunksize=tamanho)
+    if sufixo == ".parquet":
+        return _blocos_parquet(caminho, tamanho)
+    raise ValueError(f"Formato de exportação não suportado: {caminho}")
+
+
+def preparar_bloco(bloco, marca_dagua=None):
+    """Cursos [NF] com ``access_time`` a partir da marca d'água, já tipados."""
+    faltantes = [c for c in COLUNAS if c not in bloco.columns]
+    if faltantes:
+        raise ValueError(f"Colunas faltantes na exportação: {', '.join(faltantes)}")
+
+    # Prefixo testado uma vez por curso distinto, não por linha
+    cursos = bloco['course_name'].astype('category')
+    nf = cursos.cat.categories.astype(str).str.startswith(PREFIXOS_CURSOS)
+    codigos = cursos.cat.codes.to_numpy()
+    bloco = bloco.loc[(codigos >= 0) & nf[codigos], COLUNAS]
+
+    texto = {c: bloco[c].where(bloco[c].isna(), bloco[c].astype(str)).astype(object)
+             for c in ('firstname', 'lastname', 'course_name')}
+    bloco = bloco.assign(
+        user_id=pd.to_numeric(bloco['user_id'], errors='coerce').astype('Int64'),
+        access_time=pd.to_datetime(bloco['access_time'], errors='coerce').astype('datetime64[ns]'),
+        **texto,
+    ).dropna(subset=CHAVE)
+
+    # ">=": acessos no mesmo segundo da marca podem ter ficado de fora da carga anterior;
+    # os que já estavam no armazenamento somem na compactação
+    if marca_dagua is not None:
+        bloco = bloco[bloco['access_time'] >= marca_dagua]
+    return bloco.drop_duplicates(CHAVE)
+
+
+# ---------- Armazenamento particionado ----------
+
+def ler_manifesto(store=DIRETORIO_STORE):
+    try:
+        with open(Path(store) / MANIFESTO, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {"marca_dagua": None, "linhas": 0, "cargas": []}
+
+
+def _gravar_manifesto(store, manifesto):
+    destino = Path(store) / MANIFESTO
+    temporario = destino.with_name(f"{destino.name}.{uuid.uuid4().hex}.tmp")
+    with open(temporario, "w", encoding="utf-8") as f:
+        json.dump(manifesto, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, destino)
+
+
+def _compactar_particao(pasta):
+    """Junta as partes de um mês em um arquivo só, sem duplicatas. Devolve as linhas."""
+    partes = sorted(pasta.glob("*.parquet"))
+    df = (
+        pd.concat([pd.read_parquet(p) for p in partes], ignore_index=True)
+        .drop_duplicates(CHAVE)
+        .sort_values(['access_time', 'user_id'], kind='stable')
+    )
+    temporario = pasta / f".compactado-{uuid.uuid4().hex}.tmp"
+    df.to_parquet(temporario, index=False)
+    destino = pasta / "dados.parquet"
+    os.replace(temporario, destino)
+    for parte in partes:
+        if parte != destino:
+            parte.unlink()
+    return len(df)
+
+
+def ingerir(origem, store=DIRETORIO_STORE, tamanho_bloco=TAMANHO_BLOCO):
+    """Anexa ao armazenamento as linhas de ``origem`` mais novas que a marca d'água.
+
+    Devolve um resumo da carga (linhas lidas, linhas novas, nova marca d'água).
+    """
+    store = Path(store)
+    store.mkdir(parents=True, exist_ok=True)
+    manifesto = ler_manifesto(store)
+    marca = pd.Timestamp(manifesto["marca_dagua"]) if manifesto["marca_dagua"] else None
+
+    lote = time.strftime("%Y%m%d%H%M%S") + "-" + uuid.uuid4().hex[:6]
+    lidas = 0
+    nova_marca = marca
+    meses_tocados = set()
+
+    for i, bloco in enumerate(ler_em_blocos(origem, tamanho_bloco)):
+        lidas += len(bloco)
+        bloco = preparar_bloco(bloco, marca)
+        if bloco.empty:
+            continue
+        maior = bloco['access_time'].max()
+        nova_marca = maior if nova_marca is None else max(nova_marca, maior)
+
+        meses = bloco['access_time'].to_numpy().astype('datetime64[M]')
+        for mes, parte in bloco.groupby(meses, sort=False):
+            mes = str(mes)[:7]
+            pasta = store / f"{PARTICAO}={mes}"
+            pasta.mkdir(exist_ok=True)
+            parte.to_parquet(pasta / f"parte-{lote}-{i:05d}.parquet", index=False)
+            meses_tocados.add(mes)
+
+    linhas_antes = manifesto["linhas"]
+    linhas_por_mes = manifesto.setdefault("linhas_por_mes", {})
+    for mes in sorted(meses_tocados):
+        linhas_por_mes[mes] = _compactar_particao(store / f"{PARTICAO}={mes}")
+
+    manifesto["linhas"] = sum(linhas_por_mes.values())
+    manifesto["marca_dagua"] = nova_marca.isoformat() if nova_marca is not None else None
+    resumo = {
+        "lote": lote,
+        "origem": str(origem),
+        "linhas_lidas": lidas,
+        "linhas_novas": manifesto["linhas"] - linhas_antes,
+        "marca_dagua": manifesto["marca_dagua"],
+    }
+    manifesto["cargas"].append(resumo)
+    _gravar_manifesto(store, manifesto)
+    return resumo
+
+
+def versao_store(store=DIRETORIO_STORE):
+    """Identificador do conteúdo atual do armazenamento (muda a cada carga com linhas novas)."""
+    manifesto = ler_manifesto(store)
+    return f"{manifesto['marca_dagua']}:{manifesto['linhas']}"
+
+
+def ler_acessos(store=DIRETORIO_STORE, colunas=None):
+    """Acessos ingeridos, com as colunas da exportação original e os tipos de ``ESQUEMA_ACESSOS``."""
+    pastas = sorted(Path(store).glob(f"{PARTICAO}=*"))
+    if not pastas:
+        raise FileNotFoundError(
+            f"Nenhum acesso ingerido em '{store}'. Rode: python ingestao_acessos.py <exportação>"
+        )
+    arquivos = [p / "dados.parquet" for p in pastas]
+    meses = [ler_parquet(a, ESQUEMA_ACESSOS, colunas) for a in arquivos]
+    # Cada mês tem o seu dicionário; com categorias diferentes o concat voltaria para texto
+    for coluna in meses[0].columns:
+        if all(isinstance(m[coluna].dtype, pd.CategoricalDtype) for m in meses):
+            categorias = union_categoricals([m[coluna] for m in meses], sort_categories=True).categories
+            for m in meses:
+                m[coluna] = m[coluna].cat.set_categories(categorias)
+    df = pd.concat(meses, ignore_index=True)
+    registrar_memoria(f"log de acessos [{store}]", df, arquivos)
+    return df
+
+
+def limpar(store=DIRETORIO_STORE):
+    """Apaga o armazenamento (a próxima carga reprocessa a exportação inteira)."""
+    shutil.rmtree(store, ignore_errors=True)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("origem", help="exportação do log de acessos (.xlsx, .csv ou .parquet)")
+    parser.add_argument("--store", default=DIRETORIO_STORE, help="diretório do armazenamento")
+    parser.add_argument("--bloco", type=int, default=TAMANHO_BLOCO, help="linhas por bloco de leitura")
+    parser.add_argument("--do-zero", action="store_true", help="apaga o armazenamento antes de ingerir")
+    args = parser.parse_args(argv)
+
+    if args.do_zero:
+        limpar(args.store)
+    inicio = time.perf_counter()
+    resumo = ingerir(args.origem, args.store, args.bloco)
+    print(
+        f"{resumo['linhas_lidas']} linhas lidas, {resumo['linhas_novas']} novas "
+        f"em {time.perf_counter() - inicio:.1f}s; marca d'água: {resumo['marca_dagua']}"
+    )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,78 @@
+"""Matriz de presença (aluno × dia de aula) compacta e vetorizada.
+
+A presença é guardada como uma matriz ``uint8`` (1 = presente, 0 = falta)
+montada em um único passo a partir dos acessos. Totais e frequências saem
+de reduções NumPy sobre a matriz; os emojis ✅/❌ só são gerados na hora de
+exibir ou exportar; na tela, ``mapa_presenca_booleano`` dispensa os emojis e
+deixa a formatação para o ``column_config`` do Streamlit.
+"""
+
+import numpy as np
+import pandas as pd
+
+PRESENTE = "✅"
+FALTA = "❌"
+
+
+def montar_matriz_presenca(df, coluna_aluno="nome_aluno", coluna_dia="data_acesso"):
+    """Retorna ``(alunos, dias, matriz)``.
+
+    ``alunos`` e ``dias`` vêm ordenados; ``matriz[i, j]`` vale 1 se o aluno
+    ``i`` acessou no dia ``j``. Os dias de aula são os dias em que houve ao
+    menos um acesso no recorte recebido.
+    """
+    validos = df[coluna_aluno].notna() & df[coluna_dia].notna()
+    codigos_aluno, alunos = pd.factorize(df.loc[validos, coluna_aluno], sort=True)
+    codigos_dia, dias = pd.factorize(df.loc[validos, coluna_dia], sort=True)
+
+    matriz = np.zeros((len(alunos), len(dias)), dtype=np.uint8)
+    matriz[codigos_aluno, codigos_dia] = 1
+    return alunos, dias, matriz
+
+
+def totais_por_aluno(matriz):
+    """Presenças, faltas e frequência (%) de cada aluno."""
+    presencas = matriz.sum(axis=1, dtype=np.int64)
+    faltas = matriz.shape[1] - presencas
+    frequencia = presencas / max(matriz.shape[1], 1) * 100
+    return presencas, faltas, frequencia
+
+
+def percentual_por_dia(matriz):
+    """Presenças e % de alunos presentes em cada dia de aula."""
+    presencas = matriz.sum(axis=0, dtype=np.int64)
+    percentual = np.round(presencas / max(matriz.shape[0], 1) * 100, 1)
+    return presencas, percentual
+
+
+def formatar_dias(dias):
+    return [dia.strftime('%d/%m/%Y') for dia in dias]
+
+
+def formatar_mapa_presenca(alunos, dias, matriz):
+    """Mapa de presença para exibição: ✅/❌ por dia, totais e frequência."""
+    presencas, faltas, frequencia = totais_por_aluno(matriz)
+    mapa = pd.DataFrame(
+        np.where(matriz.astype(bool), PRESENTE, FALTA),
+        index=alunos,
+        columns=formatar_dias(dias),
+    )
+    mapa['Total ✅'] = presencas
+    mapa['Total ❌'] = faltas
+    mapa['Frequência'] = [f"{f:.1f}%" for f in frequencia]
+    return mapa
+
+
+def mapa_presenca_booleano(alunos, dias, matriz):
+    """Mapa de presença para ``st.column_config``: um bool por dia, totais e frequência numérica.
+
+    As cores ficam por conta das colunas (checkbox, barra de progresso), sem
+    texto nem estilo por célula.
+    """
+    presencas, faltas, frequencia = totais_por_aluno(matriz)
+    mapa = pd.DataFrame(matriz.astype(bool), columns=formatar_dias(dias))
+    mapa.insert(0, 'Aluno', np.asarray(alunos))
+    mapa['Total ✅'] = presencas
+    mapa['Total ❌'] = faltas
+    mapa['Frequência'] = frequencia
+    return mapa
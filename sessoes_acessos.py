@@ -0,0 +1,124 @@
+"""Sessões de uso a partir do log de acessos do Moodle.
+
+Uma sessão é uma sequência de acessos do mesmo aluno, no mesmo curso, sem
+intervalo de inatividade maior que ``intervalo`` (30 minutos por padrão)
+entre dois acessos seguidos. O log é ordenado por (user_id, curso,
+access_time) com um único ``argsort`` sobre uma chave inteira composta, e as
+quebras de sessão saem de ``np.diff``: troca de aluno, troca de curso ou
+intervalo acima do limite. Não há loop em Python por linha nem groupby
+sobre o log; dezenas de milhões de acessos levam segundos.
+
+A tabela de sessões tem uma linha por sessão (``user_id``, ``course_name``,
+``inicio``, ``fim``, ``duracao_s``, ``cliques``, ``data``). A duração é o
+tempo entre o primeiro e o último acesso da sessão: uma sessão de um único
+clique dura zero. Dela saem o tempo na plataforma por aluno e curso
+(``tempo_por_aluno``) e por aluno, curso e dia (``tempo_por_dia``).
+
+Uso::
+
+    from sessoes_acessos import montar_sessoes, tempo_por_aluno
+    sessoes = montar_sessoes(ler_acessos())
+    tempo = tempo_por_aluno(sessoes)
+"""
+
+import numpy as np
+import pandas as pd
+
+INTERVALO_INATIVIDADE = pd.Timedelta(minutes=30)
+
+COLUNAS_SESSOES = ['user_id', 'course_name', 'inicio', 'fim', 'duracao_s', 'cliques', 'data']
+
+
+def _ja_ordenado(usuarios, cursos, instantes):
+    if not np.all(usuarios[1:] >= usuarios[:-1]):
+        return False
+    mesmo_usuario = usuarios[1:] == usuarios[:-1]
+    if not np.all((cursos[1:] >= cursos[:-1]) | ~mesmo_usuario):
+        return False
+    mesmo_grupo = mesmo_usuario & (cursos[1:] == cursos[:-1])
+    return bool(np.all((instantes[1:] >= instantes[:-1]) | ~mesmo_grupo))
+
+
+def _ordem(usuarios, cursos, instantes):
+    """Posições em ordem (usuário, curso, segundo); ``None`` se o log já estiver ordenado.
+
+    Usuário, curso e segundo do acesso cabem juntos em um único ``int64``, e um
+    ``argsort`` dele custa bem menos que um ``lexsort`` de três chaves. Acessos
+    no mesmo segundo podem ficar em qualquer ordem entre si: o intervalo entre
+    acessos fica com precisão de um segundo, o mesmo do log do Moodle. Se a
+    chave não couber em 63 bits, usa ``lexsort``.
+    """
+    if _ja_ordenado(usuarios, cursos, instantes):
+        return None
+    usuarios = usuarios.astype(np.int64) - usuarios.min()
+    n_cursos = int(cursos.max()) + 1
+    segundos = (instantes - instantes.min()) // 1_000_000_000
+    bits_segundos = int(segundos.max()).bit_length()
+    maior_grupo = int(usuarios.max()) * n_cursos + n_cursos - 1
+    if maior_grupo.bit_length() + bits_segundos > 63:
+        return np.lexsort((instantes, cursos, usuarios))
+    chave = ((usuarios * n_cursos + cursos) << bits_segundos) | segundos
+    return np.argsort(chave)
+
+
+def montar_sessoes(df, intervalo=INTERVALO_INATIVIDADE):
+    """Uma linha por sessão do log ``df`` (colunas ``user_id``, ``course_name``, ``access_time``).
+
+    Acessos sem ``user_id``, curso ou horário são descartados.
+    """
+    validos = df['user_id'].notna() & df['course_name'].notna() & df['access_time'].notna()
+    df = df.loc[validos, ['user_id', 'course_name', 'access_time']]
+
+    usuarios = df['user_id'].to_numpy()
+    cursos = df['course_name'].astype('category')
+    codigos_curso = cursos.cat.codes.to_numpy()
+    instantes = df['access_time'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+    ordem = _ordem(usuarios, codigos_curso, instantes)
+    if ordem is not None:
+        usuarios, codigos_curso, instantes = usuarios[ordem], codigos_curso[ordem], instantes[ordem]
+
+    n = len(instantes)
+    nova_sessao = np.ones(n, dtype=bool)
+    nova_sessao[1:] = (
+        (usuarios[1:] != usuarios[:-1])
+        | (codigos_curso[1:] != codigos_curso[:-1])
+        | (np.diff(instantes) > pd.Timedelta(intervalo).value)
+    )
+    inicios = np.flatnonzero(nova_sessao)
+    cliques = np.diff(np.append(inicios, n))
+
+    # Mínimo e máximo por sessão: dentro do mesmo segundo a ordem não é garantida
+    primeiro = np.minimum.reduceat(instantes, inicios) if n else instantes[:0]
+    ultimo = np.maximum.reduceat(instantes, inicios) if n else instantes[:0]
+    inicio = primeiro.view('datetime64[ns]')
+    return pd.DataFrame({
+        'user_id': usuarios[inicios],
+        'course_name': pd.Categorical.from_codes(codigos_curso[inicios], dtype=cursos.dtype),
+        'inicio': inicio,
+        'fim': ultimo.view('datetime64[ns]'),
+        'duracao_s': ((ultimo - primeiro) // 1_000_000_000).astype(np.int32),
+        'cliques': cliques.astype(np.int32),
+        'data': inicio.astype('datetime64[D]').astype('datetime64[ns]'),
+    })
+
+
+def _resumir(sessoes, chaves):
+    resumo = sessoes.groupby(chaves, observed=True).agg(
+        sessoes=('cliques', 'size'),
+        cliques=('cliques', 'sum'),
+        tempo_s=('duracao_s', 'sum'),
+    )
+    resumo['tempo_min'] = resumo['tempo_s'] / 60
+    resumo['duracao_media_min'] = resumo['tempo_min'] / resumo['sessoes']
+    return resumo.drop(columns='tempo_s').reset_index()
+
+
+def tempo_por_aluno(sessoes):
+    """Sessões, cliques, tempo total e duração média (min) por aluno e curso."""
+    return _resumir(sessoes, ['user_id', 'course_name'])
+
+
+def tempo_por_dia(sessoes):
+    """Sessões, cliques, tempo total e duração média (min) por aluno, curso e dia."""
+    return _resumir(sessoes, ['user_id', 'course_name', 'data'])
@@ -1,22 +1,20 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 
-# Estilos
-plt.style.use('seaborn-v0_8')
-sns.set_theme(style="whitegrid")
+from atualizacao_dados import exibir_status_dados
+from cache_figuras import exibir_figura
+from conjuntos_dados import obter_conjunto
+from consultas_acessos import Filtros
+from esquemas import exibir_relatorio_memoria
+from graficos import pyplot, seaborn, tema_seaborn
+from tabela_paginada import exibir_tabela_paginada
 
 # Carregar dados
 try:
-    arquivo_excel = 'Acessos_tratado.xlsx'
-    df = pd.read_excel(arquivo_excel, sheet_name='Sheet1')
-    df.columns = ['nome', 'cidade', 'id_coorte', 'acesso', 'estado', 'ultimo_acesso']
-
-    # Normalização
-    df['estado'] = df['estado'].astype(str).str.upper().str.strip()
-    df['cidade'] = df['cidade'].astype(str).str.strip()
-    df['acesso'] = df['acesso'].astype(str).str.strip().str.lower()
+    # Backend de consultas e índice de busca montados em segundo plano (``conjuntos_dados``)
+    publicacao = obter_conjunto('acessos_tratado')
+    versao = publicacao.versao
+    df, consultas = publicacao.valor['df'], publicacao.valor['consultas']
 
     estados_validos = sorted(df['estado'].dropna().unique())
 
@@ -24,70 +22,37 @@ except Exception as e:
     st.error(f"Erro ao carregar dados: {e}")
     st.stop()
 
-# Sidebar - Filtros
-st.sidebar.title("🎛️ Filtros")
-estado_selecionado = st.sidebar.multiselect("Estado", options=estados_validos, placeholder="Selecione estados...")
-cidade_selecionada = st.sidebar.multiselect("Cidade", options=sorted(df['cidade'].dropna().unique()), placeholder="Selecione cidades...")
-status_acesso = st.sidebar.multiselect("Status de Acesso", options=sorted(df['acesso'].dropna().unique()), placeholder="Selecione status...")
-
-if st.sidebar.button("🔄 Limpar Filtros"):
-    estado_selecionado = []
-    cidade_selecionada = []
-    status_acesso = []
-
-# Campo de busca por nome
-st.sidebar.markdown("---")
-nome_busca = st.sidebar.text_input("🔍 Buscar Aluno por Nome", placeholder="Digite o nome...")
-
-# Menu lateral de navegação
-menu = st.sidebar.radio("📁 Navegação", [
-    "📌 Visão Geral", 
-    "🏙️ Por Cidade", 
-    "📈 Detalhado", 
-    "📚 Por Turma e Estado", 
-    "📉 Menores Acessos",
-    "👥 Alocação por Turma", 
-    "🔍 Buscar por Nome",
-    "📆 Acompanhamento por Turma"  
-])
-
-# Aplicar filtros
-filtro_estado = df['estado'].isin(estado_selecionado) if estado_selecionado else pd.Series([True] * len(df))
-filtro_cidade = df['cidade'].isin(cidade_selecionada) if cidade_selecionada else pd.Series([True] * len(df))
-filtro_acesso = df['acesso'].isin(status_acesso) if status_acesso else pd.Series([True] * len(df))
-
-# Dados filtrados
-df_filtrado = df[filtro_estado & filtro_cidade & filtro_acesso]
-
-# Título principal
-st.title("📊 Dashboard de Acessos")
-
-if df_filtrado.empty:
-    st.info("ℹ️ Selecione filtros para visualizar os dados")
-else:
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("Total de Registros", len(df_filtrado))
-    with col2:
-        st.metric("Estados", df_filtrado['estado'].nunique())
-    with col3:
-        st.metric("Cidades", df_filtrado['cidade'].nunique())
-
-    st.divider()
-
-    if menu == "📌 Visão Geral":
+exibir_relatorio_memoria()
+exibir_status_dados(['acessos_tratado'])
+
+# Visões do menu: cada uma é um fragmento, então interagir com os widgets de uma
+# visão reexecuta só ela, reaproveitando o backend de consultas e os filtros da
+# última execução completa
+@st.fragment
+def visao_geral(consultas, filtros, versao):
+    """Menu "📌 Visão Geral"."""
+    def desenhar_visao_geral():
+        plt, sns = seaborn()
+        contagem_estado = consultas.contagem(filtros, ['estado']).sort_values(ascending=False)
         fig, ax = plt.subplots(figsize=(10, 5))
-        sns.countplot(data=df_filtrado, y='estado', order=df_filtrado['estado'].value_counts().index, ax=ax)
+        sns.barplot(x=contagem_estado.values, y=contagem_estado.index, ax=ax)
         ax.set_title('Distribuição por Estado')
         ax.set_xlabel('Quantidade')
         ax.set_ylabel('Estado')
         for p in ax.patches:
             width = p.get_width()
             ax.text(width + 1, p.get_y() + p.get_height()/2, f'{int(width)}', ha='left', va='center')
-        st.pyplot(fig)
+        return fig
 
-    elif menu == "🏙️ Por Cidade":
-        top_cidades = df_filtrado['cidade'].value_counts().nlargest(10)
+    exibir_figura("visao_geral", desenhar_visao_geral, filtros=filtros, versao=versao, estilo=tema_seaborn)
+
+
+@st.fragment
+def visao_por_cidade(consultas, filtros, versao):
+    """Menu "🏙️ Por Cidade"."""
+    def desenhar_por_cidade():
+        plt, sns = seaborn()
+        top_cidades = consultas.contagem(filtros, ['cidade']).nlargest(10)
         fig, ax = plt.subplots(figsize=(10, 5))
         sns.barplot(
             x=top_cidades.values,
@@ -102,16 +67,23 @@ else:
         ax.set_ylabel('Cidade')
         for i, v in enumerate(top_cidades.values):
             ax.text(v + 0.5, i, str(v), color='black', va='center')
-        st.pyplot(fig)
+        return fig
+
+    exibir_figura("por_cidade", desenhar_por_cidade, filtros=filtros, versao=versao, estilo=tema_seaborn)
+
 
-    elif menu == "📈 Detalhado":
+@st.fragment
+def visao_detalhado(consultas, filtros, versao):
+    """Menu "📈 Detalhado"."""
+    def desenhar_detalhado():
+        plt = pyplot()
         # Tabela cruzada com totais
-        cross_tab = pd.crosstab(df_filtrado['estado'], df_filtrado['acesso'])
+        cross_tab = consultas.contagem(filtros, ['estado', 'acesso']).unstack(fill_value=0)
         total_por_estado = cross_tab.sum(axis=1)
         percentual = (cross_tab.T / total_por_estado).T * 100
 
         fig, ax = plt.subplots(figsize=(12, 6))
-        
+
         # Definindo as cores para "Já Acessou" e "Nunca Acessou"
         cores = ['#1f77b4', '#ff7f0e']  # Altere os códigos de cores conforme desejado
         bars = cross_tab.plot(kind='bar', stacked=True, ax=ax, color=cores)
@@ -157,25 +129,28 @@ else:
                         )
                     except Exception as e:
                         print(f"Erro ao adicionar rótulo: {e}")
+        return fig
 
-        st.pyplot(fig)
+    exibir_figura("detalhado", desenhar_detalhado, filtros=filtros, versao=versao, estilo=tema_seaborn)
 
 
-    elif menu == "📚 Por Turma e Estado":
-        st.markdown("#### 📌 Percentual de Acesso por Estado")
+@st.fragment
+def visao_turma_estado(consultas, filtros, versao):
+    """Menu "📚 Por Turma e Estado"."""
+    st.markdown("#### 📌 Percentual de Acesso por Estado")
 
-        if df_filtrado.empty:
-            st.warning("Nenhum dado encontrado com os filtros aplicados.")
-        else:
-            col1, col2 = st.columns(2)
+    contagem_estado = consultas.contagem(filtros, ['estado', 'acesso']).unstack(fill_value=0)
 
-            with col1:
-                porcentagem_estado = (
-                    df_filtrado.groupby(['estado', 'acesso']).size()
-                    .groupby(level=0).apply(lambda x: 100 * x / float(x.sum()))
-                    .unstack().fillna(0)
-                )
+    if contagem_estado.empty:
+        st.warning("Nenhum dado encontrado com os filtros aplicados.")
+    else:
+        col1, col2 = st.columns(2)
+
+        with col1:
+            porcentagem_estado = contagem_estado.div(contagem_estado.sum(axis=1), axis=0) * 100
 
+            def desenhar_percentual_estado():
+                plt = pyplot()
                 fig, ax = plt.subplots(figsize=(10, 5))
                 porcentagem_estado.plot(kind='bar', stacked=True, ax=ax, colormap='Accent')
                 ax.set_ylabel('%')
@@ -184,21 +159,24 @@ else:
 
                 for container in ax.containers:
                     ax.bar_label(container, fmt="%.1f%%", label_type="center")
+                return fig
 
-                st.pyplot(fig)
+            exibir_figura("percentual_estado", desenhar_percentual_estado, filtros=filtros, versao=versao, estilo=tema_seaborn)
 
-        # Gráfico de acesso por turma em tela cheia
-        if df_filtrado.empty:
-            st.info("Nenhuma turma encontrada com os filtros aplicados.")
-        else:
-            st.markdown("#### 📊 Gráfico de Acesso por Turma")
+    # Gráfico de acesso por turma em tela cheia
+    contagem_turma = consultas.contagem(filtros, ['id_coorte', 'acesso']).unstack(fill_value=0)
+    if contagem_turma.empty:
+        st.info("Nenhuma turma encontrada com os filtros aplicados.")
+    else:
+        st.markdown("#### 📊 Gráfico de Acesso por Turma")
 
-            contagem_turma = df_filtrado.groupby(['id_coorte', 'acesso']).size().unstack(fill_value=0)
-            porcentagem_turma = contagem_turma.div(contagem_turma.sum(axis=1), axis=0) * 100
+        porcentagem_turma = contagem_turma.div(contagem_turma.sum(axis=1), axis=0) * 100
 
-            contagem_turma.index = contagem_turma.index.astype(str)
-            porcentagem_turma.index = porcentagem_turma.index.astype(str)
+        contagem_turma.index = contagem_turma.index.astype(str)
+        porcentagem_turma.index = porcentagem_turma.index.astype(str)
 
+        def desenhar_acesso_turma():
+            plt = pyplot()
             fig2, ax2 = plt.subplots(figsize=(18, 7))  # ⬅️ AUMENTADO O TAMANHO
             cores = ['#1f77b4', '#ff7f0e']
             contagem_turma.plot(kind='bar', stacked=True, ax=ax2, color=cores)
@@ -233,152 +211,234 @@ else:
                                 ha='center', va='center',
                                 color='white', fontsize=9, fontweight='bold'
                             )
+            return fig2
+
+        exibir_figura("acesso_turma", desenhar_acesso_turma, filtros=filtros, versao=versao, estilo=tema_seaborn)
+
+            # Tabela detalhada por Estado e Turma
+    # Tabela detalhada por Estado e Turma com Percentuais
+    st.markdown("#### 📝 Detalhamento por Estado e Turma")
+
+    # Agrupar dados por estado, turma e acesso
+    detalhamento = (
+        consultas.contagem(filtros, ['estado', 'id_coorte', 'acesso'])
+        .unstack(fill_value=0)
+        .reset_index()
+        .rename(columns={
+            'já acessou': 'Já Acessou',
+            'nunca acessou': 'Nunca Acessou'
+        })
+    )
+
+    # Total por estado
+    totais_estado = contagem_estado.copy()
+    totais_estado['% Já Acessou'] = (totais_estado['já acessou'] / totais_estado.sum(axis=1) * 100).round(1)
+
+    # Calcular % por turma
+    detalhamento['Total'] = detalhamento['Já Acessou'] + detalhamento['Nunca Acessou']
+    detalhamento['% Já Acessou'] = (detalhamento['Já Acessou'] / detalhamento['Total'] * 100).round(1)
+    detalhamento['% Nunca Acessou'] = (detalhamento['Nunca Acessou'] / detalhamento['Total'] * 100).round(1)
+
+    # Exibir dados por estado
+    estados = detalhamento['estado'].unique()
+    for estado in sorted(estados):
+        # Obter % total de acesso do estado
+        percentual_estado = totais_estado.loc[estado]['% Já Acessou']
+        st.markdown(f"### 📍 Estado: **{estado}** – Já Acessou: **{percentual_estado:.1f}%**")
+
+        # Filtrar dados do estado
+        df_estado = detalhamento[detalhamento['estado'] == estado][
+            ['id_coorte', 'Já Acessou', '% Já Acessou', 'Nunca Acessou', '% Nunca Acessou']
+        ]
+        df_estado = df_estado.rename(columns={'id_coorte': 'Turma'})
+        df_estado = df_estado.sort_values(by='Turma')
+
+        st.dataframe(df_estado.reset_index(drop=True), use_container_width=True)
+
+
+@st.fragment
+def visao_menores_acessos(consultas, filtros, versao):
+    """Menu "📉 Menores Acessos"."""
+    st.markdown("### 🏙️ Cidades com Maior % de 'Nunca Acessou'")
+    estados_disponiveis = consultas.contagem(filtros, ['estado']).index.tolist()
+    estados_selecionados = st.multiselect("Selecione o(s) Estado(s):", estados_disponiveis, default=estados_disponiveis)
+    filtros_estados = filtros.restringir(estado=estados_selecionados)
+    cidade_estado = consultas.contagem(filtros_estados, ['cidade', 'estado', 'acesso']).unstack(fill_value=0)
+    colunas = [col.lower() for col in cidade_estado.columns]
+    cidade_estado.columns = colunas
+    ja_acessou = cidade_estado.get('já acessou', 0)
+    nunca_acessou = cidade_estado.get('nunca acessou', 0)
+    cidade_estado['Já Acessou'] = ja_acessou
+    cidade_estado['Nunca Acessou'] = nunca_acessou
+    cidade_estado['Total de Registros'] = ja_acessou + nunca_acessou
+    cidade_estado['% Nunca Acessou'] = (nunca_acessou / cidade_estado['Total de Registros']) * 100
+    cidades_ordenadas = cidade_estado[['% Nunca Acessou', 'Já Acessou', 'Total de Registros']].sort_values(
+        by='% Nunca Acessou', ascending=False).reset_index()
+    cidades_ordenadas = cidades_ordenadas.rename(columns={'cidade': 'Cidade', 'estado': 'Estado'})
+    st.dataframe(cidades_ordenadas.head(100), use_container_width=True)
+
+
+@st.fragment
+def visao_alocacao_turma(consultas, filtros, versao):
+    """Menu "👥 Alocação por Turma"."""
+    st.markdown("### 👥 Turmas com Menos Alunos")
+    estado_turma = st.selectbox("Selecione o Estado:", consultas.contagem(filtros, ['estado']).index.tolist())
+    filtros_estado = filtros.restringir(estado=[estado_turma])
+    cidades_do_estado = consultas.contagem(filtros_estado, ['cidade']).index.tolist()
+    cidade_turma = st.selectbox("Selecione a Cidade:", cidades_do_estado)
+    filtros_cidade = filtros_estado.restringir(cidade=[cidade_turma])
+    turma_contagem = consultas.contagem(filtros_cidade, ['id_coorte']).sort_values()
+    st.write("Quantidade de alunos por turma:")
+    st.dataframe(turma_contagem.rename_axis("Turma").reset_index(name="Qtd de Alunos"))
+
+
+@st.fragment
+def visao_acompanhamento_turma(consultas, filtros, versao):
+    """Menu "📆 Acompanhamento por Turma"."""
+    st.markdown("### 📊 Evolução dos Acessos por Turma")
+
+    # Filtros
+    estado_filtro = st.selectbox("Selecione o Estado:", consultas.contagem(filtros, ['estado']).index.tolist())
+    filtros_estado = filtros.restringir(estado=[estado_filtro])
+    cidades_filtro = consultas.contagem(filtros_estado, ['cidade']).index.tolist()
+    cidade_filtro = st.selectbox("Selecione a Cidade:", cidades_filtro)
+
+    filtros_cidade = filtros_estado.restringir(cidade=[cidade_filtro])
+    turmas_disp = consultas.contagem(filtros_cidade, ['id_coorte']).index.tolist()
+
+    turma_filtro = st.selectbox("Selecione a Turma:", turmas_disp)
+
+    # Dados filtrados
+    df_turma = consultas.filtrar(
+        filtros_cidade.restringir(id_coorte=[turma_filtro], acesso=["já acessou"]),
+        colunas=['ultimo_acesso']
+    ).copy()
+
+    if df_turma.empty:
+        st.warning("Nenhum acesso encontrado para essa turma.")
+    else:
+        # Garantir que a data esteja no formato correto
+        df_turma['ultimo_acesso'] = pd.to_datetime(df_turma['ultimo_acesso'], errors='coerce')
+
+        # Contar acessos por data
+        acessos_diarios = df_turma['ultimo_acesso'].dt.date.value_counts().sort_index()
+        acessos_acumulados = acessos_diarios.cumsum()
+
+        # Plotar gráfico
+        def desenhar_evolucao_turma():
+            plt = pyplot()
+            fig, ax = plt.subplots(figsize=(10, 5))
+            acessos_acumulados.plot(ax=ax, marker='o', linestyle='-')
+            ax.set_title(f"Evolução Acumulada de Acessos - Turma {turma_filtro}")
+            ax.set_xlabel("Data")
+            ax.set_ylabel("Total Acumulado de Acessos")
+            ax.grid(True)
+            return fig
+
+        exibir_figura("evolucao_turma", desenhar_evolucao_turma, filtros=(filtros, estado_filtro, cidade_filtro, turma_filtro), versao=versao, estilo=tema_seaborn)
 
-            st.pyplot(fig2)
-
-                # Tabela detalhada por Estado e Turma
-        # Tabela detalhada por Estado e Turma com Percentuais
-        st.markdown("#### 📝 Detalhamento por Estado e Turma")
-
-        # Agrupar dados por estado, turma e acesso
-        detalhamento = (
-            df_filtrado.groupby(['estado', 'id_coorte', 'acesso'])
-            .size()
-            .unstack(fill_value=0)
-            .reset_index()
-            .rename(columns={
-                'já acessou': 'Já Acessou',
-                'nunca acessou': 'Nunca Acessou'
+        st.markdown("#### 📋 Evolução Diária")
+        st.dataframe(
+            pd.DataFrame({
+                "Data": acessos_acumulados.index,
+                "Acessos Acumulados": acessos_acumulados.values
             })
         )
 
-        # Total por estado
-        totais_estado = df_filtrado.groupby(['estado', 'acesso']).size().unstack(fill_value=0)
-        totais_estado['% Já Acessou'] = (totais_estado['já acessou'] / totais_estado.sum(axis=1) * 100).round(1)
-
-        # Calcular % por turma
-        detalhamento['Total'] = detalhamento['Já Acessou'] + detalhamento['Nunca Acessou']
-        detalhamento['% Já Acessou'] = (detalhamento['Já Acessou'] / detalhamento['Total'] * 100).round(1)
-        detalhamento['% Nunca Acessou'] = (detalhamento['Nunca Acessou'] / detalhamento['Total'] * 100).round(1)
-
-        # Exibir dados por estado
-        estados = detalhamento['estado'].unique()
-        for estado in sorted(estados):
-            # Obter % total de acesso do estado
-            percentual_estado = totais_estado.loc[estado]['% Já Acessou']
-            st.markdown(f"### 📍 Estado: **{estado}** – Já Acessou: **{percentual_estado:.1f}%**")
-
-            # Filtrar dados do estado
-            df_estado = detalhamento[detalhamento['estado'] == estado][
-                ['id_coorte', 'Já Acessou', '% Já Acessou', 'Nunca Acessou', '% Nunca Acessou']
-            ]
-            df_estado = df_estado.rename(columns={'id_coorte': 'Turma'})
-            df_estado = df_estado.sort_values(by='Turma')
-
-            st.dataframe(df_estado.reset_index(drop=True), use_container_width=True)
-
-
-    elif menu == "📉 Menores Acessos":
-        st.markdown("### 🏙️ Cidades com Maior % de 'Nunca Acessou'")
-        estados_disponiveis = sorted(df_filtrado['estado'].dropna().unique())
-        estados_selecionados = st.multiselect("Selecione o(s) Estado(s):", estados_disponiveis, default=estados_disponiveis)
-        df_estado_filtrado = df_filtrado[df_filtrado['estado'].isin(estados_selecionados)]
-        cidade_estado = df_estado_filtrado.groupby(['cidade', 'estado', 'acesso']).size().unstack(fill_value=0)
-        colunas = [col.lower() for col in cidade_estado.columns]
-        cidade_estado.columns = colunas
-        ja_acessou = cidade_estado.get('já acessou', 0)
-        nunca_acessou = cidade_estado.get('nunca acessou', 0)
-        cidade_estado['Já Acessou'] = ja_acessou
-        cidade_estado['Nunca Acessou'] = nunca_acessou
-        cidade_estado['Total de Registros'] = ja_acessou + nunca_acessou
-        cidade_estado['% Nunca Acessou'] = (nunca_acessou / cidade_estado['Total de Registros']) * 100
-        cidades_ordenadas = cidade_estado[['% Nunca Acessou', 'Já Acessou', 'Total de Registros']].sort_values(
-            by='% Nunca Acessou', ascending=False).reset_index()
-        cidades_ordenadas = cidades_ordenadas.rename(columns={'cidade': 'Cidade', 'estado': 'Estado'})
-        st.dataframe(cidades_ordenadas.head(100), use_container_width=True)
-
-    elif menu == "👥 Alocação por Turma":
-        st.markdown("### 👥 Turmas com Menos Alunos")
-        estado_turma = st.selectbox("Selecione o Estado:", sorted(df_filtrado['estado'].unique()))
-        cidades_do_estado = sorted(df_filtrado[df_filtrado['estado'] == estado_turma]['cidade'].unique())
-        cidade_turma = st.selectbox("Selecione a Cidade:", cidades_do_estado)
-        df_turma = df_filtrado[(df_filtrado['estado'] == estado_turma) & (df_filtrado['cidade'] == cidade_turma)]
-        turma_contagem = df_turma['id_coorte'].value_counts().sort_values()
-        st.write("Quantidade de alunos por turma:")
-        st.dataframe(turma_contagem.reset_index().rename(columns={"index": "Turma", "id_coorte": "Qtd de Alunos"}))
-
-    elif menu == "🔍 Buscar por Nome":
-        nome_busca = st.sidebar.text_input("🔍 Buscar Aluno por Nome (sem acentos ou caracteres especias)", placeholder="Digite o nome...", key="busca_nome")
+
+VISOES = {
+    "📌 Visão Geral": visao_geral,
+    "🏙️ Por Cidade": visao_por_cidade,
+    "📈 Detalhado": visao_detalhado,
+    "📚 Por Turma e Estado": visao_turma_estado,
+    "📉 Menores Acessos": visao_menores_acessos,
+    "👥 Alocação por Turma": visao_alocacao_turma,
+    "📆 Acompanhamento por Turma": visao_acompanhamento_turma,
+}
+
+
+@st.fragment
+def tabela_dados_filtrados(consultas, filtros):
+    """Paginação e ordenação da tabela reexecutam só a tabela."""
+    exibir_tabela_paginada(consultas.filtrar(filtros), "dados_filtrados")
+
+
+# Sidebar - Filtros
+st.sidebar.title("🎛️ Filtros")
+estado_selecionado = st.sidebar.multiselect("Estado", options=estados_validos, placeholder="Selecione estados...")
+cidade_selecionada = st.sidebar.multiselect("Cidade", options=sorted(df['cidade'].dropna().unique()), placeholder="Selecione cidades...")
+status_acesso = st.sidebar.multiselect("Status de Acesso", options=sorted(df['acesso'].dropna().unique()), placeholder="Selecione status...")
+
+if st.sidebar.button("🔄 Limpar Filtros"):
+    estado_selecionado = []
+    cidade_selecionada = []
+    status_acesso = []
+
+# Campo de busca por nome
+st.sidebar.markdown("---")
+nome_busca = st.sidebar.text_input("🔍 Buscar Aluno por Nome", placeholder="Digite o nome...")
+
+# Menu lateral de navegação
+menu = st.sidebar.radio("📁 Navegação", [
+    "📌 Visão Geral", 
+    "🏙️ Por Cidade", 
+    "📈 Detalhado", 
+    "📚 Por Turma e Estado", 
+    "📉 Menores Acessos",
+    "👥 Alocação por Turma", 
+    "🔍 Buscar por Nome",
+    "📆 Acompanhamento por Turma"  
+])
+
+# Aplicar filtros (executados pelo backend de consultas)
+filtros = Filtros.da_barra_lateral(estado_selecionado, cidade_selecionada, status_acesso)
+total_registros, total_estados, total_cidades = consultas.metricas(filtros)
+
+# Título principal
+st.title("📊 Dashboard de Acessos")
+
+if total_registros == 0:
+    st.info("ℹ️ Selecione filtros para visualizar os dados")
+else:
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total de Registros", total_registros)
+    with col2:
+        st.metric("Estados", total_estados)
+    with col3:
+        st.metric("Cidades", total_cidades)
+
+    st.divider()
+
+    if menu == "🔍 Buscar por Nome":
+        # O campo fica na barra lateral, que um fragmento não pode alterar
+        nome_busca = st.sidebar.text_input("🔍 Buscar Aluno por Nome", placeholder="Digite o nome...", key="busca_nome")
 
         if nome_busca:
-            nome_busca_lower = nome_busca.strip().lower()
-            resultados = df[df['nome'].str.lower().str.contains(nome_busca_lower)]
+            indice_nomes = publicacao.valor['indice_nomes']
+            posicoes, pontuacoes = indice_nomes.buscar(nome_busca)
             st.subheader("🔍 Resultado da Busca por Nome")
-            if resultados.empty:
+            if len(posicoes) == 0:
                 st.warning("Nenhum aluno encontrado com esse nome.")
             else:
-                for idx, linha in resultados.iterrows():
-                    st.markdown(f"""
-                    - **Nome:** {linha['nome']}
-                    - **Turma:** {linha['id_coorte']}
-                    - **Cidade:** {linha['cidade']}
-                    - **Estado:** {linha['estado']}
-                    ---
-                    """)
-    
-    elif menu == "📆 Acompanhamento por Turma":
-        st.markdown("### 📊 Evolução dos Acessos por Turma")
-
-        # Filtros
-        estado_filtro = st.selectbox("Selecione o Estado:", sorted(df_filtrado['estado'].unique()))
-        cidades_filtro = df_filtrado[df_filtrado['estado'] == estado_filtro]['cidade'].unique()
-        cidade_filtro = st.selectbox("Selecione a Cidade:", sorted(cidades_filtro))
-
-        turmas_disp = df_filtrado[
-            (df_filtrado['estado'] == estado_filtro) & 
-            (df_filtrado['cidade'] == cidade_filtro)
-        ]['id_coorte'].unique()
-
-        turma_filtro = st.selectbox("Selecione a Turma:", sorted(turmas_disp))
-
-        # Dados filtrados
-        df_turma = df_filtrado[
-            (df_filtrado['estado'] == estado_filtro) & 
-            (df_filtrado['cidade'] == cidade_filtro) & 
-            (df_filtrado['id_coorte'] == turma_filtro) &
-            (df_filtrado['acesso'].str.lower() == "já acessou")
-        ].copy()
-
-        if df_turma.empty:
-            st.warning("Nenhum acesso encontrado para essa turma.")
-        else:
-            # Garantir que a data esteja no formato correto
-            df_turma['ultimo_acesso'] = pd.to_datetime(df_turma['ultimo_acesso'], errors='coerce')
-
-            # Contar acessos por data
-            acessos_diarios = df_turma['ultimo_acesso'].dt.date.value_counts().sort_index()
-            acessos_acumulados = acessos_diarios.cumsum()
-
-            # Plotar gráfico
-            fig, ax = plt.subplots(figsize=(10, 5))
-            acessos_acumulados.plot(ax=ax, marker='o', linestyle='-')
-            ax.set_title(f"Evolução Acumulada de Acessos - Turma {turma_filtro}")
-            ax.set_xlabel("Data")
-            ax.set_ylabel("Total Acumulado de Acessos")
-            ax.grid(True)
-            st.pyplot(fig)
-
-            st.markdown("#### 📋 Evolução Diária")
-            st.dataframe(
-                pd.DataFrame({
-                    "Data": acessos_acumulados.index,
-                    "Acessos Acumulados": acessos_acumulados.values
+                resultados = df.iloc[posicoes][['nome', 'id_coorte', 'cidade', 'estado']].rename(columns={
+                    'nome': 'Nome', 'id_coorte': 'Turma', 'cidade': 'Cidade', 'estado': 'Estado'
                 })
-            )
+                resultados.insert(0, 'Similaridade', pontuacoes * 100)
+                st.caption(f"{len(resultados)} alunos encontrados")
+                exibir_tabela_paginada(
+                    resultados.reset_index(drop=True),
+                    "busca_nome_resultados",
+                    column_config={
+                        'Similaridade': st.column_config.ProgressColumn(format="%.0f%%", min_value=0, max_value=100)
+                    },
+                )
+    else:
+        VISOES[menu](consultas, filtros, versao)
 
 
 ######################################################
 
     st.divider()
     st.subheader("📋 Dados Filtrados")
-    st.dataframe(df_filtrado, use_container_width=True)
+    tabela_dados_filtrados(consultas, filtros)
@@ -0,0 +1,114 @@
+"""Tabela paginada no servidor para os dashboards.
+
+``st.dataframe(df)`` serializa o DataFrame inteiro e o envia ao navegador a
+cada rerun. Aqui a projeção de colunas, a ordenação e o recorte da página
+são feitos no servidor: só as linhas visíveis vão para o ``st.dataframe``.
+Cores e formatos condicionais devem vir de ``column_config`` (colunas de
+checkbox, barras de progresso...), não de ``Styler.applymap``, que gera CSS
+por célula.
+
+Uso::
+
+    from tabela_paginada import exibir_tabela_paginada
+    exibir_tabela_paginada(df, "dados_filtrados", ordenar_por="access_time", crescente=False)
+"""
+
+import math
+
+import numpy as np
+import streamlit as st
+
+TAMANHOS_PAGINA = (25, 50, 100, 200)
+SEM_ORDEM = "(ordem original)"
+
+
+def posicoes_ordenadas(serie, crescente=True):
+    """Posições de ``serie`` na ordem pedida (estável, nulos no fim)."""
+    ordenada = serie.reset_index(drop=True).sort_values(
+        ascending=crescente, kind="stable", na_position="last"
+    )
+    return ordenada.index.to_numpy()
+
+
+def recortar_pagina(df, pagina, tamanho_pagina, ordenar_por=None, crescente=True, colunas=None):
+    """Linhas da página ``pagina`` (a partir de 1) de ``df`` já ordenado e projetado.
+
+    Só a coluna de ordenação é ordenada; as demais colunas são lidas apenas
+    para as linhas da página.
+    """
+    inicio = (pagina - 1) * tamanho_pagina
+    fim = min(inicio + tamanho_pagina, len(df))
+    if ordenar_por is not None:
+        posicoes = posicoes_ordenadas(df[ordenar_por], crescente)[inicio:fim]
+    else:
+        posicoes = np.arange(inicio, fim)
+    recorte = df.iloc[posicoes]
+    return recorte if colunas is None else recorte[list(colunas)]
+
+
+def exibir_tabela_paginada(
+    df,
+    chave,
+    tamanho_pagina=50,
+    colunas=None,
+    ordenar_por=None,
+    crescente=True,
+    column_config=None,
+    altura=None,
+    ocultar_indice=True,
+):
+    """Tabela com seleção de colunas, ordenação e paginação feitas no servidor.
+
+    ``chave`` distingue os widgets de tabelas diferentes na mesma página;
+    ``colunas`` são as colunas visíveis de início e ``ordenar_por``/``crescente``
+    a ordenação inicial.
+    """
+    todas = [str(c) for c in df.columns]
+    if not todas:
+        st.info("Nenhum dado para exibir.")
+        return
+
+    controles = st.columns([3, 2, 1, 1, 1])
+    visiveis = controles[0].multiselect(
+        "Colunas", todas, default=list(colunas) if colunas is not None else todas, key=f"{chave}_colunas"
+    )
+    opcoes_ordem = [SEM_ORDEM] + todas
+    coluna_ordem = controles[1].selectbox(
+        "Ordenar por",
+        opcoes_ordem,
+        index=opcoes_ordem.index(ordenar_por) if ordenar_por in opcoes_ordem else 0,
+        key=f"{chave}_ordem",
+    )
+    crescente = controles[2].toggle("Crescente", value=crescente, key=f"{chave}_crescente")
+    tamanho_pagina = controles[3].selectbox(
+        "Linhas por página",
+        sorted(set(TAMANHOS_PAGINA) | {tamanho_pagina}),
+        index=sorted(set(TAMANHOS_PAGINA) | {tamanho_pagina}).index(tamanho_pagina),
+        key=f"{chave}_tamanho",
+    )
+    total_paginas = max(math.ceil(len(df) / tamanho_pagina), 1)
+    pagina = controles[4].number_input(
+        "Página", min_value=1, max_value=total_paginas, value=1, step=1, key=f"{chave}_pagina"
+    )
+    pagina = min(int(pagina), total_paginas)
+
+    recorte = recortar_pagina(
+        df,
+        pagina,
+        tamanho_pagina,
+        ordenar_por=None if coluna_ordem == SEM_ORDEM else coluna_ordem,
+        crescente=crescente,
+        colunas=visiveis or todas,
+    )
+    st.dataframe(
+        recorte,
+        use_container_width=True,
+        hide_index=ocultar_indice,
+        height=altura,
+        column_config=column_config,
+    )
+    primeira = (pagina - 1) * tamanho_pagina + 1 if len(df) else 0
+    st.caption(
+        f"Linhas {primeira}–{(pagina - 1) * tamanho_pagina + len(recorte)} de {len(df)} "
+        f"· página {pagina} de {total_paginas}"
+    )